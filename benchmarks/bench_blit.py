@@ -0,0 +1,140 @@
+"""
+Benchmark de blit das superfícies convertidas para o formato da tela
+Desenha a tela de jogo com o cache de superfícies desligado (texto renderizado
+a cada frame, sem conversão) e ligado (convert/convert_alpha e colorkey), e
+mede a vazão de blit das superfícies de um frame em cada formato. Depois de
+um redimensionamento confere que as superfícies guardadas estão de novo no
+formato da tela
+
+Uso:
+    python benchmarks/bench_blit.py --frames 1000 --rounds 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, seed_queue, setup_headless, summarize, write_results
+
+setup_headless()
+
+import pygame  # noqa: E402
+
+from game import MAX_ROBOTS  # noqa: E402
+from gui import GUI  # noqa: E402
+
+
+def draw_frames(gui, frames, warmup):
+    """Tempos (ns) de `frames` quadros da tela de jogo"""
+    samples = []
+    for i in range(warmup + frames):
+        pygame.event.pump()
+        start = time.perf_counter_ns()
+        gui.draw()
+        elapsed = time.perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def blit_rate(screen, surfaces, rounds):
+    """Blits por segundo e megapixels por segundo de `rounds` passadas pelas superfícies"""
+    pixels = sum(surface.get_width() * surface.get_height() for surface in surfaces)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for surface in surfaces:
+            screen.blit(surface, (0, 0))
+    elapsed = time.perf_counter() - start
+    return {
+        'surfaces': len(surfaces),
+        'blits_per_s': rounds * len(surfaces) / elapsed,
+        'mpixels_per_s': rounds * pixels / elapsed / 1e6,
+    }
+
+
+def frame_surfaces(gui):
+    """
+    As superfícies de texto de um frame da tela de jogo em três formatos:
+    como o font.render devolve, com convert_alpha() e como o cache as guarda
+    """
+    gui.surfaces.clear()
+    gui.draw()
+    raw, alpha, cached = [], [], []
+    for (font, text, color, background), surface in gui.surfaces._text.items():
+        rendered = font.render(text, True, color)
+        raw.append(rendered)
+        alpha.append(rendered.convert_alpha())
+        cached.append(surface)
+    return {'font.render': raw, 'convert_alpha': alpha, 'cache': cached}
+
+
+def display_format(surface):
+    return surface.get_bitsize(), surface.get_masks()[:3]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=1000, help="quadros medidos por modo")
+    parser.add_argument("--warmup", type=int, default=50, help="quadros descartados antes da medição")
+    parser.add_argument("--rounds", type=int, default=200, help="passadas pelas superfícies de um frame")
+    parser.add_argument("--robots", type=int, default=MAX_ROBOTS, help="robôs na fila")
+    parser.add_argument("--size", type=int, nargs=2, default=[1200, 800], metavar=("W", "H"))
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "blit.json"))
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    # Roda em um diretório temporário para não tocar no ranking.json real
+    os.chdir(tempfile.mkdtemp(prefix="bench_blit_"))
+    gui = GUI()
+    gui.resize(*args.size)
+    gui.game.start_game()
+    seed_queue(gui.game, args.robots)
+    gui.state = "playing"
+
+    frames = {}
+    for mode, enabled in (("antes", False), ("depois", True)):
+        gui.surfaces.enabled = enabled
+        gui.surfaces.clear()
+        frames[mode] = summarize(draw_frames(gui, args.frames, args.warmup))
+        print(f"frame {mode:<7} p50={frames[mode]['p50_ms']:.3f}ms p99={frames[mode]['p99_ms']:.3f}ms "
+              f"média={frames[mode]['mean_ms']:.3f}ms")
+    speedup = frames["antes"]['mean_ms'] / frames["depois"]['mean_ms']
+    print(f"frame médio {speedup:.2f}x mais rápido com o cache")
+
+    blits = {}
+    for name, surfaces in frame_surfaces(gui).items():
+        blits[name] = blit_rate(gui.screen, surfaces, args.rounds)
+        print(f"blit {name:<13} {blits[name]['blits_per_s']:12,.0f} blits/s "
+              f"{blits[name]['mpixels_per_s']:8.1f} Mpixels/s ({blits[name]['surfaces']} superfícies)")
+
+    # VIDEORESIZE recria a tela: os sprites guardados voltam ao formato dela
+    gui.resize(args.size[0] // 2 + 100, args.size[1] // 2 + 100)
+    gui.draw()
+    expected = display_format(gui.screen)
+    stale = [key for key, (_, _, surface) in gui.surfaces._sprites.items()
+             if display_format(surface) != expected]
+    stale += [key for key, surface in gui.surfaces._text.items()
+              if display_format(surface)[0] != expected[0]]
+    print(f"após redimensionar: {len(gui.surfaces)} superfícies, fora do formato da tela: {len(stale)}")
+
+    pygame.quit()
+    write_results(output, {
+        'benchmark': 'blit',
+        'timestamp': time.time(),
+        'pygame': pygame.version.ver,
+        'window': args.size,
+        'robots': args.robots,
+        'frames': frames,
+        'frame_speedup': speedup,
+        'blits': blits,
+        'stale_after_resize': len(stale),
+    })
+    if stale:
+        print("ERRO: superfícies fora do formato da tela após o redimensionamento")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
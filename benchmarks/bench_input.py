@@ -0,0 +1,186 @@
+"""
+Benchmark de latência de entrada (injeção sintética de eventos)
+Injeta na fila de eventos do pygame, a uma taxa configurável, as interações de
+um jogador (clique no robô, clique na caixa de código, 4 teclas e Enter) e mede
+o tempo entre a injeção e o momento em que Game.validate_code aplicou o código
+e o primeiro frame que já reflete a mudança
+
+Uso:
+    python benchmarks/bench_input.py --rates 20,200,2000,20000 --interactions 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, seed_queue, setup_headless, summarize, write_results
+
+setup_headless()
+
+import pygame  # noqa: E402
+
+from gui import GUI  # noqa: E402
+
+EVENTS_PER_INTERACTION = 7  # clique no robô, clique na caixa, 4 caracteres, Enter
+QUEUE_SIZE = 500            # Robôs na fila (suficiente para a fila não esvaziar)
+
+
+def click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def key(char, key_code=None):
+    if key_code is None:
+        key_code = pygame.key.key_code(char.lower())
+    return pygame.event.Event(pygame.KEYDOWN, key=key_code, unicode=char, mod=0, scancode=0)
+
+
+def interaction_events(gui):
+    """
+    Eventos de uma interação completa, com o código do componente no topo do robô
+    que está no início da fila (com muitas interações por frame o código pode já
+    estar desatualizado; a submissão ainda passa por validate_code)
+    """
+    head = gui._live_game().robots.peek()
+    component = head.get_top_component() if head else None
+    code = component.replacement_code if component else "0000"
+    events = [click(gui._queue_row_rect(0).center), click(gui.ui_rects['play_input_code'].center)]
+    events += [key(char) for char in code]
+    events.append(key("\r", pygame.K_RETURN))
+    return events
+
+
+class SubmissionProbe:
+    """
+    Acompanha cada submissão de código: quando foi injetada, quando validate_code
+    a aplicou e quando o primeiro frame com o resultado terminou de ser desenhado
+    """
+    def __init__(self, gui):
+        self.gui = gui
+        self.injected = []   # (início da interação, Enter) em ns, na ordem de injeção
+        self.posted = []     # Sequência do comando na simulação (modo com thread)
+        self.applied = []    # Instante em que validate_code rodou
+        self.displayed = []  # Fim do frame que mostrou o resultado
+
+        game = gui._live_game()
+        validate_code = game.validate_code
+
+        def timed_validate_code(input_code):
+            validate_code(input_code)
+            self.applied.append(time.perf_counter_ns())
+        game.validate_code = timed_validate_code
+
+        game_command = gui._game_command
+
+        def tracked_game_command(command, *args):
+            game_command(command, *args)
+            if command == "validate_code":
+                self.posted.append(gui.simulation.commands_posted if gui.simulation else 0)
+        gui._game_command = tracked_game_command
+
+    def after_draw(self):
+        """Chamado ao fim de cada frame: marca as submissões que o frame já reflete"""
+        now = time.perf_counter_ns()
+        if self.gui.simulation:
+            reflected = self.gui.view.commands_applied
+            while len(self.displayed) < len(self.posted) and self.posted[len(self.displayed)] <= reflected:
+                self.displayed.append(now)
+        else:
+            # Sem thread, validate_code roda em handle_events e o frame seguinte já o mostra
+            while len(self.displayed) < len(self.applied):
+                self.displayed.append(now)
+
+
+def run_rate(rate, interactions, fps, threaded):
+    gui = GUI(threaded=threaded)
+    game = gui._live_game()
+    game.start_game()
+    seed_queue(game, QUEUE_SIZE)
+    gui.state = "playing"
+    gui.draw()
+    probe = SubmissionProbe(gui)
+
+    interval_ns = int(1e9 / rate)
+    total_events = interactions * EVENTS_PER_INTERACTION
+    clock = pygame.time.Clock()
+    pending = []
+    scheduled = 0
+    frames = 0
+    start = time.perf_counter_ns()
+    deadline = start + int(60e9)
+
+    while len(probe.displayed) < interactions and time.perf_counter_ns() < deadline:
+        # Mantém a partida sem limite de tempo durante a medição
+        game.start_time = time.time()
+
+        # Injeta os eventos cujo horário já chegou (chegam entre frames, como os do SO)
+        now = time.perf_counter_ns()
+        while scheduled < total_events and start + scheduled * interval_ns <= now:
+            if not pending:
+                pending = interaction_events(gui)
+                interaction_start = start + scheduled * interval_ns
+            event = pending.pop(0)
+            pygame.event.post(event)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                probe.injected.append((interaction_start, start + scheduled * interval_ns))
+            scheduled += 1
+
+        gui.handle_events()
+        gui.update()
+        gui.draw()
+        probe.after_draw()
+        frames += 1
+        clock.tick(fps)
+
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    if gui.simulation:
+        gui.simulation.stop()
+    pygame.quit()
+
+    done = min(len(probe.injected), len(probe.displayed))
+    return {
+        'events_per_second': rate,
+        'interactions': interactions,
+        'completed': done,
+        'frames': frames,
+        'throughput_interactions_per_s': done / elapsed if elapsed else 0.0,
+        'submit_to_applied': summarize([probe.applied[i] - probe.injected[i][1] for i in range(done)]),
+        'submit_to_display': summarize([probe.displayed[i] - probe.injected[i][1] for i in range(done)]),
+        'interaction_to_display': summarize([probe.displayed[i] - probe.injected[i][0] for i in range(done)]),
+        'components_replaced': game.components_replaced,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rates", default="20,200,2000,20000", help="taxas de injeção (eventos/s)")
+    parser.add_argument("--interactions", type=int, default=50)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--threaded", action="store_true", help="simulação em thread separada")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "input.json"))
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_input_"))
+    results = []
+    for rate in (int(value) for value in args.rates.split(",")):
+        result = run_rate(rate, args.interactions, args.fps, args.threaded)
+        results.append(result)
+        latency = result['submit_to_display']
+        print(f"{rate:>6} ev/s  interações/s={result['throughput_interactions_per_s']:7.1f} "
+              f"p50={latency['p50_ms']:.2f}ms p99={latency['p99_ms']:.2f}ms max={latency['max_ms']:.2f}ms "
+              f"({result['completed']}/{args.interactions})")
+
+    write_results(output, {
+        'benchmark': 'input',
+        'timestamp': time.time(),
+        'fps': args.fps,
+        'threaded': args.threaded,
+        'rates': results,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark dos pools de objetos (geração e reparo de robôs em alta rotatividade)
+Gera robôs em sequência, mantendo a fila em um tamanho fixo ao consertar o
+primeiro da fila, e compara a vazão e as coletas do GC com e sem os pools
+
+Uso:
+    python benchmarks/bench_pooling.py --robots 200000 --queue 20
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, write_results
+
+setup_headless()
+
+from game import Game, ObjectPools  # noqa: E402
+
+
+class GCMonitor:
+    """Conta as coletas do GC por geração e soma o tempo de pausa (via gc.callbacks)"""
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_ns = 0
+        self.max_pause_ns = 0
+        self._start = 0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter_ns()
+        else:
+            pause = time.perf_counter_ns() - self._start
+            self.collections[info['generation']] += 1
+            self.pause_ns += pause
+            self.max_pause_ns = max(self.max_pause_ns, pause)
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+        return False
+
+
+def repair_head(game):
+    """Conserta o primeiro robô da fila, componente por componente"""
+    robot = game.robots.peek()
+    game.selected_robot_id = robot.id
+    while game.robots.peek() is robot:
+        game.validate_code(robot.get_top_component().code)
+
+
+def run(pooled, robots, queue, seed):
+    random.seed(seed)
+    game = Game(clock=lambda: 0.0, pools=ObjectPools() if pooled else None)
+    game.start_game()
+    gc.collect()
+
+    with GCMonitor() as monitor:
+        start = time.perf_counter_ns()
+        for _ in range(robots):
+            game._generate_new_robot(game.robot_id_counter)
+            game.robot_id_counter += 1
+            while len(game.robots) > queue:
+                repair_head(game)
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+
+    result = {
+        'pooled': pooled,
+        'robots_per_s': robots / elapsed,
+        'elapsed_s': elapsed,
+        'gc_collections': monitor.collections,
+        'gc_pause_ms': monitor.pause_ns / 1e6,
+        'gc_max_pause_ms': monitor.max_pause_ns / 1e6,
+        'robots_fixed': game.robots_fixed,
+    }
+    if pooled:
+        result['pools'] = {name: {'reused': reused, 'created': created}
+                           for name, (reused, created) in game.pools.stats().items()}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--robots", type=int, default=200_000, help="robôs gerados")
+    parser.add_argument("--queue", type=int, default=20, help="tamanho mantido da fila")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "pooling.json"))
+    args = parser.parse_args(argv)
+
+    results = {}
+    for pooled in (False, True):
+        label = "pools" if pooled else "sem_pools"
+        results[label] = result = run(pooled, args.robots, args.queue, args.seed)
+        print(f"{label:<10} robôs/s={result['robots_per_s']:9.0f} "
+              f"coletas GC (g0/g1/g2)={'/'.join(map(str, result['gc_collections']))} "
+              f"pausa total={result['gc_pause_ms']:.1f}ms máx={result['gc_max_pause_ms']:.2f}ms")
+
+    write_results(os.path.abspath(args.output), {
+        'benchmark': 'pooling',
+        'timestamp': time.time(),
+        'robots': args.robots,
+        'queue': args.queue,
+        'modes': results,
+    })
+
+
+if __name__ == "__main__":
+    main()
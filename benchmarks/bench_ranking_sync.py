@@ -0,0 +1,167 @@
+"""
+Benchmark da sincronização do ranking entre quiosques (ranking_sync.py)
+Vários quiosques (um processo cada) enviam scores ao serviço local de teste
+enquanto ele fica fora do ar por um tempo (respostas 503 e depois conexões
+recusadas). Mede o custo de submit() na thread do jogo, confere que as
+entradas feitas sem rede ficam na caixa de saída em disco e chegam ao serviço
+uma única vez quando ele volta, e que cada quiosque recebe o topo remoto com
+os scores dos outros
+
+Uso:
+    python benchmarks/bench_ranking_sync.py --kiosks 4 --entries 200 --outage 1.5
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, summarize, write_results
+
+setup_headless()
+
+from ranking_sync import LeaderboardClient, LeaderboardServer, LeaderboardService, Outbox, RankingSync  # noqa: E402
+
+PULL_INTERVAL = 0.2
+
+
+def kiosk_process(url, outbox_path, kiosk_id, entries, interval, seed, top, finish, results):
+    """
+    Um quiosque: um score a cada `interval` s, recolhendo as entradas remotas a
+    cada score, como a GUI faz a cada frame; depois espera a caixa de saída
+    esvaziar e continua recolhendo até `finish`
+    """
+    rng = random.Random(seed)
+    sync = RankingSync(LeaderboardClient(url, timeout=1.0), Outbox(outbox_path, durable=False), kiosk_id,
+                       pull_interval=PULL_INTERVAL, top_limit=top, backoff_base=0.05, backoff_max=0.4)
+    samples = []
+    received = []
+    for i in range(entries):
+        entry = {'name': f"{kiosk_id}-{i}", 'score': rng.randrange(10_000),
+                 'fixed_robots': rng.randrange(30), 'time': 90.0}
+        start = time.perf_counter_ns()
+        sync.submit(entry)
+        samples.append(time.perf_counter_ns() - start)
+        received.extend(sync.take_remote())
+        time.sleep(interval)
+    while not finish.wait(0.01):
+        received.extend(sync.take_remote())
+    sync.close()
+    received.extend(sync.take_remote())
+    results.put({'kiosk_id': kiosk_id, 'samples': samples,
+                 'received': [entry['id'] for entry in received], 'stats': sync.stats()})
+
+
+def wait_until(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--kiosks", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=200, help="scores enviados por quiosque")
+    parser.add_argument("--interval", type=float, default=0.01, help="segundos entre os scores de um quiosque")
+    parser.add_argument("--outage", type=float, default=1.5, help="segundos com o serviço fora do ar")
+    parser.add_argument("--top", type=int, default=10, help="entradas do topo remoto trazidas de volta")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "ranking_sync.json"))
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="bench_ranking_sync_")
+    service = LeaderboardService()
+    server = LeaderboardServer(service=service).start()
+    address = server.server_address
+
+    # "spawn": com fork os quiosques herdariam o socket do servidor (e a porta não
+    # poderia ser reaberta depois da queda)
+    context = multiprocessing.get_context("spawn")
+    finish = context.Event()
+    results = context.Queue()
+    outboxes = [os.path.join(directory, f"quiosque{i}.json") for i in range(args.kiosks)]
+    kiosks = [context.Process(target=kiosk_process, daemon=True,
+                              args=(server.url, outboxes[i], f"quiosque{i}", args.entries,
+                                    args.interval, args.seed + i, args.top, finish, results))
+              for i in range(args.kiosks)]
+    start = time.monotonic()
+    for kiosk in kiosks:
+        kiosk.start()
+
+    # Queda do serviço no meio dos envios: primeiro respostas 503, depois conexões recusadas
+    time.sleep(args.entries * args.interval / 4)
+    server.failing = True
+    time.sleep(args.outage / 2)
+    server.stop()
+    time.sleep(args.outage / 2)
+    offline_on_disk = sum(len(Outbox(path)) for path in outboxes)
+    if not offline_on_disk:
+        # Sem entradas na caixa de saída o cenário sem rede não foi exercitado
+        print("ERRO: nenhuma entrada na caixa de saída em disco durante a queda "
+              "(aumente --entries/--interval ou --outage)")
+        finish.set()
+        sys.exit(1)
+    server = LeaderboardServer(address, service).start()
+    recovered_at = time.monotonic()
+
+    total = args.kiosks * args.entries
+    delivered = wait_until(lambda: len(service) == total, 60)
+    drain_seconds = time.monotonic() - recovered_at
+    # Algumas buscas do topo depois da última entrega, então encerra os quiosques
+    time.sleep(PULL_INTERVAL * 5)
+    finish.set()
+    reports = sorted((results.get() for _ in kiosks), key=lambda report: report['kiosk_id'])
+    for kiosk in kiosks:
+        kiosk.join()
+    elapsed = time.monotonic() - start
+    top = service.top(args.top)
+    server.stop()
+
+    # Cada quiosque precisa ter o topo final: as próprias entradas mais as recebidas
+    merged = {}
+    for report in reports:
+        known = set(report['received']) | {entry['id'] for entry in top if entry['kiosk'] == report['kiosk_id']}
+        merged[report['kiosk_id']] = all(entry['id'] in known for entry in top)
+    stats = [report['stats'] for report in reports]
+    batches = sum(s['batches_sent'] for s in stats)
+    cost = summarize([sample for report in reports for sample in report['samples']])
+    passed = delivered and all(merged.values())
+
+    print(f"submit(): média={cost['mean_ms'] * 1000:.1f}µs p99={cost['p99_ms'] * 1000:.1f}µs "
+          f"máx={cost['max_ms'] * 1000:.1f}µs")
+    print(f"fora do ar: {offline_on_disk} entradas na caixa de saída em disco")
+    print(f"entregues {len(service)}/{total} em {elapsed:.1f}s (fila esvaziada {drain_seconds:.2f}s após a volta), "
+          f"reenvios ignorados pelo serviço={service.duplicates}")
+    print(f"lotes={batches} ({total / max(1, batches):.1f} entradas/lote) "
+          f"requisições={sum(s['requests'] for s in stats)} "
+          f"conexões por quiosque={[s['connections'] for s in stats]}")
+    print(f"topo remoto mesclado em todos os quiosques: {'ok' if all(merged.values()) else 'FALHOU'}")
+
+    write_results(os.path.abspath(args.output), {
+        'benchmark': 'ranking_sync',
+        'timestamp': time.time(),
+        'kiosks': args.kiosks,
+        'entries_per_kiosk': args.entries,
+        'outage_s': args.outage,
+        'submit_cost': cost,
+        'offline_on_disk': offline_on_disk,
+        'delivered': len(service),
+        'duplicates_ignored': service.duplicates,
+        'drain_after_recovery_s': drain_seconds,
+        'merged_top': merged,
+        'kiosk_stats': stats,
+        'passed': passed,
+    })
+    if not passed:
+        print("ERRO: entradas não entregues ou topo remoto não mesclado")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark da gravação do ranking com um sistema de arquivos lento simulado
+Compara a latência vista pelo tratador de eventos ao salvar um score de forma
+síncrona (store.add) e pela thread de gravação (RankingWriter.submit), confere
+que o ranking otimista exibido durante as gravações nunca mostra um score duas
+vezes, que uma gravação que falha é repetida e que nenhuma entrada se perde
+após o flush de saída
+
+Uso:
+    python benchmarks/bench_ranking_writer.py --delay-ms 200 --entries 40
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, summarize, write_results
+
+setup_headless()
+
+from ranking import FSYNC_POLICIES, MAX_RANKING_ENTRIES, RankingStore, RankingWriter, merge_pending  # noqa: E402
+
+
+class SlowRankingStore(RankingStore):
+    """RankingStore cujas gravações demoram `delay` segundos (disco lento/rede)"""
+    def __init__(self, path, delay):
+        super().__init__(path, MAX_RANKING_ENTRIES)
+        self.delay = delay
+        self.saves = 0
+
+    def save(self, durable=True):
+        time.sleep(self.delay)
+        self.saves += 1
+        super().save(durable)
+
+
+class FailingRankingStore(SlowRankingStore):
+    """SlowRankingStore cujas `failures` primeiras gravações falham (disco cheio)"""
+    def __init__(self, path, delay, failures):
+        super().__init__(path, delay)
+        self.failures = failures
+
+    def save(self, durable=True):
+        if self.failures:
+            self.failures -= 1
+            time.sleep(self.delay)
+            raise OSError(28, "No space left on device")
+        super().save(durable)
+
+
+def make_entries(count):
+    return [{'name': f"Técnico {i}", 'score': (i * 37) % 1000, 'fixed_robots': i % 7, 'time': 90.0}
+            for i in range(count)]
+
+
+def expected_top(entries):
+    return sorted(entries, key=lambda x: x['score'], reverse=True)[:MAX_RANKING_ENTRIES]
+
+
+def run_sync(path, entries, delay, interval):
+    store = SlowRankingStore(path, delay)
+    latencies = []
+    for entry in entries:
+        start = time.perf_counter_ns()
+        store.add(entry)
+        latencies.append(time.perf_counter_ns() - start)
+        time.sleep(interval)
+    return latencies, store.saves, RankingStore(path).load()
+
+
+def optimistic_view(store, writer):
+    """O ranking que a GUI exibe logo após salvar (load_ranking da página 0)"""
+    pending = writer.pending()
+    return merge_pending(store.page(0, MAX_RANKING_ENTRIES), pending, MAX_RANKING_ENTRIES)
+
+
+def has_duplicates(view):
+    names = [entry['name'] for entry in view]
+    return len(names) != len(set(names))
+
+
+def watch_writes(store, writer, timeout=60):
+    """
+    Lê o ranking otimista sem parar enquanto a thread grava (inclusive no meio
+    das gravações lentas) e retorna (leituras, leituras com score repetido)
+    """
+    views = duplicated = 0
+    deadline = time.monotonic() + timeout
+    while (writer.pending() or writer._writing) and time.monotonic() < deadline:
+        views += 1
+        duplicated += has_duplicates(optimistic_view(store, writer))
+        time.sleep(0.001)
+    return views, duplicated
+
+
+def run_async(path, entries, delay, interval, fsync_policy):
+    store = SlowRankingStore(path, delay)
+    writer = RankingWriter(store, fsync_policy)
+    latencies = []
+    views = duplicated = 0
+    for entry in entries:
+        start = time.perf_counter_ns()
+        writer.submit(entry)
+        view = optimistic_view(store, writer)
+        latencies.append(time.perf_counter_ns() - start)
+        views += 1
+        duplicated += has_duplicates(view)
+        time.sleep(interval)
+    watched, watched_duplicated = watch_writes(store, writer)
+    flush_start = time.perf_counter()
+    writer.close(timeout=60)
+    flush_seconds = time.perf_counter() - flush_start
+    return (latencies, store.saves, RankingStore(path).load(), flush_seconds,
+            {'views': views + watched, 'duplicated': duplicated + watched_duplicated})
+
+
+def run_failing(path, entries, delay):
+    """A primeira gravação falha: as entradas continuam visíveis e são gravadas na repetição"""
+    store = FailingRankingStore(path, delay, failures=1)
+    writer = RankingWriter(store, "never", retry_seconds=0.05)
+    for entry in entries:
+        writer.submit(entry)
+    views, duplicated = watch_writes(store, writer)
+    unsaved = writer.close(timeout=60)
+    return {'views': views, 'duplicated': duplicated, 'errors': 1 if writer.last_error else 0,
+            'unsaved': unsaved, 'final': RankingStore(path).load()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay-ms", type=float, default=200, help="atraso simulado de cada gravação")
+    parser.add_argument("--entries", type=int, default=40)
+    parser.add_argument("--interval-ms", type=float, default=5, help="intervalo entre salvamentos")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="always")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "ranking_writer.json"))
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="bench_ranking_")
+    entries = make_entries(args.entries)
+    delay, interval = args.delay_ms / 1000, args.interval_ms / 1000
+
+    sync_lat, sync_saves, sync_final = run_sync(os.path.join(directory, "sync.json"), entries, delay, interval)
+    async_lat, async_saves, async_final, flush_seconds, async_views = run_async(
+        os.path.join(directory, "async.json"), entries, delay, interval, args.fsync)
+    failing = run_failing(os.path.join(directory, "failing.json"), entries, delay)
+
+    expected = expected_top(entries)
+    ok = sync_final == expected and async_final == expected and failing.pop('final') == expected
+    no_duplicates = async_views['duplicated'] == 0 and failing['duplicated'] == 0
+    results = {
+        'benchmark': 'ranking_writer',
+        'timestamp': time.time(),
+        'delay_ms': args.delay_ms,
+        'entries': args.entries,
+        'fsync': args.fsync,
+        'sync': {'handler_latency': summarize(sync_lat), 'saves': sync_saves},
+        'async': {'handler_latency': summarize(async_lat), 'saves': async_saves,
+                  'flush_on_exit_s': flush_seconds, 'optimistic_views': async_views},
+        'failed_write': failing,
+        'no_lost_entries': ok,
+        'no_duplicates': no_duplicates,
+    }
+    print(f"síncrono:   p99={results['sync']['handler_latency']['p99_ms']:.3f}ms gravações={sync_saves}")
+    print(f"assíncrono: p99={results['async']['handler_latency']['p99_ms']:.3f}ms gravações={async_saves} "
+          f"flush={flush_seconds:.3f}s")
+    print(f"ranking otimista durante as gravações: {async_views['views']} leituras, "
+          f"{async_views['duplicated']} com score repetido")
+    print(f"gravação com falha: {failing['views']} leituras, {failing['duplicated']} com score repetido, "
+          f"não gravadas={failing['unsaved']}")
+    write_results(os.path.abspath(args.output), results)
+    if not ok:
+        print("ERRO: o ranking gravado difere do esperado")
+        sys.exit(1)
+    if not no_duplicates:
+        print("ERRO: o ranking otimista exibiu um score duas vezes")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark de renderização sem janela (SDL_VIDEODRIVER=dummy)
+Mede a distribuição do tempo de frame de cada tela em estados de jogo roteirizados
+
+Uso:
+    python benchmarks/bench_render.py --frames 2000 --output benchmarks/results/render.json
+"""
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, seed_queue, setup_headless, summarize, write_results
+
+setup_headless()
+
+import pygame  # noqa: E402
+
+from game import MAX_ROBOTS  # noqa: E402
+from gui import GUI, MAX_RANKING_ENTRIES  # noqa: E402
+
+
+def _fake_ranking():
+    return [
+        {'name': f"Técnico {i}", 'score': 1000 - i * 50, 'fixed_robots': 10 - i, 'time': 90.0}
+        for i in range(MAX_RANKING_ENTRIES)
+    ]
+
+
+def build_scenarios(large_sizes, stack_depth):
+    """
+    Retorna a lista de (nome, tela, preparação). A preparação recebe a GUI e
+    deixa o estado pronto para desenhar a tela
+    """
+    def menu(gui):
+        gui.state = "menu"
+
+    def ranking(gui):
+        gui.ranking = _fake_ranking()
+        gui.state = "ranking"
+
+    def playing(count, num_components=3):
+        def prepare(gui):
+            gui.game.start_game()
+            seed_queue(gui.game, count, num_components)
+            gui.state = "playing"
+        return prepare
+
+    def game_over(gui):
+        gui.game.start_game()
+        gui.game.game_over = True
+        gui.game.final_score = 1234
+        gui.state = "game_over"
+
+    scenarios = [
+        ("menu", "menu", menu),
+        ("ranking_full", "ranking", ranking),
+        ("playing_empty", "playing", playing(0)),
+        ("playing_full", "playing", playing(MAX_ROBOTS)),
+    ]
+    for size in large_sizes:
+        scenarios.append((f"playing_queue_{size}", "playing", playing(size)))
+    scenarios.append((f"playing_stack_{stack_depth}", "playing", playing(MAX_ROBOTS, stack_depth)))
+    scenarios.append(("game_over", "game_over", game_over))
+    return scenarios
+
+
+def run_scenario(gui, prepare, frames, warmup):
+    """Desenha `warmup + frames` quadros e retorna os tempos (ns) medidos"""
+    prepare(gui)
+    samples = []
+    for i in range(warmup + frames):
+        pygame.event.pump()
+        start = time.perf_counter_ns()
+        gui.draw()
+        elapsed = time.perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=2000, help="quadros medidos por cenário")
+    parser.add_argument("--warmup", type=int, default=50, help="quadros descartados antes da medição")
+    parser.add_argument("--large", type=int, nargs="*", default=[1000, 10000],
+                        help="tamanhos das filas grandes")
+    parser.add_argument("--stack-depth", type=int, default=200, help="componentes por robô no cenário de pilha longa")
+    parser.add_argument("--size", type=int, nargs=2, default=[1200, 800], metavar=("W", "H"))
+    parser.add_argument("--only", nargs="*", help="executa apenas os cenários informados")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "render.json"))
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    # Roda em um diretório temporário para não tocar no ranking.json real
+    os.chdir(tempfile.mkdtemp(prefix="bench_render_"))
+    gui = GUI()
+    gui.resize(*args.size)
+
+    results = {}
+    for name, screen, prepare in build_scenarios(args.large, args.stack_depth):
+        if args.only and name not in args.only:
+            continue
+        samples = run_scenario(gui, prepare, args.frames, args.warmup)
+        results[name] = {'screen': screen, **summarize(samples)}
+        print(f"{name:<24} p50={results[name]['p50_ms']:.3f}ms "
+              f"p99={results[name]['p99_ms']:.3f}ms max={results[name]['max_ms']:.3f}ms")
+
+    pygame.quit()
+    write_results(output, {
+        'benchmark': 'render',
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'window': args.size,
+        'frames': args.frames,
+        'scenarios': results,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark de redimensionamento da janela ("tempestade" de VIDEORESIZE)
+Simula o arraste da borda da janela, com vários eventos por frame, e compara os
+picos de tempo de frame entre as estratégias de aplicação do novo tamanho
+
+Uso:
+    python benchmarks/bench_resize.py --frames 300 --events-per-frame 3
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, seed_queue, setup_headless, summarize, write_results
+
+setup_headless()
+
+import pygame  # noqa: E402
+
+from game import MAX_ROBOTS  # noqa: E402
+from gui import GUI, RESIZE_SETTLE_MS  # noqa: E402
+
+# Estratégias comparadas:
+#   per_event: reconfigura a tela a cada evento (comportamento antigo)
+#   per_frame: agrupa os eventos e aplica no máximo uma vez por frame
+#   debounced: aplica só depois de RESIZE_SETTLE_MS sem novos eventos
+MODES = ("per_event", "per_frame", "debounced")
+
+
+def storm_size(step, base=(1200, 800), amplitude=300):
+    """Tamanho da janela no passo `step` do arraste (oscila como um arraste real)"""
+    delta = int(amplitude * math.sin(step / 15))
+    return base[0] + delta, base[1] + delta // 2
+
+
+def run_mode(mode, frames, quiet_frames, events_per_frame, fps):
+    gui = GUI()
+    gui.resize(1200, 800)
+    gui.game.start_game()
+    seed_queue(gui.game, MAX_ROBOTS)
+    gui.state = "playing"
+    gui.resize_settle_ms = 0 if mode == "per_frame" else RESIZE_SETTLE_MS
+
+    resizes = 0
+    original_resize = gui.resize
+
+    def counting_resize(width, height):
+        nonlocal resizes
+        resizes += 1
+        original_resize(width, height)
+    gui.resize = counting_resize
+
+    clock = pygame.time.Clock()
+    storm, settle = [], []
+    step = 0
+    for frame in range(frames + quiet_frames):
+        in_storm = frame < frames
+        start = time.perf_counter_ns()
+        if in_storm:
+            for _ in range(events_per_frame):
+                width, height = storm_size(step)
+                step += 1
+                if mode == "per_event":
+                    gui.resize(width, height)
+                else:
+                    pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, w=width, h=height,
+                                                         size=(width, height)))
+        gui.handle_events()
+        gui.draw()
+        elapsed = time.perf_counter_ns() - start
+        (storm if in_storm else settle).append(elapsed)
+        clock.tick(fps)
+
+    pygame.quit()
+    return {
+        'display_reconfigurations': resizes,
+        'storm': summarize(storm),
+        'settle': summarize(settle),
+        'final_size': [gui.width, gui.height],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=300, help="quadros com eventos de redimensionamento")
+    parser.add_argument("--quiet-frames", type=int, default=30, help="quadros sem eventos após o arraste")
+    parser.add_argument("--events-per-frame", type=int, default=3)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "resize.json"))
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_resize_"))
+    results = {}
+    for mode in MODES:
+        results[mode] = run_mode(mode, args.frames, args.quiet_frames, args.events_per_frame, args.fps)
+        storm = results[mode]['storm']
+        print(f"{mode:<10} set_mode={results[mode]['display_reconfigurations']:<5} "
+              f"p50={storm['p50_ms']:.3f}ms p99={storm['p99_ms']:.3f}ms max={storm['max_ms']:.3f}ms")
+
+    write_results(output, {
+        'benchmark': 'resize',
+        'timestamp': time.time(),
+        'frames': args.frames,
+        'events_per_frame': args.events_per_frame,
+        'settle_ms': RESIZE_SETTLE_MS,
+        'modes': results,
+    })
+
+
+if __name__ == "__main__":
+    main()
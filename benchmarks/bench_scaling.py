@@ -0,0 +1,346 @@
+"""
+Benchmark de escalabilidade assintótica das estruturas (structures.py)
+Mede o tempo por operação de cada estrutura em tamanhos que crescem em
+progressão geométrica (10 a 10^6), ajusta o expoente de crescimento empírico
+(inclinação de log(tempo) x log(n)) e falha quando uma operação cresce mais
+rápido que a classe de complexidade declarada. Cada execução é acrescentada a
+um histórico em JSON Lines para acompanhar a evolução entre versões
+
+Uso:
+    python benchmarks/bench_scaling.py --max-size 1000000 --steps-per-decade 2
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, ROOT_DIR, setup_headless, write_results
+
+setup_headless()
+
+from structures import PRIORITY_LEVELS, ComponentStack, RepairQueue, RobotLinkedList  # noqa: E402
+
+PRIORITIES = ("emergência", "padrão", "baixo risco")
+
+# Expoente máximo aceito por classe. A folga cobre o ruído e a hierarquia de
+# memória: em estruturas maiores que o cache cada passo fica mais caro (o pop
+# do heap faz log n trocas, mas cada troca custa ~1.7x mais em 10^6 que em 10^3)
+COMPLEXITY_EXPONENTS = {
+    "O(1)": 0.3,
+    "O(log n)": 0.5,
+    "O(n)": 1.3,
+    "O(n log n)": 1.45,
+    "O(n^2)": 2.3,
+}
+
+
+class BenchRobot:
+    """Robô mínimo (as estruturas só usam o ID e a prioridade)"""
+    __slots__ = ("id", "priority")
+
+    def __init__(self, robot_id, priority):
+        self.id = robot_id
+        self.priority = priority
+
+
+def make_robots(count, rng, start=0):
+    return [BenchRobot(start + i, rng.choice(PRIORITIES)) for i in range(count)]
+
+
+# --- OPERAÇÕES MEDIDAS ---
+# Cada operação: (nome, complexidade declarada, setup(n, rng) -> estado,
+# run(estado, k) que executa k operações, lote máximo para o tamanho n)
+
+def linked_list(n, rng, ordered=True):
+    """Lista com n robôs; ordenada como o sort_by_priority deixaria (sem chamá-lo)"""
+    robots = make_robots(n, rng)
+    if ordered:
+        robots.sort(key=lambda robot: PRIORITY_LEVELS[robot.priority])
+    queue = RobotLinkedList()
+    for robot in robots:
+        queue.append(robot)
+    return queue
+
+
+def list_append(robots, k):
+    start = robots.size + 10 ** 9
+    for i in range(k):
+        robots.append(BenchRobot(start + i, "padrão"))
+
+
+def list_find(robots, k):
+    # Pior caso: o robô procurado é o último
+    last_id = robots.tail.data.id
+    for _ in range(k):
+        robots.find(last_id)
+
+
+def list_remove(robots, k):
+    # Remove e devolve o último robô (a busca percorre a lista toda)
+    for _ in range(k):
+        robot = robots.tail.data
+        robots.remove(robot.id)
+        robots.append(robot)
+
+
+def list_get_all(robots, k):
+    for _ in range(k):
+        robots.get_all()
+
+
+def list_sort_after_append(state, k):
+    # Caso do jogo: a lista está ordenada e um robô novo chega no fim
+    robots, rng = state
+    for i in range(k):
+        robots.append(BenchRobot(10 ** 9 + i, rng.choice(PRIORITIES)))
+        robots.sort_by_priority()
+
+
+def list_sort_shuffled(robots, k):
+    robots.sort_by_priority()
+
+
+def component_stack(n, rng):
+    stack = ComponentStack()
+    for i in range(n):
+        stack.push(i)
+    return stack
+
+
+def stack_push(stack, k):
+    for i in range(k):
+        stack.push(i)
+
+
+def stack_pop(stack, k):
+    for _ in range(k):
+        stack.pop()
+
+
+def stack_get_all(stack, k):
+    for _ in range(k):
+        stack.get_all()
+
+
+def repair_queue(n, rng):
+    queue = RepairQueue(aging_interval=None)
+    for robot in make_robots(n, rng):
+        queue.append(robot)
+    return queue
+
+
+def heap_append(queue, k):
+    start = len(queue) + 10 ** 9
+    for i in range(k):
+        queue.append(BenchRobot(start + i, PRIORITIES[i % 3]))
+
+
+def heap_pop(queue, k):
+    for _ in range(k):
+        queue.pop()
+
+
+def heap_remove(queue, k):
+    # Remove e devolve robôs do meio do heap
+    for i in range(k):
+        robot = queue._heap[(i * 7919) % len(queue)][2]
+        queue.remove(robot.id)
+        queue.append(robot)
+
+
+def heap_find(queue, k):
+    robot_id = queue._heap[-1][2].id
+    for _ in range(k):
+        queue.find(robot_id)
+
+
+def heap_iter_range_after_change(queue, k):
+    # Caso da rolagem no preset endless: a fila muda a cada frame e o painel
+    # mostra uma janela de 30 linhas perto do fim
+    start = len(queue) + 10 ** 9
+    for i in range(k):
+        queue.append(BenchRobot(start + i, PRIORITIES[i % 3]))
+        for _ in queue.iter_range(len(queue) - 40, 30):
+            pass
+
+
+def heap_get_all(queue, k):
+    for _ in range(k):
+        queue.get_all()
+
+
+OPERATIONS = [
+    ("RobotLinkedList.append", "O(1)", linked_list, list_append, lambda n: 1000),
+    ("RobotLinkedList.find", "O(n)", linked_list, list_find, lambda n: 1000),
+    ("RobotLinkedList.remove", "O(n)", linked_list, list_remove, lambda n: 1000),
+    ("RobotLinkedList.get_all", "O(n)", linked_list, list_get_all, lambda n: 1000),
+    ("RobotLinkedList.sort_by_priority (após append)", "O(n)",
+     lambda n, rng: (linked_list(n, rng), rng), list_sort_after_append, lambda n: 100),
+    # Ordenação por inserção a partir de uma ordem aleatória
+    ("RobotLinkedList.sort_by_priority (aleatória)", "O(n^2)",
+     lambda n, rng: linked_list(n, rng, ordered=False), list_sort_shuffled, lambda n: 1),
+    ("ComponentStack.push", "O(1)", component_stack, stack_push, lambda n: 10_000),
+    ("ComponentStack.pop", "O(1)", component_stack, stack_pop, lambda n: max(1, n // 2)),
+    ("ComponentStack.get_all", "O(n)", component_stack, stack_get_all, lambda n: 1000),
+    ("RepairQueue.append", "O(log n)", repair_queue, heap_append, lambda n: 10_000),
+    ("RepairQueue.pop", "O(log n)", repair_queue, heap_pop, lambda n: max(1, n // 2)),
+    ("RepairQueue.remove", "O(log n)", repair_queue, heap_remove, lambda n: 10_000),
+    ("RepairQueue.find", "O(1)", repair_queue, heap_find, lambda n: 10_000),
+    ("RepairQueue.iter_range (fim da fila, após mudança)", "O(log n)", repair_queue,
+     heap_iter_range_after_change, lambda n: 10_000),
+    ("RepairQueue.get_all", "O(n)", repair_queue, heap_get_all, lambda n: 1000),
+]
+
+
+def geometric_sizes(min_size, max_size, steps_per_decade):
+    sizes = []
+    exponent = math.log10(min_size)
+    while True:
+        size = int(round(10 ** exponent))
+        if size > max_size:
+            return sizes
+        if not sizes or size != sizes[-1]:
+            sizes.append(size)
+        exponent += 1 / steps_per_decade
+
+
+def measure(setup, run, n, max_batch, min_time, repeat, seed):
+    """
+    Tempo por operação (s) no tamanho n: o melhor de `repeat` lotes, cada um
+    em uma estrutura nova; o lote cresce até levar pelo menos `min_time`.
+    Como no timeit, o GC fica desligado durante a medição (as coletas
+    percorreriam os milhões de objetos da estrutura e dominariam o tempo)
+    """
+    def timed(state, count):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state, count)
+            return time.perf_counter() - start
+        finally:
+            gc.enable()
+
+    estimate = max(timed(setup(n, random.Random(seed)), 1), 1e-9)
+    batch = int(min(max_batch, max(1, min_time / estimate)))
+    return min(timed(setup(n, random.Random(seed + attempt)), batch) / batch for attempt in range(repeat))
+
+
+def fit_exponent(points, fit_from):
+    """Inclinação de log(tempo) x log(n) por mínimos quadrados (só a parte assintótica)"""
+    tail = [(n, t) for n, t in points if n >= fit_from]
+    if len(tail) < 3:
+        tail = points[-3:]
+    if len(tail) < 2:
+        return None
+    xs = [math.log(n) for n, _ in tail]
+    ys = [math.log(t) for _, t in tail]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance if variance else None
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def previous_exponents(history_path):
+    """Último expoente registrado no histórico para cada operação"""
+    exponents = {}
+    if not os.path.exists(history_path):
+        return exponents
+    with open(history_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                for name, op in json.loads(line)['operations'].items():
+                    exponents[name] = op['exponent']
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                continue
+    return exponents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--min-size", type=int, default=10)
+    parser.add_argument("--max-size", type=int, default=1_000_000)
+    parser.add_argument("--steps-per-decade", type=int, default=2, help="tamanhos medidos por década")
+    parser.add_argument("--fit-from", type=int, default=1000,
+                        help="menor tamanho usado no ajuste (abaixo dele domina o custo fixo)")
+    parser.add_argument("--min-time", type=float, default=0.02, help="duração mínima de cada lote (s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-call-seconds", type=float, default=2.0,
+                        help="não mede tamanhos em que uma chamada passaria deste tempo")
+    parser.add_argument("--only", help="mede só as operações cujo nome contém este texto")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history", default=os.path.join(RESULTS_DIR, "scaling_history.jsonl"),
+                        help="histórico em JSON Lines (uma execução por linha)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "scaling.json"))
+    args = parser.parse_args(argv)
+
+    sizes = geometric_sizes(args.min_size, args.max_size, args.steps_per_decade)
+    previous = previous_exponents(args.history)
+    operations = {}
+    failed = []
+    for name, declared, setup, run, max_batch in OPERATIONS:
+        if args.only and args.only not in name:
+            continue
+        limit = COMPLEXITY_EXPONENTS[declared]
+        points = []
+        for n in sizes:
+            # Para antes de um tamanho em que uma chamada passaria do limite de tempo
+            if points and points[-1][1] * (n / points[-1][0]) ** limit > args.max_call_seconds:
+                break
+            per_op = measure(setup, run, n, max_batch(n), args.min_time, args.repeat, args.seed)
+            points.append((n, per_op))
+        exponent = fit_exponent(points, args.fit_from)
+        passed = exponent is None or exponent <= limit
+        if not passed:
+            failed.append(name)
+        operations[name] = {
+            'declared': declared,
+            'max_exponent': limit,
+            'exponent': exponent,
+            'passed': passed,
+            'sizes': [n for n, _ in points],
+            'seconds_per_op': [t for _, t in points],
+        }
+        change = ""
+        if exponent is not None and previous.get(name) is not None:
+            change = f" (antes {previous[name]:.2f})"
+        print(f"{name:<48} {declared:<10} expoente={exponent if exponent is not None else float('nan'):5.2f}"
+              f"{change} até n={points[-1][0]:<8} {points[-1][1] * 1e6:10.2f}µs/op "
+              f"{'ok' if passed else 'REGRESSÃO'}")
+
+    run_record = {
+        'timestamp': time.time(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'operations': operations,
+        'passed': not failed,
+    }
+    history = os.path.abspath(args.history)
+    os.makedirs(os.path.dirname(history), exist_ok=True)
+    with open(history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run_record, ensure_ascii=False) + "\n")
+    write_results(os.path.abspath(args.output), dict(benchmark='scaling', **run_record))
+    if failed:
+        print(f"ERRO: crescimento acima da complexidade declarada em: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark do solucionador de jogo ótimo (teto de pontuação por partida)
+Para cada semente e velocidade de jogador, resolve a partida, mede os estados
+explorados por segundo e a taxa de acertos da tabela de transposição, e compara
+o teto com o bot que sempre conserta o robô selecionado pelo jogo (o primeiro
+da fila). O plano ótimo é reproduzido em um Game real, em tempo virtual, para
+confirmar que o score previsto é alcançável
+
+Uso:
+    python benchmarks/bench_solver.py --seeds 5 --speeds 1.5,2,3 --switch 0,0.5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, write_results
+
+setup_headless()
+
+from config import GameConfig  # noqa: E402
+from game import Game  # noqa: E402
+from soak_memory import VirtualClock  # noqa: E402
+from solver import PlayerModel, Solver, spawn_stream  # noqa: E402
+
+
+def play_session(seed, config, player, plan=None):
+    """
+    Joga uma partida real em tempo virtual, digitando um código a cada
+    `seconds_per_component` (mais `switch_seconds` ao interromper um robô)
+    Sem `plan`, conserta sempre o robô selecionado pelo jogo; com `plan`, segue
+    a lista de IDs. Retorna o score final
+    """
+    random.seed(seed)
+    clock = VirtualClock(0.0)
+    game = Game(clock=clock, config=config)
+    game.start_game()
+    end = game.start_time + config.time_limit
+    steps = iter(plan) if plan is not None else None
+    current = None
+    robot_id = None
+    waiting = False
+
+    def spawn_until(limit, inclusive):
+        # Chama o update exatamente nos instantes de spawn (sem a granularidade dos frames)
+        while True:
+            due = game.last_spawn_time + config.spawn_interval
+            if due > end or due > limit or (due == limit and not inclusive):
+                return
+            clock.now = due
+            game.update(due)
+
+    while True:
+        spawn_until(clock.now, True)
+        if steps is not None:
+            robot_id = robot_id if waiting else next(steps, None)
+            if robot_id is None:
+                break
+        else:
+            robot_id = game.selected_robot_id
+        # Fila vazia (ou o robô do plano ainda não chegou): espera o próximo spawn
+        waiting = game.robots.find(robot_id) is None if robot_id is not None else True
+        if waiting:
+            due = game.last_spawn_time + config.spawn_interval
+            if due > end:
+                break
+            clock.now = due
+            continue
+        switching = current is not None and robot_id != current
+        done = clock.now + player.seconds_per_component + (player.switch_seconds if switching else 0)
+        if done > end:
+            break
+        spawn_until(done, False)
+        clock.now = done
+        game.select_robot(robot_id)
+        robot = game.get_selected_robot()
+        game.validate_code(robot.get_top_component().code)
+        current = None if robot.is_repaired() else robot_id
+    return game.final_score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seeds", type=int, default=5, help="partidas (sementes 0..N-1)")
+    parser.add_argument("--speeds", default="1.5,2,3", help="segundos por componente")
+    parser.add_argument("--switch", default="0,0.5", help="custos de troca de robô (segundos)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "solver.json"))
+    args = parser.parse_args(argv)
+
+    config = GameConfig()
+    results = []
+    failed = False
+    for speed in (float(value) for value in args.speeds.split(",")):
+        for switch in (float(value) for value in args.switch.split(",")):
+            player = PlayerModel(speed, switch)
+            for seed in range(args.seeds):
+                solver = Solver(spawn_stream(seed, config), config, player)
+                best = solver.solve()
+                plan = solver.plan()
+                replayed = play_session(seed, config, player, plan)
+                bot = play_session(seed, config, player)
+                failed |= replayed != best
+                results.append(dict(seed=seed, seconds_per_component=speed, switch_seconds=switch,
+                                    best=best, replayed=replayed, bot=bot, **solver.stats()))
+            runs = results[-args.seeds:]
+            states = sum(run['states'] for run in runs)
+            elapsed = sum(run['elapsed_s'] for run in runs)
+            print(f"{speed:4.1f}s/comp troca={switch:3.1f}s  teto médio={sum(r['best'] for r in runs) / len(runs):7.0f} "
+                  f"bot={sum(r['bot'] for r in runs) / len(runs):7.0f} "
+                  f"estados={states:<8} estados/s={states / elapsed if elapsed else 0:9.0f} "
+                  f"acertos={sum(r['hit_rate'] for r in runs) / len(runs):.0%} "
+                  f"plano reproduzido={'ok' if all(r['replayed'] == r['best'] for r in runs) else 'DIVERGENTE'}")
+
+    write_results(os.path.abspath(args.output), {
+        'benchmark': 'solver',
+        'timestamp': time.time(),
+        'config': config.as_dict(),
+        'runs': results,
+    })
+    if failed:
+        print("ERRO: o score de algum plano ótimo não foi reproduzido no Game")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark de inicialização (tempo até o primeiro frame)
+Inicia o jogo em processos novos, sem janela, e mede o tempo entre a criação do
+processo e o primeiro frame desenhado, além do tempo de cada fase da inicialização
+
+Uso:
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, ROOT_DIR, write_results
+
+# Executado em cada processo filho: mesmo caminho do main.py, até o primeiro frame
+CHILD_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from profiler import StartupTimer
+startup = StartupTimer()
+from gui import GUI
+startup.mark("import_gui")
+gui = GUI(startup=startup)
+gui.draw()
+startup.finish("first_frame")
+print(json.dumps({{'first_frame_wall': time.time(), 'phases': startup.as_dict()}}))
+"""
+
+
+def run_once(workdir, importtime=False):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD_SCRIPT.format(root=ROOT_DIR)]
+
+    spawn_wall = time.time()
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    data['time_to_first_frame_ms'] = (data['first_frame_wall'] - spawn_wall) * 1000
+    if importtime:
+        data['importtime'] = result.stderr
+    return data
+
+
+def slowest_imports(importtime_output, count=15):
+    """Extrai os imports com maior tempo cumulativo da saída de -X importtime"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # Cabeçalho
+        rows.append((int(cumulative), int(own), name.strip()))
+    rows.sort(reverse=True)
+    return [{'module': name, 'self_us': own, 'cumulative_us': cumulative}
+            for cumulative, own, name in rows[:count]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true",
+                        help="roda uma vez extra com -X importtime e salva os imports mais lentos")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "startup.json"))
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    runs = [run_once(workdir) for _ in range(args.runs)]
+    ttff = [run['time_to_first_frame_ms'] for run in runs]
+    phases = {}
+    for phase in runs[0]['phases']:
+        phases[phase] = statistics.median(run['phases'][phase]['self_ms'] for run in runs)
+
+    results = {
+        'benchmark': 'startup',
+        'timestamp': time.time(),
+        'runs': args.runs,
+        'time_to_first_frame_ms': {
+            'median': statistics.median(ttff),
+            'min': min(ttff),
+            'max': max(ttff),
+        },
+        'phase_median_ms': phases,
+    }
+    if args.importtime:
+        results['slowest_imports'] = slowest_imports(run_once(workdir, importtime=True)['importtime'])
+
+    print(f"tempo até o primeiro frame: mediana={results['time_to_first_frame_ms']['median']:.1f}ms "
+          f"mín={min(ttff):.1f}ms máx={max(ttff):.1f}ms")
+    for phase, ms in phases.items():
+        print(f"  {phase:<14} {ms:8.2f}ms")
+    write_results(os.path.abspath(args.output), results)
+
+
+if __name__ == "__main__":
+    main()
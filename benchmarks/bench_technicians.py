@@ -0,0 +1,141 @@
+"""
+Benchmark de técnicos concorrentes (várias estações de reparo na mesma fila)
+Cada técnico roda em uma thread: reserva o robô livre mais urgente, digita os
+códigos (com um tempo de digitação simulado e uma fração de erros) e reserva o
+próximo, enquanto outra thread atualiza o jogo a 60 Hz. Mede a vazão de códigos
+por número de técnicos e confere que nenhuma atualização se perdeu
+(os totais do jogo batem com a soma dos técnicos e nenhum robô foi finalizado
+duas vezes)
+
+Uso:
+    python benchmarks/bench_technicians.py --technicians 1,2,4,8,16 --seconds 3
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, write_results
+
+setup_headless()
+
+from config import GameConfig  # noqa: E402
+from game import Game  # noqa: E402
+from structures import CODE_SPACE  # noqa: E402
+
+# Fila grande e spawn rápido: os técnicos nunca ficam sem robôs livres
+BENCH_CONFIG = GameConfig(time_limit=None, max_robots=200_000, spawn_interval=0.001,
+                          spawn_batch=100, initial_robots=5_000)
+UPDATE_HZ = 60
+
+
+def technician_loop(game, technician, stop, input_s, error_rate, rng, finished_ids):
+    """Laço de uma estação: reserva, digita os códigos e passa ao próximo robô"""
+    while not stop.is_set():
+        robot = game.claim_robot(technician)
+        if robot is None:
+            time.sleep(0.001)
+            continue
+        # O robô reservado só é alterado por este técnico: ler o topo sem o lock é seguro
+        while technician.robot_id == robot.id and not stop.is_set():
+            if input_s:
+                time.sleep(input_s)
+            code = robot.get_top_component().code
+            if rng.random() < error_rate:
+                code = (code + 1) % CODE_SPACE
+            game.submit_code(technician, code)
+        if technician.robot_id is None:
+            finished_ids.append(robot.id)
+    game.release_robot(technician)
+
+
+def updater_loop(game, stop):
+    interval = 1.0 / UPDATE_HZ
+    while not stop.is_set():
+        game.update(time.time())
+        stop.wait(interval)
+
+
+def run(count, seconds, input_ms, error_rate, seed):
+    random.seed(seed)
+    game = Game(config=BENCH_CONFIG)
+    game.start_game()
+    technicians = [game.add_technician() for _ in range(count)]
+    finished = [[] for _ in technicians]
+    stop = threading.Event()
+    threads = [threading.Thread(target=updater_loop, args=(game, stop))]
+    threads += [threading.Thread(target=technician_loop,
+                                 args=(game, technician, stop, input_ms / 1000, error_rate,
+                                       random.Random(seed + technician.id), finished_ids))
+                for technician, finished_ids in zip(technicians, finished)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    finished_ids = [robot_id for ids in finished for robot_id in ids]
+    submits = sum(technician.submits for technician in technicians)
+    checks = {
+        'components_replaced': game.components_replaced == sum(t.components_replaced for t in technicians),
+        'robots_fixed': game.robots_fixed == sum(t.robots_fixed for t in technicians) == len(finished_ids),
+        'score': game.final_score == sum(t.points for t in technicians),
+        'no_double_repair': len(finished_ids) == len(set(finished_ids)),
+        'claims_released': not game.claims,
+    }
+    return {
+        'technicians': count,
+        'elapsed_s': elapsed,
+        'submits': submits,
+        'submits_per_s': submits / elapsed,
+        'components_per_s': game.components_replaced / elapsed,
+        'robots_fixed': game.robots_fixed,
+        'queue_size': len(game.robots),
+        'checks': checks,
+        'consistent': all(checks.values()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--technicians", default="1,2,4,8,16", help="quantidades de técnicos")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duração de cada rodada")
+    parser.add_argument("--input-ms", type=float, default=2.0,
+                        help="tempo de digitação de cada código (0 = só disputa pelo lock)")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="fração de códigos errados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "technicians.json"))
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = False
+    for count in (int(value) for value in args.technicians.split(",")):
+        result = run(count, args.seconds, args.input_ms, args.error_rate, args.seed)
+        results.append(result)
+        failed |= not result['consistent']
+        status = "ok" if result['consistent'] else "INCONSISTENTE " + ",".join(
+            name for name, passed in result['checks'].items() if not passed)
+        print(f"{count:>3} técnicos  códigos/s={result['submits_per_s']:9.0f} "
+              f"componentes/s={result['components_per_s']:9.0f} robôs={result['robots_fixed']:<7} {status}")
+
+    write_results(os.path.abspath(args.output), {
+        'benchmark': 'technicians',
+        'timestamp': time.time(),
+        'input_ms': args.input_ms,
+        'error_rate': args.error_rate,
+        'runs': results,
+    })
+    if failed:
+        print("ERRO: atualizações perdidas sob concorrência")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Utilitários compartilhados pelos benchmarks
+Configura o pygame sem janela (driver de vídeo "dummy") e monta estados de jogo
+"""
+import json
+import os
+import random
+import statistics
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+def setup_headless():
+    """Força o SDL a rodar sem janela/áudio e torna os módulos do jogo importáveis"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+
+def make_robot(robot_id, num_components, rng):
+    """Cria um robô com `num_components` componentes aleatórios"""
+    from game import Robot
+    from structures import Component, ComponentStack
+
+    stack = ComponentStack()
+    for _ in range(num_components):
+        stack.push(Component(rng.choice(["Sensor de Fluxo", "Placa Lógica", "Atuador de Junta"])))
+    priority = rng.choice(["emergência", "padrão", "baixo risco"])
+    return Robot(robot_id, rng.choice(["Modelo Sentinel", "Drone de Carga"]), priority, stack)
+
+
+def seed_queue(game, count, num_components=3, seed=0):
+    """Substitui a fila do jogo por `count` robôs gerados deterministicamente"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    game.robots = game._new_queue()
+    for robot_id in range(1, count + 1):
+        game.robots.append(make_robot(robot_id, num_components, rng))
+    game.robot_id_counter = count + 1
+    first_robot = game.robots.peek()
+    game.selected_robot_id = first_robot.id if first_robot else None
+
+
+def summarize(samples_ns):
+    """Resume uma lista de tempos (ns) em estatísticas em milissegundos"""
+    ordered = sorted(samples_ns)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] / 1e6
+
+    return {
+        'frames': len(ordered),
+        'mean_ms': statistics.fmean(ordered) / 1e6,
+        'min_ms': ordered[0] / 1e6,
+        'p50_ms': pct(50),
+        'p90_ms': pct(90),
+        'p99_ms': pct(99),
+        'max_ms': ordered[-1] / 1e6,
+    }
+
+
+def write_results(path, payload):
+    """Grava o resultado em JSON, criando o diretório se necessário"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=4)
+    print(f"Resultados salvos em {path}")
@@ -0,0 +1,181 @@
+"""
+Teste de longa duração (soak) do uso de memória
+Joga partidas completas em sequência, em tempo virtual (horas em poucos minutos):
+menu, partida com um jogador sintético, fim de jogo, ranking e volta ao menu.
+Depois do aquecimento, tira snapshots do tracemalloc em intervalos e falha
+quando a memória retida cresce além do orçamento, listando os pontos de
+alocação que mais cresceram
+
+Uso:
+    python benchmarks/soak_memory.py --hours 2 --budget-kb 256
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import RESULTS_DIR, setup_headless, write_results
+
+setup_headless()
+
+import pygame  # noqa: E402
+
+from bench_input import click, interaction_events  # noqa: E402
+from gui import GUI  # noqa: E402
+
+# Alocações do próprio tracemalloc e do mecanismo de import não contam
+TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class VirtualClock:
+    """Relógio das partidas controlado pelo teste (avança um passo fixo por frame)"""
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class SyntheticPlayer:
+    """
+    Posta na fila de eventos o que um jogador faria em cada tela
+    Alterna o fim das partidas entre salvar no ranking e voltar direto ao menu
+    (que recria o Game)
+    """
+    def __init__(self, gui, action_every):
+        self.gui = gui
+        self.action_every = action_every
+        self.sessions = 0
+        self._frame = 0
+
+    def act(self):
+        gui = self.gui
+        self._frame += 1
+        if self._frame % self.action_every:
+            return
+        if gui.hit_index.state != gui.state:
+            return  # A tela atual ainda não foi desenhada
+        if gui.state == "menu":
+            self.sessions += 1
+            pygame.event.post(click(gui.ui_rects['menu_start'].center))
+        elif gui.state == "playing":
+            for event in interaction_events(gui):
+                pygame.event.post(event)
+        elif gui.state == "game_over":
+            target = 'over_save_rank' if self.sessions % 2 else 'back_to_menu'
+            pygame.event.post(click(gui.ui_rects[target].center))
+        elif gui.state == "ranking":
+            pygame.event.post(click(gui.ui_rects['back_to_menu'].center))
+
+
+def traced_bytes():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def take_snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+
+
+def top_growth(baseline, snapshot, count):
+    """Pontos de alocação com maior crescimento desde o snapshot de referência"""
+    stats = snapshot.compare_to(baseline, 'lineno')
+    stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+    return [{'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'size_diff_kb': stat.size_diff / 1024, 'count_diff': stat.count_diff}
+            for stat in stats[:count] if stat.size_diff > 0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, default=2.0, help="tempo virtual total de jogo")
+    parser.add_argument("--fps", type=int, default=10, help="frames por segundo virtual")
+    parser.add_argument("--warmup-minutes", type=float, default=5.0,
+                        help="tempo virtual antes do snapshot de referência (caches aquecidos)")
+    parser.add_argument("--snapshot-minutes", type=float, default=10.0, help="intervalo entre as medições")
+    parser.add_argument("--budget-kb", type=float, default=256.0, help="crescimento máximo permitido")
+    parser.add_argument("--action-every", type=int, default=5, help="frames entre as ações do jogador")
+    parser.add_argument("--top", type=int, default=10, help="pontos de alocação listados")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "soak_memory.json"))
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    # O ranking salvo durante o teste fica em um diretório temporário
+    os.chdir(tempfile.mkdtemp(prefix="soak_memory_"))
+    clock = VirtualClock()
+    gui = GUI(game_clock=clock)
+    player = SyntheticPlayer(gui, args.action_every)
+
+    dt = 1.0 / args.fps
+    total_frames = int(args.hours * 3600 * args.fps)
+    warmup_frames = int(args.warmup_minutes * 60 * args.fps)
+    interval_frames = max(1, int(args.snapshot_minutes * 60 * args.fps))
+
+    tracemalloc.start()
+    baseline = None
+    baseline_bytes = 0
+    samples = []
+    failed = False
+    wall_start = time.perf_counter()
+    for frame in range(1, total_frames + 1):
+        clock.advance(dt)
+        player.act()
+        gui.handle_events()
+        gui.update()
+        gui.draw()
+
+        if frame == warmup_frames:
+            baseline = take_snapshot()
+            baseline_bytes = traced_bytes()
+        elif baseline is not None and (frame - warmup_frames) % interval_frames == 0:
+            current = traced_bytes()
+            growth_kb = (current - baseline_bytes) / 1024
+            minutes = frame * dt / 60
+            samples.append({'virtual_minutes': minutes, 'traced_kb': current / 1024,
+                            'growth_kb': growth_kb, 'sessions': player.sessions})
+            print(f"{minutes:7.1f} min  sessões={player.sessions:<4} memória={current / 1024:9.1f}KB "
+                  f"crescimento={growth_kb:+8.1f}KB")
+            if growth_kb > args.budget_kb:
+                failed = True
+                break
+
+    growth = top_growth(baseline, take_snapshot(), args.top) if baseline is not None else []
+    tracemalloc.stop()
+    gui.flush_ranking()
+    pygame.quit()
+
+    write_results(output, {
+        'benchmark': 'soak_memory',
+        'timestamp': time.time(),
+        'virtual_hours': args.hours,
+        'wall_seconds': time.perf_counter() - wall_start,
+        'sessions': player.sessions,
+        'budget_kb': args.budget_kb,
+        'samples': samples,
+        'top_growth': growth,
+        'passed': not failed,
+    })
+    if growth:
+        print("Pontos de alocação que mais cresceram:")
+        for site in growth:
+            print(f"  {site['size_diff_kb']:+9.1f}KB {site['count_diff']:+7} objs  {site['site']}")
+    if failed:
+        print(f"ERRO: a memória retida cresceu mais que {args.budget_kb:.0f}KB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Módulo de configuração do jogo
+Reúne os parâmetros de ajuste (tempo, fila, spawn, catálogos e pontuação) em um
+GameConfig, que pode vir de um preset, de um arquivo JSON ou das opções do main.py
+"""
+import json
+
+from structures import PRIORITY_LEVELS
+
+# --- CONFIGURAÇÕES PADRÃO (modo clássico) ---
+GAME_TIME_LIMIT = 90  # Tempo total em segundos (1:30 minuto)
+MAX_ROBOTS = 5       # Número máximo de robôs na fila de reparo
+ROBOT_SPAWN_INTERVAL = 8 # Intervalo de tempo (segundos) para spawn de novos robôs
+INITIAL_ROBOTS = 3   # Robôs na fila ao iniciar a partida
+
+MODEL_NAMES = ("Modelo Sentinel", "Unidade Worker-7", "Drone de Carga", "Cyborg Patrulha")
+COMPONENT_NAMES = ("Sensor de Fluxo", "Placa Lógica", "Atuador de Junta",
+                   "Capacitor de Plasma", "Conector de Energia", "Painel de Controle")
+# Distribuição de prioridade (Mais "padrão", menos "emergência")
+PRIORITY_WEIGHTS = {"emergência": 20, "padrão": 50, "baixo risco": 30}
+# Pontos por componente substituído, conforme a prioridade do robô
+PRIORITY_POINTS = {"emergência": 150, "padrão": 100, "baixo risco": 50}
+ROBOT_BONUS = 50     # Bônus por robô totalmente consertado
+# Fila de reparo: "heap" (heap indexado com envelhecimento) ou "list" (lista encadeada reordenada)
+REPAIR_QUEUES = ("heap", "list")
+AGING_INTERVAL = 30  # Segundos de espera para um robô subir um nível de prioridade
+# ----------------------------
+
+
+class GameConfig:
+    """
+    Parâmetros de uma partida
+    `time_limit=None` desliga o limite de tempo (modo sem fim); `spawn_batch` é o
+    máximo de robôs gerados por atualização quando o intervalo de spawn é menor
+    que a duração de um frame; `aging_interval=None` desliga o envelhecimento
+    das prioridades na fila "heap"; com `lazy_components` os componentes de
+    cada robô só são criados quando chegam ao topo da pilha ou são exibidos
+    """
+    FIELDS = ("time_limit", "max_robots", "spawn_interval", "spawn_batch", "initial_robots",
+              "min_components", "max_components", "model_names", "component_names",
+              "priority_weights", "priority_points", "robot_bonus", "repair_queue", "aging_interval",
+              "lazy_components")
+
+    def __init__(self, time_limit=GAME_TIME_LIMIT, max_robots=MAX_ROBOTS,
+                 spawn_interval=ROBOT_SPAWN_INTERVAL, spawn_batch=1, initial_robots=INITIAL_ROBOTS,
+                 min_components=2, max_components=5, model_names=MODEL_NAMES,
+                 component_names=COMPONENT_NAMES, priority_weights=None, priority_points=None,
+                 robot_bonus=ROBOT_BONUS, repair_queue="heap", aging_interval=AGING_INTERVAL,
+                 lazy_components=False):
+        self.time_limit = time_limit
+        self.max_robots = max_robots
+        self.spawn_interval = spawn_interval
+        self.spawn_batch = spawn_batch
+        self.initial_robots = initial_robots
+        self.min_components = min_components
+        self.max_components = max_components
+        self.model_names = tuple(model_names)
+        self.component_names = tuple(component_names)
+        self.priority_weights = dict(priority_weights or PRIORITY_WEIGHTS)
+        self.priority_points = dict(priority_points or PRIORITY_POINTS)
+        self.robot_bonus = robot_bonus
+        self.repair_queue = repair_queue
+        self.aging_interval = aging_interval
+        self.lazy_components = lazy_components
+        self.validate()
+
+    def validate(self):
+        """Confere os valores; levanta ValueError com o campo inválido"""
+        if self.time_limit is not None and self.time_limit <= 0:
+            raise ValueError("time_limit deve ser positivo (ou null para o modo sem fim)")
+        if self.max_robots < 1:
+            raise ValueError("max_robots deve ser pelo menos 1")
+        if self.spawn_interval <= 0:
+            raise ValueError("spawn_interval deve ser positivo")
+        if self.spawn_batch < 1:
+            raise ValueError("spawn_batch deve ser pelo menos 1")
+        if not 0 <= self.initial_robots <= self.max_robots:
+            raise ValueError("initial_robots deve estar entre 0 e max_robots")
+        if not 1 <= self.min_components <= self.max_components:
+            raise ValueError("min_components/max_components inválidos")
+        if not self.model_names or not self.component_names:
+            raise ValueError("os catálogos de modelos e componentes não podem ser vazios")
+        if set(self.priority_weights) != set(self.priority_points):
+            raise ValueError("priority_weights e priority_points devem ter as mesmas prioridades")
+        unknown = set(self.priority_weights) - set(PRIORITY_LEVELS)
+        if unknown:
+            # As filas de reparo só sabem ordenar as prioridades de PRIORITY_LEVELS
+            raise ValueError(f"Prioridades desconhecidas: {', '.join(sorted(unknown))} "
+                             f"(use: {', '.join(PRIORITY_LEVELS)})")
+        if self.repair_queue not in REPAIR_QUEUES:
+            raise ValueError(f"repair_queue deve ser um de: {', '.join(REPAIR_QUEUES)}")
+        if self.aging_interval is not None and self.aging_interval <= 0:
+            raise ValueError("aging_interval deve ser positivo (ou null para desligar)")
+        if not isinstance(self.lazy_components, bool):
+            raise ValueError("lazy_components deve ser true ou false")
+
+    @property
+    def endless(self):
+        return self.time_limit is None
+
+    def replace(self, **changes):
+        """Cópia com alguns campos alterados"""
+        values = self.as_dict()
+        values.update(changes)
+        return GameConfig(**values)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, values, base=None):
+        """Cria a configuração a partir de um dicionário (campos ausentes vêm de `base`)"""
+        unknown = set(values) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Campos desconhecidos na configuração: {', '.join(sorted(unknown))}")
+        merged = (base or cls()).as_dict()
+        merged.update(values)
+        return cls(**merged)
+
+    @classmethod
+    def load(cls, path, base=None):
+        """Lê um arquivo JSON com qualquer subconjunto dos campos"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), base)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=4, ensure_ascii=False)
+
+
+# Presets selecionáveis no main.py (--preset)
+PRESETS = {
+    "classic": {},
+    # Sem limite de tempo, 200 spawns por segundo e fila de dezenas de milhares de
+    # robôs: exercita as estruturas de dados e o renderizador em escala de produção
+    "endless": {
+        "time_limit": None,
+        "max_robots": 50_000,
+        "spawn_interval": 0.005,
+        "spawn_batch": 20,
+        "initial_robots": 100,
+        "lazy_components": True,
+    },
+}
+
+
+def preset(name):
+    """Retorna o GameConfig de um preset"""
+    if name not in PRESETS:
+        raise ValueError(f"Preset desconhecido: {name}")
+    return GameConfig.from_dict(PRESETS[name])
@@ -0,0 +1,96 @@
+"""
+Módulo de gerenciamento de fontes
+Carrega as faces sob demanda e mantém um cache de pygame.font.Font por (face, tamanho),
+com tamanhos proporcionais à altura da janela arredondados para poucas faixas
+"""
+import io
+import os
+
+import pygame
+
+FONT_DIR = "font"
+FONT_FACES = {
+    'regular': os.path.join(FONT_DIR, "RobotoMono-Regular.ttf"),
+    'bold': os.path.join(FONT_DIR, "RobotoMono-Bold.ttf"),
+}
+
+# Papel -> (face, tamanho com a fonte RobotoMono, tamanho com a fonte padrão do pygame)
+FONT_ROLES = {
+    'large': ('bold', 42, 48),
+    'medium': ('bold', 30, 32),
+    'medium_regular': ('regular', 28, 30),
+    'small': ('regular', 22, 24),
+    'small_bold': ('bold', 22, 24),
+    'tiny': ('regular', 18, 20),
+}
+
+BASE_HEIGHT = 800  # Altura da janela para a qual os tamanhos acima foram definidos
+# Escalas permitidas: redimensionar a janela só rasteriza fontes novas ao trocar de faixa
+SCALE_BUCKETS = (0.75, 0.875, 1.0, 1.125, 1.25)
+
+
+class FontManager:
+    """
+    Cache de fontes por (face, tamanho em pixels)
+    As faces são lidas do disco uma única vez, na primeira vez que são usadas
+    """
+    def __init__(self, height=BASE_HEIGHT):
+        self._face_data = {}
+        self._fonts = {}
+        self._role_fonts = {}
+        self.scale = 1.0
+        self.hits = 0
+        self.misses = 0
+        self.set_height(height)
+
+    def set_height(self, height):
+        """Ajusta a escala à altura da janela (na faixa mais próxima)"""
+        scale = min(SCALE_BUCKETS, key=lambda bucket: abs(bucket - height / BASE_HEIGHT))
+        if scale != self.scale:
+            self.scale = scale
+            self._role_fonts.clear()
+
+    def _load_face(self, face):
+        """Lê o arquivo da face uma vez; retorna None se ele não existir"""
+        if face not in self._face_data:
+            try:
+                with open(FONT_FACES[face], 'rb') as f:
+                    self._face_data[face] = f.read()
+            except FileNotFoundError:
+                # Fallback para a fonte padrão do Pygame
+                self._face_data[face] = None
+        return self._face_data[face]
+
+    def font(self, face, size):
+        """Retorna a fonte da face no tamanho em pixels informado (com cache)"""
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        data = self._load_face(face)
+        if data is None:
+            font = pygame.font.Font(None, size)
+        else:
+            font = pygame.font.Font(io.BytesIO(data), size)
+        self._fonts[key] = font
+        return font
+
+    def get(self, role):
+        """Retorna a fonte de um papel da interface ('large', 'small'...) na escala atual"""
+        font = self._role_fonts.get(role)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        face, size, fallback_size = FONT_ROLES[role]
+        if self._load_face(face) is None:
+            size = fallback_size
+        font = self._role_fonts[role] = self.font(face, round(size * self.scale))
+        return font
+
+    def stats(self):
+        """Retorna (acertos, falhas) do cache"""
+        return self.hits, self.misses
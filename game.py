@@ -2,17 +2,16 @@
 Módulo de lógica do jogo.
 Controla a criação de robôs, a pontuação, o tempo e a validação de códigos.
 """
+import threading
 import time
 import random
 
 # Importa as estruturas de dados (Component e RobotLinkedList) do structures.py
-from structures import Component, ComponentStack, RobotLinkedList
+from structures import Component, ComponentStack, FreeList, Node, RepairQueue, RobotLinkedList, encode_code
+# Parâmetros de ajuste (os valores padrão continuam exportados por este módulo)
+from config import GAME_TIME_LIMIT, MAX_ROBOTS, ROBOT_SPAWN_INTERVAL, GameConfig  # noqa: F401
 
-# --- CONFIGURAÇÕES DO JOGO ---
-GAME_TIME_LIMIT = 90  # Tempo total em segundos (1:30 minuto)
-MAX_ROBOTS = 5       # Número máximo de robôs na fila de reparo
-ROBOT_SPAWN_INTERVAL = 8 # Intervalo de tempo (segundos) para spawn de novos robôs
-# ----------------------------
+POOL_CAPACITY = 1024     # Objetos livres mantidos em cada pool (modo com pools)
 
 class Robot:
     """
@@ -32,10 +31,68 @@ class Robot:
     def is_repaired(self):
         return self.components.is_empty()
 
+    def reset(self, robot_id, model_name, priority, components_stack):
+        """Reinicializa um robô reaproveitado do pool"""
+        self.__init__(robot_id, model_name, priority, components_stack)
+
+
+class ObjectPools:
+    """
+    Pools (opcionais) dos objetos criados a cada robô gerado e descartados no reparo:
+    nós das listas/pilhas, componentes, pilhas e robôs
+    """
+    def __init__(self, capacity=POOL_CAPACITY):
+        self.nodes = FreeList(Node, capacity)
+        self.components = FreeList(Component, capacity)
+        self.stacks = FreeList(lambda: ComponentStack(self.nodes), capacity)
+        self.robots = FreeList(Robot, capacity)
+
+    def release_robot(self, robot):
+        """Devolve um robô fora da fila, com a sua pilha e os componentes restantes"""
+        stack = robot.components
+        # Componentes preguiçosos nunca criados não passam pelo pool
+        for component in stack.discard():
+            self.components.release(component)
+        self.stacks.release(stack)
+        robot.components = None
+        self.robots.release(robot)
+
+    def stats(self):
+        """Retorna {pool: (reaproveitados, criados)}"""
+        return {name: (pool.reused, pool.created)
+                for name, pool in (('nodes', self.nodes), ('components', self.components),
+                                   ('stacks', self.stacks), ('robots', self.robots))}
+
+
+class Technician:
+    """
+    Estação de reparo (técnico) trabalhando na fila compartilhada de um Game
+    Cada técnico tem a própria seleção (o robô reservado), mensagem e estatísticas
+    """
+    def __init__(self, technician_id):
+        self.id = technician_id
+        self.robot_id = None
+        self.message = ""
+        self.submits = 0
+        self.components_replaced = 0
+        self.robots_fixed = 0
+        self.points = 0
+
 
 class Game:
-    def __init__(self):
-        self.robots = RobotLinkedList()
+    def __init__(self, clock=time.time, pools=None, config=None):
+        # Protege o estado compartilhado: vários técnicos (threads) podem reservar
+        # robôs e enviar códigos ao mesmo tempo (ver claim_robot/submit_code)
+        self.lock = threading.RLock()
+        self.technicians = {}
+        self.claims = {}  # ID do robô -> ID do técnico que o reservou
+        # Parâmetros da partida (tempo, fila, spawn, catálogos e pontuação)
+        self.config = config or GameConfig()
+        # Fonte do tempo atual (pode ser trocada por um relógio virtual em simulações)
+        self.clock = clock
+        # ObjectPools opcional: robôs, pilhas, componentes e nós são reaproveitados
+        self.pools = pools
+        self.robots = self._new_queue()
         self.robot_id_counter = 1
         self.selected_robot_id = None
         
@@ -47,77 +104,108 @@ class Game:
         self.robots_fixed = 0
         self.components_replaced = 0
         self.final_score = 0
-        self.max_robots = MAX_ROBOTS # Exposto para a GUI
+        self.codes_rejected = 0   # Códigos incorretos enviados
+        self.spawn_overflows = 0  # Spawns perdidos com a oficina lotada
+        self.max_robots = self.config.max_robots # Exposto para a GUI
+        self.time_limit = self.config.time_limit # None no modo sem fim
         
         self.message = "Bem-vindo! Clique em INICIAR JOGO."
         
-        # Inicializa a fila com 3 robôs
-        for _ in range(3):
-            self._generate_new_robot(self.robot_id_counter)
+        # Inicializa a fila com os robôs iniciais
+        for _ in range(self.config.initial_robots):
+            self._generate_new_robot(self.robot_id_counter, sort=False)
             self.robot_id_counter += 1
             
         self.robots.sort_by_priority() # Ordena a fila inicial
-        self.select_robot(self.robots.head.data.id if self.robots.head else None)
+        first_robot = self.robots.peek()
+        self.select_robot(first_robot.id if first_robot else None)
 
 
     def start_game(self):
         """Reinicia o estado do jogo para começar uma nova partida."""
-        self.robots = RobotLinkedList()
+        with self.lock:
+            self._start_game()
+
+    def _start_game(self):
+        self.claims.clear()
+        for technician in self.technicians.values():
+            technician.robot_id = None
+        if self.pools:
+            for robot in self.robots.get_all():
+                self.pools.release_robot(robot)
+        self.robots = self._new_queue()
         self.robot_id_counter = 1
         self.selected_robot_id = None
         
-        self.start_time = time.time()
+        self.start_time = self.clock()
         self.last_spawn_time = self.start_time
         self.game_over = False
         self.game_won = False
         self.robots_fixed = 0
         self.components_replaced = 0
         self.final_score = 0
+        self.codes_rejected = 0
+        self.spawn_overflows = 0
         self.message = "Jogo iniciado! Priorize a EMERGÊNCIA."
         
         # Gera os robôs iniciais
-        for _ in range(3):
-            self._generate_new_robot(self.robot_id_counter)
+        for _ in range(self.config.initial_robots):
+            self._generate_new_robot(self.robot_id_counter, sort=False)
             self.robot_id_counter += 1
             
         self.robots.sort_by_priority()
-        self.select_robot(self.robots.head.data.id if self.robots.head else None)
+        first_robot = self.robots.peek()
+        self.select_robot(first_robot.id if first_robot else None)
+
 
+    def _new_queue(self):
+        """Cria a fila de reparo configurada (heap com envelhecimento ou lista encadeada)"""
+        if self.config.repair_queue == "heap":
+            return RepairQueue(self.clock, self.config.aging_interval)
+        return RobotLinkedList(self.pools.nodes if self.pools else None)
 
-    def _generate_new_robot(self, robot_id):
+    def _generate_new_robot(self, robot_id, sort=True):
         """
         Gera um novo robô com componentes e prioridade aleatórios.
+        Com sort=False, quem chama reordena a fila depois de gerar um lote.
         """
-        model_name = random.choice([
-            "Modelo Sentinel", "Unidade Worker-7", "Drone de Carga", "Cyborg Patrulha"
-        ])
+        config = self.config
+        model_name = random.choice(config.model_names)
         
         # Distribuição de prioridade (Mais "padrão", menos "emergência")
         priority = random.choices(
-            ["emergência", "padrão", "baixo risco"],
-            weights=[20, 50, 30],
+            list(config.priority_weights),
+            weights=list(config.priority_weights.values()),
             k=1
         )[0]
 
-        num_components = random.randint(2, 5)
-        components_stack = ComponentStack()
-
-        # --- CORREÇÃO APLICADA AQUI ---
-        # A classe Component (em structures.py) já gera o código alfanumérico
-        # automaticamente em seu __init__. Apenas instanciamos o componente.
-        for _ in range(num_components):
-            component_name = random.choice([
-                "Sensor de Fluxo", "Placa Lógica", "Atuador de Junta", 
-                "Capacitor de Plasma", "Conector de Energia", "Painel de Controle"
-            ])
-            # Apenas instancie a classe Component, sem passar o código.
-            new_component = Component(component_name) 
-            components_stack.push(new_component)
-        # -----------------------------
-
-        new_robot = Robot(robot_id, model_name, priority, components_stack)
+        num_components = random.randint(config.min_components, config.max_components)
+        pools = self.pools
+        components_stack = pools.stacks.acquire() if pools else ComponentStack()
+
+        if config.lazy_components:
+            # Só a contagem e uma semente: nome e código de cada componente são
+            # criados quando ele chega ao topo ou é exibido (determinístico pela semente)
+            factory = pools.components.acquire if pools else Component
+            components_stack.push_lazy(num_components, random.getrandbits(64), config.component_names, factory)
+        else:
+            # --- CORREÇÃO APLICADA AQUI ---
+            # A classe Component (em structures.py) já gera o código alfanumérico
+            # automaticamente em seu __init__. Apenas instanciamos o componente.
+            for _ in range(num_components):
+                component_name = random.choice(config.component_names)
+                # Apenas instancie a classe Component, sem passar o código.
+                new_component = pools.components.acquire(component_name) if pools else Component(component_name)
+                components_stack.push(new_component)
+            # -----------------------------
+
+        if pools:
+            new_robot = pools.robots.acquire(robot_id, model_name, priority, components_stack)
+        else:
+            new_robot = Robot(robot_id, model_name, priority, components_stack)
         self.robots.append(new_robot)
-        self.robots.sort_by_priority() # Reordena após adicionar
+        if sort:
+            self.robots.sort_by_priority() # Reordena após adicionar
         
         # Se nenhum robô estiver selecionado, selecione o novo (o mais prioritário)
         if self.selected_robot_id is None:
@@ -127,69 +215,89 @@ class Game:
     def select_robot(self, robot_id):
         """Seleciona um robô para exibição na GUI."""
         if robot_id is not None:
-            robot = self.robots.find(robot_id)
-            if robot:
-                self.selected_robot_id = robot_id
+            with self.lock:
+                robot = self.robots.find(robot_id)
+                if robot:
+                    self.selected_robot_id = robot_id
     
     def get_selected_robot(self):
         """Retorna o objeto Robot atualmente selecionado."""
         return self.robots.find(self.selected_robot_id)
 
     
-    def validate_code(self, input_code: str):
+    def validate_code(self, input_code):
         """
         Valida o código de substituição do componente no topo da pilha.
+        Aceita o texto digitado ou o código já empacotado (int).
         """
-        robot = self.get_selected_robot()
-        
-        if not robot:
-            self.message = "Erro: Selecione um robô para reparo."
-            return
+        with self.lock:
+            robot = self.get_selected_robot()
+            
+            if not robot:
+                self.message = "Erro: Selecione um robô para reparo."
+                return
 
+            if robot.id in self.claims:
+                self.message = "Erro: Este robô está com outro técnico. Selecione outro."
+                return
+
+            repaired, self.message, _, _ = self._apply_code(robot, input_code)
+            if repaired:
+                # Re-seleciona o robô mais prioritário
+                self._select_next_robot_in_queue()
+
+    def _apply_code(self, robot, input_code):
+        """
+        Aplica um código ao componente no topo da pilha do robô (chamado com o lock)
+        Retorna (acertou, mensagem, pontos ganhos, robô finalizado)
+        """
         top_component = robot.get_top_component()
         
         if not top_component:
-            self.message = "Erro: Este robô já está consertado. Selecione outro."
-            return
+            return False, "Erro: Este robô já está consertado. Selecione outro.", 0, False
         
-        # Garante que a comparação seja feita em CAIXA ALTA (já corrigido na GUI, mas por segurança)
-        if input_code.upper() == top_component.replacement_code.upper():
-            
-            # 1. Componente Reparado
-            repaired_component = robot.components.pop()
-            self.components_replaced += 1
-            self.message = f"SUCESSO! Componente '{repaired_component.name}' substituído."
-            
-            # 2. Atualiza a pontuação
-            self._update_score(robot.priority)
+        # O código digitado é convertido uma vez para o inteiro empacotado (a GUI
+        # já envia o inteiro); a comparação é entre dois inteiros
+        if isinstance(input_code, str):
+            input_code = encode_code(input_code)
+        if input_code != top_component.code:
+            self.codes_rejected += 1
+            return False, "CÓDIGO INCORRETO! Tente novamente.", 0, False
             
-            # 3. Verifica se o robô está totalmente consertado
-            if robot.is_repaired():
-                self._finish_robot_repair(robot)
-                
-            # 4. Re-seleciona o robô mais prioritário
-            self._select_next_robot_in_queue()
-
-        else:
-            self.message = "CÓDIGO INCORRETO! Tente novamente."
+        # 1. Componente Reparado
+        repaired_component = robot.components.pop()
+        self.components_replaced += 1
+        message = f"SUCESSO! Componente '{repaired_component.name}' substituído."
+        if self.pools:
+            self.pools.components.release(repaired_component)
+        
+        # 2. Atualiza a pontuação
+        points = self._update_score(robot.priority)
+        
+        # 3. Verifica se o robô está totalmente consertado
+        finished = robot.is_repaired()
+        if finished:
+            message += f" - Robô #{robot.id} REPARO FINALIZADO com sucesso!"
+            points += self._finish_robot_repair(robot)
+        return True, message, points, finished
 
     
     def _update_score(self, priority: str):
-        """Adiciona pontos com base na prioridade do robô."""
-        points = {
-            "emergência": 150,
-            "padrão": 100,
-            "baixo risco": 50
-        }
-        self.final_score += points.get(priority, 0)
+        """Adiciona pontos com base na prioridade do robô (e retorna os pontos)."""
+        points = self.config.priority_points.get(priority, 0)
+        self.final_score += points
+        return points
     
     
     def _finish_robot_repair(self, robot):
-        """Remove o robô consertado da fila e atualiza as estatísticas."""
+        """Remove o robô consertado da fila e atualiza as estatísticas (retorna o bônus)."""
         self.robots_fixed += 1
-        self.final_score += 50 # Bônus por robô
-        self.message += f" - Robô #{robot.id} REPARO FINALIZADO com sucesso!"
+        self.final_score += self.config.robot_bonus # Bônus por robô
         self.robots.remove(robot.id)
+        self.claims.pop(robot.id, None)
+        if self.pools:
+            self.pools.release_robot(robot)
+        return self.config.robot_bonus
         
     
     def _select_next_robot_in_queue(self):
@@ -199,50 +307,151 @@ class Game:
             self.message = "Fila de reparo vazia. Aguardando novos robôs..."
         else:
             # Seleciona o robô que está no topo da fila após a ordenação
-            self.select_robot(self.robots.head.data.id)
+            # (pulando os reservados por técnicos)
+            next_robot = self._next_unclaimed_robot()
+            self.select_robot(next_robot.id if next_robot else None)
+
+    def _next_unclaimed_robot(self):
+        """O robô mais urgente que nenhum técnico reservou (ou None)"""
+        if not self.claims:
+            return self.robots.peek()
+        for robot in self.robots.iter_range(0, len(self.claims) + 1):
+            if robot.id not in self.claims:
+                return robot
+        return None
+
+
+    # --- TÉCNICOS CONCORRENTES ---
+    # Cada operação segura o lock do jogo por pouco tempo; a reserva garante que
+    # dois técnicos nunca trabalham no mesmo robô
+
+    def add_technician(self):
+        """Registra uma nova estação de reparo"""
+        with self.lock:
+            technician = Technician(len(self.technicians) + 1)
+            self.technicians[technician.id] = technician
+            return technician
+
+    def claim_robot(self, technician, robot_id=None):
+        """
+        Reserva atomicamente um robô para o técnico: o indicado ou, sem `robot_id`,
+        o mais urgente ainda livre. Libera a reserva anterior do técnico
+        Retorna o robô reservado ou None se não houver um robô livre
+        """
+        with self.lock:
+            self._release_claim(technician)
+            if robot_id is None:
+                robot = self._next_unclaimed_robot()
+            else:
+                robot = self.robots.find(robot_id)
+                if robot is not None and robot.id in self.claims:
+                    robot = None
+            if robot is None:
+                technician.message = "Nenhum robô livre na fila."
+                return None
+            self.claims[robot.id] = technician.id
+            technician.robot_id = robot.id
+            technician.message = f"Robô #{robot.id} reservado."
+            return robot
+
+    def release_robot(self, technician):
+        """Devolve o robô reservado à fila (sem repará-lo)"""
+        with self.lock:
+            self._release_claim(technician)
+
+    def _release_claim(self, technician):
+        if technician.robot_id is not None:
+            self.claims.pop(technician.robot_id, None)
+            technician.robot_id = None
+
+    def submit_code(self, technician, input_code):
+        """
+        Valida um código no robô reservado pelo técnico
+        Ao finalizar o robô, a reserva é liberada. Retorna True se o código estava certo
+        """
+        with self.lock:
+            technician.submits += 1
+            robot = self.robots.find(technician.robot_id) if technician.robot_id is not None else None
+            if robot is None:
+                technician.message = "Erro: Reserve um robô para reparo."
+                return False
+            repaired, technician.message, points, finished = self._apply_code(robot, input_code)
+            if repaired:
+                technician.components_replaced += 1
+                technician.points += points
+                if finished:
+                    technician.robots_fixed += 1
+                    technician.robot_id = None
+            return repaired
 
 
     # --- CONTROLE DE TEMPO E FLUXO ---
 
     def get_time_left(self):
-        """Retorna o tempo restante de jogo em segundos."""
+        """Retorna o tempo restante de jogo em segundos (None no modo sem fim)."""
+        if self.time_limit is None:
+            return None
         if self.start_time is None:
-            return GAME_TIME_LIMIT
+            return self.time_limit
         
-        time_passed = time.time() - self.start_time
-        time_left = GAME_TIME_LIMIT - time_passed
+        time_passed = self.clock() - self.start_time
+        time_left = self.time_limit - time_passed
         return max(0, time_left)
 
+    def get_elapsed_time(self):
+        """Retorna o tempo decorrido desde o início da partida."""
+        if self.start_time is None:
+            return 0
+        return self.clock() - self.start_time
+
     def get_total_time_played(self):
         """Retorna o tempo total de jogo jogado (usado no game over)."""
+        if self.time_limit is None:
+            return self.get_elapsed_time()
         if self.start_time is None or not self.game_over:
             return 0
-        return self.start_time + GAME_TIME_LIMIT - self.start_time
+        return self.start_time + self.time_limit - self.start_time
     
     def update(self, current_time):
         """Lógica de atualização do jogo (chamada a cada frame)."""
+        with self.lock:
+            self._update(current_time)
+
+    def _update(self, current_time):
         if self.game_over or self.start_time is None:
             return
 
         time_left = self.get_time_left()
 
         # 1. Fim de Jogo
-        if time_left <= 0:
+        if time_left is not None and time_left <= 0:
             self.game_over = True
             self.message = "TEMPO ESGOTADO! Fim de Jogo."
             return
 
-        # 2. Spawn de Novos Robôs
-        if current_time - self.last_spawn_time >= ROBOT_SPAWN_INTERVAL:
-            if len(self.robots) < MAX_ROBOTS:
-                self._generate_new_robot(self.robot_id_counter)
-                self.robot_id_counter += 1
-                self.last_spawn_time = current_time
+        # 2. Spawn de Novos Robôs (até spawn_batch por atualização se o intervalo for curto)
+        interval = self.config.spawn_interval
+        if current_time - self.last_spawn_time >= interval:
+            room = self.max_robots - len(self.robots)
+            if room > 0:
+                due = int((current_time - self.last_spawn_time) / interval)
+                spawned = min(due, room, self.config.spawn_batch)
+                for _ in range(spawned):
+                    self._generate_new_robot(self.robot_id_counter, sort=False)
+                    self.robot_id_counter += 1
+                self.robots.sort_by_priority()
+                # Mantém a cadência exata; atrasos maiores que um lote são descartados
+                if spawned == due:
+                    self.last_spawn_time += spawned * interval
+                else:
+                    self.last_spawn_time = current_time
                 self.message = f"Novo robô #{self.robot_id_counter - 1} chegou para reparo."
             else:
                 self.message = "Oficina lotada! Máximo de robôs atingido."
+                self.spawn_overflows += 1
                 self.last_spawn_time = current_time # Resetar para tentar novamente
 
-        # 3. Manter a seleção no robô mais prioritário
-        if not self.robots.is_empty() and (self.selected_robot_id is None or self.selected_robot_id != self.robots.head.data.id):
-             self.select_robot(self.robots.head.data.id)
\ No newline at end of file
+        # 3. Manter a seleção no robô mais prioritário (que não esteja com um técnico)
+        next_robot = self._next_unclaimed_robot()
+        if next_robot is not None and self.selected_robot_id != next_robot.id:
+             self.select_robot(next_robot.id)
\ No newline at end of file
@@ -4,11 +4,17 @@ Implementa todas as telas do jogo usando pygame, com responsividade total
 """
 
 import pygame
-import json
-import os
 import time 
 # Importe a classe Game (assumindo que ela está em 'game.py')
-from game import Game, GAME_TIME_LIMIT
+from game import Game, GAME_TIME_LIMIT, ObjectPools
+from fonts import FontManager
+from metrics import MetricsWriter
+from profiler import FrameProfiler, StartupTimer
+from ranking import MAX_RANKING_ENTRIES, RankingWriter, merge_pending, open_ranking_store
+from sketch import SessionStatsWriter
+from surfaces import SurfaceCache
+from structures import CODE_LENGTH, encode_code
+from widgets import HitTestIndex, VirtualList
 
 
 # --- PALETA DE CORES ---
@@ -42,13 +48,37 @@ COLORS = {
     'input_focus': (0, 220, 255),
 }
 
-RANKING_FILE = "ranking.json"
-MAX_RANKING_ENTRIES = 10
+
+# --- LAYOUT DA FILA DE REPARO (Painel Esquerdo) ---
+QUEUE_ROW_TOP = 60     # Distância do topo do painel até a primeira linha
+QUEUE_ROW_HEIGHT = 60  # Altura de cada linha de robô
+QUEUE_ROW_PITCH = 65   # Distância entre o topo de duas linhas consecutivas
+QUEUE_PAGING_KEYS = (pygame.K_PAGEUP, pygame.K_PAGEDOWN, pygame.K_HOME, pygame.K_END)
+
+# --- REDIMENSIONAMENTO DA JANELA ---
+# Tempo (ms) sem novos VIDEORESIZE antes de reconfigurar a tela (0 = uma vez por frame)
+RESIZE_SETTLE_MS = 120
+
+# --- ÍCONE DO ROBÔ (sprite estático no formato da tela) ---
+ROBOT_ICON_SIZE = (70, 90)
+ROBOT_ICON_ORIGIN = (35, 30)  # Posição do ponto (x, y) de draw_robot_icon dentro do sprite
+
+# --- PROFILER DE FRAMES ---
+PROFILER_TOGGLE_KEY = pygame.K_F3  # Liga/desliga o overlay de desempenho
+PROFILER_TRACE_KEY = pygame.K_F4   # Exporta o trace coletado para um arquivo JSON
 
 
 class GUI:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, ranking_backend="json", ranking_fsync="always", threaded=False, startup=None,
+                 game_clock=time.time, pool_objects=False, game_config=None, metrics_path=None,
+                 ranking_sync_url=None, kiosk_id=None):
+        # Fases da inicialização até o primeiro frame (relatório com --startup-report)
+        self.startup = startup or StartupTimer()
+        
+        # Inicia apenas vídeo e fontes (o jogo não usa áudio nem joystick)
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.mark("pygame_init")
         # --- DEFINIÇÃO INICIAL DA JANELA (Configurada para ser RESIZABLE) ---
         self.width = 1200
         self.height = 800
@@ -56,11 +86,36 @@ class GUI:
         self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
         pygame.display.set_caption("Oficina de Reparo de Robôs - Neon Forge")
         self.clock = pygame.time.Clock()
+        self.startup.mark("window")
+        # Profiler de frames (desligado até o usuário pressionar F3)
+        self.profiler = FrameProfiler()
+        # Métricas ao vivo para monitores externos (opcional, --metrics)
+        self.metrics = MetricsWriter(metrics_path) if metrics_path else None
         
         self.load_fonts()
-        
-        self.game = Game()
+        # Textos e sprites convertidos para o formato da tela (reconvertidos ao redimensionar)
+        self.surfaces = SurfaceCache()
+        
+        # Relógio das partidas (o teste de longa duração usa um relógio virtual)
+        self.game_clock = game_clock
+        # Pools de objetos (opcional) compartilhados pelas partidas
+        self.game_pools = ObjectPools() if pool_objects else None
+        # Parâmetros das partidas (preset/arquivo de configuração; None = clássico)
+        self.game_config = game_config
+        self.game = Game(self.game_clock, self.game_pools, self.game_config)
         self.state = "menu"
+        self.startup.mark("game")
+        
+        # Modo opcional: a simulação roda em outra thread e a GUI desenha a partir
+        # do snapshot mais recente (self.view); sem ele, self.view é o próprio Game
+        self.simulation = None
+        self.view = self.game
+        if threaded:
+            from simulation import SimulationThread
+
+            self.simulation = SimulationThread(self.game)
+            self.view = self.simulation.latest()
+            self.simulation.start()
         
         self.input_code = ""
         self.input_active = False
@@ -69,17 +124,110 @@ class GUI:
         self.input_name_active = False
         self.ranking_saved = False
 
-        self.ranking = self.load_ranking()
+        # Ranking: JSON em memória (relido só quando o arquivo muda) ou SQLite completo.
+        # Armazenamento e thread de gravação só são criados no primeiro uso
+        self.ranking_backend = ranking_backend
+        self.ranking_fsync = ranking_fsync
+        self._ranking_store = None
+        self._ranking_writer = None
+        self.ranking_page = 0
+        self.ranking = []
+        self.ranking_total = 0  # Entradas no ranking (atualizado pelo load_ranking)
+        # Sincronização opcional com o leaderboard compartilhado pelos quiosques
+        # (thread própria; as entradas remotas são gravadas pelo RankingWriter)
+        self.ranking_sync = None
+        if ranking_sync_url:
+            from ranking_sync import open_ranking_sync
+
+            self.ranking_sync = open_ranking_sync(ranking_sync_url, kiosk_id,
+                                                  durable=ranking_fsync == "always")
+        
+        # Estatísticas de todas as partidas (sketch de quantis): lidas e gravadas
+        # em uma thread, para o fim de jogo não esperar o disco
+        self.session_stats = SessionStatsWriter(fsync_policy=ranking_fsync)
+        self.session_better_than = None
         
         # O self.ui_rects será recalculado no _calculate_ui_rects
         self.ui_rects = {}
+        self.queue_visible_rows = 0
+        # Rolagem da fila de reparo (desenha apenas a janela visível)
+        self.queue_list = VirtualList()
+        # Regiões clicáveis registradas pelo último frame desenhado
+        self.hit_index = HitTestIndex()
         self._calculate_ui_rects()
         
+        # Redimensionamento pendente (eventos VIDEORESIZE são agrupados)
+        self.pending_resize = None
+        self.pending_resize_ticks = 0
+        self.resize_settle_ms = RESIZE_SETTLE_MS
+        
+        self.profiler.register_cache("índice da fila",
+                                     lambda: (self._live_game().robots.index_hits,
+                                              self._live_game().robots.index_misses))
+        self.profiler.register_cache("fontes", self.fonts.stats)
+        self.profiler.register_cache("superfícies", self.surfaces.stats)
+        self.startup.mark("ui")
+        
+    @property
+    def ranking_store(self):
+        if self._ranking_store is None:
+            self._ranking_store = open_ranking_store(self.ranking_backend, MAX_RANKING_ENTRIES)
+        return self._ranking_store
+
+    @property
+    def ranking_writer(self):
+        """Thread de gravação do ranking (para não travar o frame no disco)"""
+        if self._ranking_writer is None:
+            self._ranking_writer = RankingWriter(self.ranking_store, self.ranking_fsync)
+        return self._ranking_writer
+
+    def _enter_game_over(self):
+        """Passa para a tela final e registra a partida nas estatísticas de todas as sessões"""
+        self.state = "game_over"
+        self.session_better_than = self.session_stats.record(
+            self.view.final_score, self.view.robots_fixed, self.view.get_total_time_played())
+
+    def _live_game(self):
+        """O Game em execução (no modo com thread, o da simulação)"""
+        return self.simulation.game if self.simulation else self.game
+
+    def _game_command(self, command, *args):
+        """Aplica um comando do jogador ao Game (ou o envia à thread da simulação)"""
+        if self.simulation:
+            self.simulation.post(command, *args)
+        else:
+            getattr(self.game, command)(*args)
+
+    def resize(self, width, height):
+        """Reconfigura a tela e recalcula o layout (e os caches que dependem do tamanho)"""
+        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        # A tela nova pode ter outro formato de pixel: reconverte as superfícies guardadas
+        self.surfaces.display_changed()
+        self._calculate_ui_rects()
+
+    def _apply_pending_resize(self):
+        """
+        Aplica o último tamanho recebido quando a janela para de ser redimensionada,
+        evitando recriar a tela a cada evento durante o arraste
+        """
+        if self.pending_resize is None:
+            return
+        if pygame.time.get_ticks() - self.pending_resize_ticks < self.resize_settle_ms:
+            return
+        width, height = self.pending_resize
+        self.pending_resize = None
+        if (width, height) != (self.width, self.height):
+            self.resize(width, height)
+
     def _calculate_ui_rects(self):
-        """Recalcula todos os retângulos da UI com base nas dimensões atuais"""
+        """
+        Recalcula todos os retângulos da UI com base nas dimensões atuais
+        Chamado apenas na inicialização e quando o tamanho da tela muda
+        """
         
         # Define as dimensões com base na tela atual
         self.width, self.height = self.screen.get_size()
+        self.fonts.set_height(self.height)
         
         # --- Dimensões Padrão para os Painéis (para manter a proporção) ---
         panel_h_margin = self.width * 0.015 # 1.5% de margem horizontal
@@ -111,6 +259,11 @@ class GUI:
         GO_INPUT_START_Y = self.height * 0.55
         GO_INPUT_Y = GO_INPUT_START_Y + 30
         GO_SAVE_Y = GO_INPUT_START_Y + 90
+
+        # --- FILA DE REPARO: área das linhas e quantidade de linhas visíveis ---
+        QUEUE_ROWS_Y = P_Y + QUEUE_ROW_TOP
+        QUEUE_ROWS_BOTTOM = P_Y + P_HEIGHT - 10
+        self.queue_visible_rows = max(0, (QUEUE_ROWS_BOTTOM - QUEUE_ROWS_Y - QUEUE_ROW_HEIGHT) // QUEUE_ROW_PITCH + 1)
         
         self.ui_rects.update({
             # Menu Screen (Centralizado e Responsivo)
@@ -121,6 +274,7 @@ class GUI:
             'play_panel_left': pygame.Rect(P_LEFT_X, P_Y, P_LEFT_WIDTH, P_HEIGHT),
             'play_panel_center': pygame.Rect(P_CENTER_X, P_Y, P_CENTER_WIDTH, P_HEIGHT),
             'play_panel_right': pygame.Rect(P_RIGHT_X, P_Y, P_RIGHT_WIDTH, P_HEIGHT),
+            'play_queue_rows': pygame.Rect(P_LEFT_X + 10, QUEUE_ROWS_Y, P_LEFT_WIDTH - 20, QUEUE_ROWS_BOTTOM - QUEUE_ROWS_Y),
             
             # Playing Screen Controls (Dentro do Painel Direito)
             'play_input_code': pygame.Rect(P_RIGHT_X + 10, P_Y + P_HEIGHT - 120, P_RIGHT_WIDTH - 20, 40),
@@ -129,60 +283,107 @@ class GUI:
             # Game Over Screen
             'over_input_name': pygame.Rect(self.width // 2 - 150, GO_INPUT_Y, 300, 40),
             'over_save_rank': pygame.Rect(self.width // 2 - 150, GO_SAVE_Y, 300, 60),
+
+            # Botão VOLTAR AO MENU (Ranking e Game Over: 100px da borda inferior)
+            'back_to_menu': pygame.Rect(self.width // 2 - 150, self.height - 100, 300, 60),
         })
 
+    def _queue_row_rect(self, index):
+        """Retângulo da linha `index` da fila de reparo (única fonte do layout das linhas)"""
+        rows_area = self.ui_rects['play_queue_rows']
+        return pygame.Rect(rows_area.x, rows_area.y + index * QUEUE_ROW_PITCH,
+                           rows_area.width, QUEUE_ROW_HEIGHT)
+
 
     def load_fonts(self):
-        # AQUI VOCÊ DEVE TER SEUS ARQUIVOS DE FONTE EM UMA PASTA 'font'
-        self.font_path_regular = os.path.join("font", "RobotoMono-Regular.ttf")
-        self.font_path_bold = os.path.join("font", "RobotoMono-Bold.ttf")
+        """
+        Cria o gerenciador de fontes. As faces (pasta 'font', com fallback para a
+        fonte padrão do Pygame) só são carregadas quando usadas pela primeira vez
+        """
+        self.fonts = FontManager(self.height)
 
-        try:
-            self.font_large = pygame.font.Font(self.font_path_bold, 42)
-            self.font_medium = pygame.font.Font(self.font_path_bold, 30)
-            self.font_medium_regular = pygame.font.Font(self.font_path_regular, 28)
-            self.font_small = pygame.font.Font(self.font_path_regular, 22)
-            self.font_small_bold = pygame.font.Font(self.font_path_bold, 22)
-            self.font_tiny = pygame.font.Font(self.font_path_regular, 18)
-        except FileNotFoundError:
-            # Fallback para fontes padrão do Pygame
-            self.font_large = pygame.font.Font(None, 48)
-            self.font_medium = pygame.font.Font(None, 32)
-            self.font_medium_regular = pygame.font.Font(None, 30)
-            self.font_small = pygame.font.Font(None, 24)
-            self.font_small_bold = pygame.font.Font(None, 24)
-            self.font_tiny = pygame.font.Font(None, 20)
-
-    def load_ranking(self):
-        """Carrega o ranking do arquivo JSON"""
-        if os.path.exists(RANKING_FILE):
-            with open(RANKING_FILE, 'r') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return []
-        return []
-
-    def save_ranking(self):
-        """Salva o ranking no arquivo JSON"""
-        self.ranking.sort(key=lambda x: x['score'], reverse=True)
-        self.ranking = self.ranking[:MAX_RANKING_ENTRIES]
-        with open(RANKING_FILE, 'w') as f:
-            json.dump(self.ranking, f, indent=4)
+    # --- FONTES POR PAPEL (resolvidas no cache conforme a altura da janela) ---
+    @property
+    def font_large(self):
+        return self.fonts.get('large')
+
+    @property
+    def font_medium(self):
+        return self.fonts.get('medium')
+
+    @property
+    def font_medium_regular(self):
+        return self.fonts.get('medium_regular')
+
+    @property
+    def font_small(self):
+        return self.fonts.get('small')
+
+    @property
+    def font_small_bold(self):
+        return self.fonts.get('small_bold')
+
+    @property
+    def font_tiny(self):
+        return self.fonts.get('tiny')
+
+    def load_ranking(self, page=0):
+        """Carrega uma página do ranking (o backend JSON usa a cópia em memória se o arquivo não mudou)"""
+        self.ranking_page = page
+        # Exibe de forma otimista as entradas que a thread ainda não gravou
+        # (lidas antes da página: ver merge_pending)
+        pending = self._ranking_writer.pending() if self._ranking_writer else []
+        entries = self.ranking_store.page(page, MAX_RANKING_ENTRIES)
+        # Total de entradas guardado para a paginação: a tela de ranking não
+        # consulta o armazenamento (os.stat ou SQL) a cada frame
+        self.ranking_total = self.ranking_store.count() + len(pending)
+        return merge_pending(entries, pending if page == 0 else [], MAX_RANKING_ENTRIES)
+
+    def change_ranking_page(self, delta):
+        """Avança/volta páginas na tela de ranking (PageUp/PageDown)"""
+        last_page = max(0, (self.ranking_total - 1) // MAX_RANKING_ENTRIES)
+        page = min(max(0, self.ranking_page + delta), last_page)
+        if page != self.ranking_page:
+            self.ranking = self.load_ranking(page)
+
+    def flush_ranking(self):
+        """Grava o que estiver pendente e encerra a thread de gravação do ranking"""
+        if self.ranking_sync:
+            # Último envio; o que não for confirmado fica na caixa de saída
+            self.ranking_sync.close()
+            self.ranking_sync = None
+        if self._ranking_writer:
+            self._ranking_writer.close()
+            self._ranking_writer = None
+        if self._ranking_store:
+            self._ranking_store.close()
+            self._ranking_store = None
 
     def add_to_ranking(self, name, score, time_total, fixed_robots):
-        """Adiciona um novo score ao ranking e salva"""
+        """Adiciona um novo score ao ranking (a gravação no disco é feita em segundo plano)"""
         entry = {
             'name': name,
             'score': score,
             'fixed_robots': fixed_robots,
             'time': round(time_total, 2)
         }
-        self.ranking.append(entry)
-        self.save_ranking()
+        if self.ranking_sync:
+            entry = self.ranking_sync.submit(entry)
+        self.ranking_writer.submit(entry)
+        self.ranking = self.load_ranking()
 
-    def draw_text(self, text, font, color, x, y, center=False, center_x=False, center_y=False):
-        surface = font.render(text, True, color)
+    def draw_text(self, text, font, color, x, y, center=False, center_x=False, center_y=False, background=None):
+        """
+        Desenha um texto (renderizado e convertido uma vez, depois reaproveitado).
+        `background` é a cor sólida sob o texto, quando conhecida: o texto fica
+        opaco com colorkey, o blit mais barato
+        """
+        if self.profiler.enabled:
+            start = time.perf_counter_ns()
+            surface = self.surfaces.text(font, text, color, background)
+            self.profiler.add("text_render", time.perf_counter_ns() - start)
+        else:
+            surface = self.surfaces.text(font, text, color, background)
         rect = surface.get_rect()
         
         if center:
@@ -211,7 +412,7 @@ class GUI:
         pygame.draw.rect(self.screen, color, (x, y, width, height), border_radius=8)
         
         self.draw_text(text, self.font_medium, COLORS['text_primary'], 
-                         x + width // 2, y + height // 2, center=True)
+                         x + width // 2, y + height // 2, center=True, background=color)
         
         return pygame.Rect(x, y, width, height)
     
@@ -229,7 +430,7 @@ class GUI:
             display_text = placeholder
             text_color = COLORS['text_dark']
             
-        text_surf = self.font_medium_regular.render(display_text, True, text_color)
+        text_surf = self.surfaces.text(self.font_medium_regular, display_text, text_color, bg_color)
         self.screen.blit(text_surf, (x + 10, y + height // 2 - text_surf.get_height() // 2))
         
         if active:
@@ -250,43 +451,63 @@ class GUI:
         pygame.draw.rect(self.screen, COLORS['panel_bg'], rect, border_radius=8)
         pygame.draw.rect(self.screen, COLORS['panel_border'], rect, 2, border_radius=8)
 
+    def _robot_icon_sprite(self, variant):
+        """Sprite do ícone do robô (variante 0-2 pelo modelo; None = nenhum robô selecionado)"""
+        def paint():
+            sprite = pygame.Surface(ROBOT_ICON_SIZE)
+            sprite.fill(COLORS['panel_bg'])
+            x, y = ROBOT_ICON_ORIGIN
+            if variant is None:
+                head_rect = pygame.Rect(x - 30, y, 60, 50)
+                pygame.draw.rect(sprite, COLORS['text_dark'], head_rect, border_radius=10)
+                pygame.draw.rect(sprite, COLORS['panel_border'], (x - 15, y + 15, 30, 20), border_radius=5)
+                return sprite
+
+            head_color = COLORS['text_secondary']
+            eye_color = COLORS['accent_cyan']
+
+            pygame.draw.line(sprite, head_color, (x, y - 20), (x, y - 10), 2)
+            pygame.draw.circle(sprite, eye_color, (x, y - 25), 5)
+
+            if variant == 0:
+                head_rect = pygame.Rect(x - 30, y, 60, 50)
+                pygame.draw.rect(sprite, head_color, head_rect, border_radius=10)
+            else:
+                head_rect = pygame.Rect(x - 35, y, 70, 50)
+                pygame.draw.ellipse(sprite, head_color, head_rect)
+
+            if variant == 1:
+                pygame.draw.rect(sprite, eye_color, (x - 20, y + 15, 40, 20), border_radius=5)
+            else:
+                pygame.draw.circle(sprite, eye_color, (x - 12, y + 20), 8)
+                pygame.draw.circle(sprite, eye_color, (x + 12, y + 20), 8)
+
+            pygame.draw.rect(sprite, COLORS['text_dark'], (x - 10, y + 50, 20, 10), border_radius=3)
+            return sprite
+
+        # O fundo do painel vira a colorkey (sprite opaco, sem alpha por pixel)
+        return self.surfaces.sprite(('robot_icon', variant), paint, COLORS['panel_bg'])
+
     def draw_robot_icon(self, x, y, robot):
+        variant = None if robot is None else hash(robot.model_name) % 3
+        origin_x, origin_y = ROBOT_ICON_ORIGIN
+        self.screen.blit(self._robot_icon_sprite(variant), (x - origin_x, y - origin_y))
         if robot is None:
-            head_color = COLORS['text_dark']
-            eye_color = COLORS['panel_border']
-            head_rect = pygame.Rect(x - 30, y, 60, 50)
-            pygame.draw.rect(self.screen, head_color, head_rect, border_radius=10)
-            pygame.draw.rect(self.screen, eye_color, (x - 15, y + 15, 30, 20), border_radius=5)
             self.draw_text("?", self.font_large, COLORS['panel_bg'], x, y + 25, center=True)
-            return
 
-        seed = hash(robot.model_name) % 3
-        head_color = COLORS['text_secondary']
-        eye_color = COLORS['accent_cyan']
-
-        pygame.draw.line(self.screen, head_color, (x, y - 20), (x, y - 10), 2)
-        pygame.draw.circle(self.screen, eye_color, (x, y - 25), 5)
-        
-        if seed == 0:
-            head_rect = pygame.Rect(x - 30, y, 60, 50)
-            pygame.draw.rect(self.screen, head_color, head_rect, border_radius=10)
-        else:
-            head_rect = pygame.Rect(x - 35, y, 70, 50)
-            pygame.draw.ellipse(self.screen, head_color, head_rect)
-            
-        if seed == 1:
-            pygame.draw.rect(self.screen, eye_color, (x - 20, y + 15, 40, 20), border_radius=5)
-        else:
-            pygame.draw.circle(self.screen, eye_color, (x - 12, y + 20), 8)
-            pygame.draw.circle(self.screen, eye_color, (x + 12, y + 20), 8)
-        
-        pygame.draw.rect(self.screen, COLORS['text_dark'], (x - 10, y + 50, 20, 10), border_radius=3)
-        
+    def _mission_text(self):
+        """Linha da missão no menu, conforme o limite de tempo da partida"""
+        time_limit = self.game.config.time_limit
+        if time_limit is None:
+            return "MISSAO: Conserte o máximo de robôs possível antes que a oficina lote (sem limite de tempo)."
+        minutes, seconds = divmod(int(time_limit), 60)
+        if not minutes:
+            return f"MISSAO: Conserte o máximo de robôs possível em **{seconds} segundos**."
+        unit = "minuto" if minutes < 2 else "minutos"
+        return f"MISSAO: Conserte o máximo de robôs possível em **{minutes}:{seconds:02d} {unit}**."
 
     def draw_menu_screen(self):
         """Desenha a tela inicial com a história e opções (Totalmente Responsivo)"""
-        self._calculate_ui_rects()
-        
         self.screen.fill(COLORS['background'])
         mouse_pos = pygame.mouse.get_pos()
         
@@ -303,7 +524,7 @@ class GUI:
             "No ano 2175, após uma falha massiva de energia na cidade",
             "futurista Neon Forge, centenas de robôs ficaram danificados.",
             "",
-            "MISSAO: Conserte o máximo de robôs possível em **1:30 minuto**.",
+            self._mission_text(),
             "Priorize os casos de emergência para maximizar seu score.",
             "",
             "INSTRUÇÕES:",
@@ -357,17 +578,18 @@ class GUI:
         # --- BOTÕES (Usando os retângulos responsivos calculados) ---
         start_rect = self.ui_rects['menu_start']
         hover_start = start_rect.collidepoint(mouse_pos)
-        self.draw_button("INICIAR JOGO", start_rect.x, start_rect.y, 
-                         start_rect.width, start_rect.height, hover=hover_start)
+        self.hit_index.add('menu_start',
+                           self.draw_button("INICIAR JOGO", start_rect.x, start_rect.y, 
+                                            start_rect.width, start_rect.height, hover=hover_start))
 
         ranking_rect = self.ui_rects['menu_ranking']
         hover_ranking = ranking_rect.collidepoint(mouse_pos)
-        self.draw_button("RANKING", ranking_rect.x, ranking_rect.y, 
-                         ranking_rect.width, ranking_rect.height, hover=hover_ranking)
+        self.hit_index.add('menu_ranking',
+                           self.draw_button("RANKING", ranking_rect.x, ranking_rect.y, 
+                                            ranking_rect.width, ranking_rect.height, hover=hover_ranking))
     
     def draw_ranking_screen(self):
         """Desenha a tela de Ranking (Totalmente Responsivo)"""
-        self._calculate_ui_rects()
         self.screen.fill(COLORS['background'])
         mouse_pos = pygame.mouse.get_pos()
         
@@ -403,7 +625,8 @@ class GUI:
             self.draw_text("Ranking vazio. Seja o primeiro!", self.font_medium_regular, COLORS['text_dark'],
                              ranking_panel.centerx, ranking_panel.centery, center=True)
         
-        for i, entry in enumerate(self.ranking):
+        first_position = self.ranking_page * MAX_RANKING_ENTRIES + 1
+        for i, entry in enumerate(self.ranking, start=first_position):
             
             total_time = entry['time']
             minutes = int(total_time // 60)
@@ -412,7 +635,7 @@ class GUI:
 
             color = COLORS['text_primary']
             
-            self.draw_text(str(i + 1), self.font_small, color, ranking_panel.x + 30, y_offset)
+            self.draw_text(str(i), self.font_small, color, ranking_panel.x + 30, y_offset)
             self.draw_text(entry['name'], self.font_small, color, x_name, y_offset)
             self.draw_text(str(entry['fixed_robots']), self.font_small, COLORS['success'], x_robots, y_offset)
             self.draw_text(time_str, self.font_small, COLORS['accent_cyan'], x_time, y_offset)
@@ -420,80 +643,120 @@ class GUI:
             
             y_offset += 40
 
+        if self.ranking_total > MAX_RANKING_ENTRIES:
+            last_page = (self.ranking_total - 1) // MAX_RANKING_ENTRIES
+            self.draw_text(f"Página {self.ranking_page + 1}/{last_page + 1} (PageUp/PageDown)",
+                           self.font_tiny, COLORS['text_secondary'],
+                           ranking_panel.centerx, ranking_panel.bottom - 25, center=True)
+
         # Botão VOLTAR AO MENU (Responsivo: 100px da borda inferior)
-        menu_button_rect = pygame.Rect(self.width // 2 - 150, self.height - 100, 300, 60)
+        menu_button_rect = self.ui_rects['back_to_menu']
         hover_menu = menu_button_rect.collidepoint(mouse_pos)
-        self.draw_button("VOLTAR AO MENU", menu_button_rect.x, menu_button_rect.y,
-                         menu_button_rect.width, menu_button_rect.height, hover=hover_menu)
-        
+        self.hit_index.add('back_to_menu',
+                           self.draw_button("VOLTAR AO MENU", menu_button_rect.x, menu_button_rect.y,
+                                            menu_button_rect.width, menu_button_rect.height, hover=hover_menu))
+        
+    def _draw_queue_scrollbar(self, panel_left):
+        """Desenha a barra de rolagem da fila na margem direita do painel"""
+        rows_area = self.ui_rects['play_queue_rows']
+        track = pygame.Rect(panel_left.right - 8, rows_area.y, 4, rows_area.height)
+        pygame.draw.rect(self.screen, COLORS['panel_border'], track, border_radius=2)
+        
+        total = self.queue_list.total
+        thumb_h = max(10, track.height * self.queue_list.visible_rows // total)
+        thumb_y = track.y + (track.height - thumb_h) * self.queue_list.first // max(1, self.queue_list.max_first())
+        pygame.draw.rect(self.screen, COLORS['accent_cyan'], (track.x, thumb_y, track.width, thumb_h), border_radius=2)
+
     def draw_playing_screen(self):
         """Desenha a tela principal do jogo (Totalmente Responsivo)"""
-        self._calculate_ui_rects()
         self.screen.fill(COLORS['background'])
         mouse_pos = pygame.mouse.get_pos()
         
-        panel_left = self.ui_rects['play_panel_left']
-        panel_center = self.ui_rects['play_panel_center']
-        panel_right = self.ui_rects['play_panel_right']
+        with self.profiler.section("queue_panel"):
+            self._draw_queue_panel(mouse_pos)
         
-        # === Painel Esquerdo - Fila de Reparo ===
+        selected_robot = self.view.get_selected_robot()
+        with self.profiler.section("diagnosis_panel"):
+            self._draw_diagnosis_panel(selected_robot)
+        with self.profiler.section("control_panel"):
+            self._draw_control_panel(selected_robot, mouse_pos)
+        with self.profiler.section("message_panel"):
+            self._draw_message_panel()
+
+    def _draw_queue_panel(self, mouse_pos):
+        """=== Painel Esquerdo - Fila de Reparo ==="""
+        panel_left = self.ui_rects['play_panel_left']
         self.draw_panel(panel_left)
         
         self.draw_text("FILA DE REPARO", self.font_medium, COLORS['accent_cyan'],
-                      panel_left.x + 10, panel_left.y + 15)
-        
-        robots = self.game.robots.get_all()
-        y_offset = 60
-        
-        for robot in robots:
-            robot_rect = pygame.Rect(panel_left.x + 10, panel_left.y + y_offset, 
-                                     panel_left.width - 20, 60)
-            
-            if robot_rect.bottom > panel_left.bottom - 10:
-                self.draw_text("...", self.font_medium, COLORS['text_dark'],
-                              panel_left.centerx, panel_left.bottom - 25, center=True)
-                break 
+                      panel_left.x + 10, panel_left.y + 15, background=COLORS['panel_bg'])
+        
+        # Apenas a janela visível é buscada na lista encadeada
+        self.queue_list.set_viewport(self.queue_visible_rows, len(self.view.robots))
+        first_row, row_count = self.queue_list.window()
+        if self.simulation:
+            # Pede à simulação uma janela com uma página de folga para cada lado
+            margin = self.queue_visible_rows
+            self.simulation.queue_window = (max(0, first_row - margin), row_count + 2 * margin)
+        drawn_robot_ids = []
+        
+        if self.queue_list.total > self.queue_visible_rows:
+            self.draw_text(f"{first_row + 1}-{first_row + row_count}/{self.queue_list.total}",
+                           self.font_tiny, COLORS['text_secondary'],
+                           panel_left.right - 100, panel_left.y + 22, background=COLORS['panel_bg'])
+            self._draw_queue_scrollbar(panel_left)
+        
+        for index, robot in enumerate(self.view.robots.iter_range(first_row, row_count)):
+            robot_rect = self._queue_row_rect(index)
+            drawn_robot_ids.append(robot.id)
             
             # --- Lógica de Destaque ---
             bg_color = None
-            if robot.id == self.game.selected_robot_id:
+            if robot.id == self.view.selected_robot_id:
                 bg_color = COLORS['accent_cyan']
             elif robot_rect.collidepoint(mouse_pos):
                 bg_color = COLORS['panel_border']
             
             if bg_color:
                 pygame.draw.rect(self.screen, bg_color, robot_rect, border_radius=5)
-            
+            row_bg = bg_color or COLORS['panel_bg']
+
             priority_color = COLORS.get(f"priority_{robot.priority.replace(' ', '_')}", COLORS['text_secondary'])
             
-            text_color = COLORS['panel_bg'] if robot.id == self.game.selected_robot_id else COLORS['text_primary']
+            text_color = COLORS['panel_bg'] if robot.id == self.view.selected_robot_id else COLORS['text_primary']
             self.draw_text(f"#{robot.id} - {robot.model_name}", 
                             self.font_small_bold, text_color,
-                            robot_rect.x + 10, robot_rect.y + 10)
+                            robot_rect.x + 10, robot_rect.y + 10, background=row_bg)
             self.draw_text(f"Prioridade: {robot.priority.upper()}", 
                             self.font_tiny, priority_color,
-                            robot_rect.x + 10, robot_rect.y + 35)
+                            robot_rect.x + 10, robot_rect.y + 35, background=row_bg)
             self.draw_text(f"{len(robot.components)} peças", 
                             self.font_tiny, text_color,
-                            robot_rect.right - 80, robot_rect.y + 35)
-            
-            y_offset += 65
+                            robot_rect.right - 80, robot_rect.y + 35, background=row_bg)
 
-        # === Painel Central - Diagnóstico ===
+        # Registra as linhas desenhadas para o clique (busca O(1) pela coordenada Y)
+        rows_area = self.ui_rects['play_queue_rows']
+        self.hit_index.add_rows('queue_robot', rows_area.x, rows_area.y, rows_area.width,
+                                QUEUE_ROW_HEIGHT, QUEUE_ROW_PITCH, drawn_robot_ids, first_index=first_row)
+
+    def _draw_diagnosis_panel(self, selected_robot):
+        """=== Painel Central - Diagnóstico ==="""
+        panel_center = self.ui_rects['play_panel_center']
         self.draw_panel(panel_center)
         
         self.draw_text("DIAGNÓSTICO", self.font_medium, COLORS['accent_cyan'],
-                      panel_center.x + 10, panel_center.y + 15)
-        
-        selected_robot = self.game.get_selected_robot()
+                      panel_center.x + 10, panel_center.y + 15, background=COLORS['panel_bg'])
         
         # Ícone do Robô Centralizado
         self.draw_robot_icon(panel_center.centerx, panel_center.y + 80, selected_robot)
         
         if selected_robot:
-            components = selected_robot.components.get_all()
+            y_offset = panel_center.y + 160
+            # Só as linhas que cabem no painel (+1 para saber se há mais e mostrar
+            # "..."): os componentes preguiçosos abaixo delas não são criados
+            rows = max(0, (panel_center.bottom - 10 - 50 - y_offset) // 55 + 1)
+            components = selected_robot.components.get_all(rows + 1)
             if components:
-                y_offset = panel_center.y + 160
                 
                 for i, component in enumerate(components):
                     comp_rect = pygame.Rect(panel_center.x + 10, y_offset,
@@ -501,13 +764,14 @@ class GUI:
                     
                     if comp_rect.bottom > panel_center.bottom - 10:
                         self.draw_text("...", self.font_medium, COLORS['text_dark'],
-                                      panel_center.centerx, panel_center.bottom - 25, center=True)
+                                      panel_center.centerx, panel_center.bottom - 25, center=True,
+                                      background=COLORS['panel_bg'])
                         break
                     
                     if i == 0:
                         pygame.draw.rect(self.screen, COLORS['accent_cyan'], comp_rect, 2, border_radius=5)
                         self.draw_text("→ TOPO", self.font_tiny, COLORS['accent_cyan'],
-                                      comp_rect.x + 5, comp_rect.y + 5)
+                                      comp_rect.x + 5, comp_rect.y + 5, background=COLORS['panel_bg'])
                         text_color = COLORS['text_primary']
                         # Código alfanumérico visível
                         code_text = f"Código: {component.replacement_code}"
@@ -519,43 +783,53 @@ class GUI:
                         code_color = COLORS['text_dark']
                     
                     self.draw_text(component.name, self.font_small, text_color,
-                                     comp_rect.x + 10, comp_rect.y + 25, center_y=True)
+                                     comp_rect.x + 10, comp_rect.y + 25, center_y=True, background=COLORS['panel_bg'])
                     self.draw_text(code_text, 
                                      self.font_tiny, code_color,
-                                     comp_rect.right - 140, comp_rect.y + 25, center_y=True)
+                                     comp_rect.right - 140, comp_rect.y + 25, center_y=True, background=COLORS['panel_bg'])
                     y_offset += 55
             else:
                 self.draw_text("Robô Consertado!", self.font_medium_regular, COLORS['success'],
-                              panel_center.centerx, panel_center.centery + 50, center=True)
+                              panel_center.centerx, panel_center.centery + 50, center=True, background=COLORS['panel_bg'])
         else:
             self.draw_text("Selecione um Robô na Fila", self.font_medium_regular, COLORS['text_secondary'],
-                          panel_center.centerx, panel_center.centery + 50, center=True)
-        
-        # === Painel Direito - Estatísticas e Controle ===
+                          panel_center.centerx, panel_center.centery + 50, center=True, background=COLORS['panel_bg'])
+
+    def _draw_control_panel(self, selected_robot, mouse_pos):
+        """=== Painel Direito - Estatísticas e Controle ==="""
+        panel_right = self.ui_rects['play_panel_right']
         self.draw_panel(panel_right)
         
         # --- SEÇÃO: CRONÔMETRO ---
-        time_left = self.game.get_time_left()
-        
-        # Lógica de formatação de tempo (assumimos que o cálculo em game.py está correto)
-        if time_left >= 0:
-            minutes = int(time_left // 60)
-            seconds = int(time_left % 60)
-            time_str = f"{minutes:02d}:{seconds:02d}"
+        time_left = self.view.get_time_left()
+        
+        if time_left is None:
+            # Modo sem fim: mostra o tempo decorrido
+            elapsed = self.view.get_elapsed_time()
+            time_label = "TEMPO DE JOGO"
+            time_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
+            time_color = COLORS['accent_cyan']
         else:
-            time_str = "00:00"
+            # Lógica de formatação de tempo (assumimos que o cálculo em game.py está correto)
+            time_label = "TEMPO RESTANTE"
+            if time_left >= 0:
+                minutes = int(time_left // 60)
+                seconds = int(time_left % 60)
+                time_str = f"{minutes:02d}:{seconds:02d}"
+            else:
+                time_str = "00:00"
 
-        time_color = COLORS['error'] if time_left < 10 else COLORS['warning'] if time_left < 30 else COLORS['accent_cyan']
+            time_color = COLORS['error'] if time_left < 10 else COLORS['warning'] if time_left < 30 else COLORS['accent_cyan']
 
-        self.draw_text("TEMPO RESTANTE", self.font_medium_regular, COLORS['text_secondary'],
-                      panel_right.centerx, panel_right.y + 20, center_x=True)
+        self.draw_text(time_label, self.font_medium_regular, COLORS['text_secondary'],
+                      panel_right.centerx, panel_right.y + 20, center_x=True, background=COLORS['panel_bg'])
         self.draw_text(time_str, self.font_large, time_color,
-                      panel_right.centerx, panel_right.y + 60, center=True)
+                      panel_right.centerx, panel_right.y + 60, center=True, background=COLORS['panel_bg'])
 
         # --- SEÇÃO: COMPONENTE ALVO ---
         target_y = panel_right.y + 100
         self.draw_text("COMPONENTE ALVO", self.font_medium_regular, COLORS['accent_cyan'],
-                      panel_right.x + 10, target_y)
+                      panel_right.x + 10, target_y, background=COLORS['panel_bg'])
         
         target_box = pygame.Rect(panel_right.x + 10, target_y + 30, panel_right.width - 20, 70)
         pygame.draw.rect(self.screen, COLORS['background'], target_box, border_radius=5)
@@ -563,48 +837,52 @@ class GUI:
         top_component = selected_robot.get_top_component() if selected_robot else None
         if top_component:
             self.draw_text(top_component.replacement_code, self.font_large, COLORS['accent_yellow'],
-                          target_box.centerx, target_box.centery, center=True)
+                          target_box.centerx, target_box.centery, center=True, background=COLORS['background'])
         else:
             self.draw_text("Nenhum Alvo", self.font_medium_regular, COLORS['text_dark'],
-                          target_box.centerx, target_box.centery, center=True)
+                          target_box.centerx, target_box.centery, center=True, background=COLORS['background'])
 
         # --- Estatísticas ---
         stats_y = target_y + 110
         self.draw_text("ESTATÍSTICAS", self.font_small_bold, COLORS['text_secondary'],
-                      panel_right.x + 10, stats_y)
+                      panel_right.x + 10, stats_y, background=COLORS['panel_bg'])
         stats_y += 30
         
-        self.draw_text(f"Robôs Consertados: {self.game.robots_fixed}", 
+        self.draw_text(f"Robôs Consertados: {self.view.robots_fixed}", 
                       self.font_small, COLORS['success'],
-                      panel_right.x + 10, stats_y)
+                      panel_right.x + 10, stats_y, background=COLORS['panel_bg'])
         stats_y += 25
-        self.draw_text(f"Componentes: {self.game.components_replaced}", 
+        self.draw_text(f"Componentes: {self.view.components_replaced}", 
                       self.font_small, COLORS['accent_cyan'],
-                      panel_right.x + 10, stats_y)
+                      panel_right.x + 10, stats_y, background=COLORS['panel_bg'])
         stats_y += 25
-        capacity_color = COLORS['error'] if len(self.game.robots) >= self.game.max_robots - 1 else COLORS['warning']
-        self.draw_text(f"Oficina: {len(self.game.robots)}/{self.game.max_robots}", 
+        capacity_color = COLORS['error'] if len(self.view.robots) >= self.view.max_robots - 1 else COLORS['warning']
+        self.draw_text(f"Oficina: {len(self.view.robots)}/{self.view.max_robots}", 
                       self.font_small, capacity_color,
-                      panel_right.x + 10, stats_y)
+                      panel_right.x + 10, stats_y, background=COLORS['panel_bg'])
         
         # --- Input e Botão ---
         input_title_y = stats_y + 40
         self.draw_text("CÓDIGO DE SUBSTITUIÇÃO:", self.font_small_bold, COLORS['text_secondary'],
-                      panel_right.x + 10, input_title_y)
+                      panel_right.x + 10, input_title_y, background=COLORS['panel_bg'])
         
         input_rect = self.ui_rects['play_input_code']
         # Placeholder atualizado para refletir o código alfanumérico
-        self.draw_input_box(self.input_code, input_rect.x, input_rect.y, 
-                            input_rect.width, input_rect.height, 
-                            active=self.input_active, placeholder="Digite o código (4 alfanuméricos)")
+        self.hit_index.add('play_input_code',
+                           self.draw_input_box(self.input_code, input_rect.x, input_rect.y, 
+                                               input_rect.width, input_rect.height, 
+                                               active=self.input_active, placeholder="Digite o código (4 alfanuméricos)"))
         
         button_rect = self.ui_rects['play_submit_code']
-        self.draw_button("SUBSTITUIR", 
-                         button_rect.x, button_rect.y,
-                         button_rect.width, button_rect.height,
-                         hover=button_rect.collidepoint(mouse_pos))
-        
-        # --- Mensagem do Jogo (Abaixo dos painéis) ---
+        self.hit_index.add('play_submit_code',
+                           self.draw_button("SUBSTITUIR", 
+                                            button_rect.x, button_rect.y,
+                                            button_rect.width, button_rect.height,
+                                            hover=button_rect.collidepoint(mouse_pos)))
+
+    def _draw_message_panel(self):
+        """--- Mensagem do Jogo (Abaixo dos painéis) ---"""
+        panel_left = self.ui_rects['play_panel_left']
         message_y_center = panel_left.bottom + (self.height - panel_left.bottom) // 2
         
         # Define o retângulo da mensagem: altura fixa de 60px
@@ -619,24 +897,23 @@ class GUI:
         # Desenha o Painel de fundo da mensagem
         self.draw_panel(message_rect)
         
-        if self.game.message:
+        if self.view.message:
             msg_color = COLORS['accent_cyan']
-            if "incorreto" in self.game.message.lower() or "erro" in self.game.message.lower() or "ESGOTADO" in self.game.message:
+            if "incorreto" in self.view.message.lower() or "erro" in self.view.message.lower() or "ESGOTADO" in self.view.message:
                 msg_color = COLORS['error']
-            elif "sucesso" in self.game.message.lower() or "finalizado" in self.game.message.lower():
+            elif "sucesso" in self.view.message.lower() or "finalizado" in self.view.message.lower():
                 msg_color = COLORS['success']
                 
             # Desenha o texto da mensagem no CENTRO do retângulo do painel
-            self.draw_text(self.game.message, self.font_medium_regular, msg_color,
-                          message_rect.centerx, message_rect.centery, center=True)
+            self.draw_text(self.view.message, self.font_medium_regular, msg_color,
+                          message_rect.centerx, message_rect.centery, center=True, background=COLORS['panel_bg'])
     
     def draw_game_over_screen(self):
         """Desenha a tela final com estatísticas e salvamento de ranking (Totalmente Responsivo)"""
-        self._calculate_ui_rects()
         self.screen.fill(COLORS['background'])
         mouse_pos = pygame.mouse.get_pos()
         
-        if self.game.game_won:
+        if self.view.game_won:
             title = "PARABÉNS! MISSÃO CUMPRIDA!"
             title_color = COLORS['success']
         else:
@@ -647,7 +924,7 @@ class GUI:
                       self.width // 2, self.height * 0.1, center=True)
         
         # Estatísticas
-        total_time_played = self.game.get_total_time_played()
+        total_time_played = self.view.get_total_time_played()
         minutes = int(total_time_played // 60)
         seconds = int(total_time_played % 60)
         
@@ -657,21 +934,25 @@ class GUI:
                                   stats_panel_width, stats_panel_height)
         self.draw_panel(stats_panel)
         
-        score = self.game.final_score
+        score = self.view.final_score
         stats_text = [
-            (f"Robôs Consertados:", f"{self.game.robots_fixed}", COLORS['success']),
-            (f"Componentes:", f"{self.game.components_replaced}", COLORS['accent_cyan']),
+            (f"Robôs Consertados:", f"{self.view.robots_fixed}", COLORS['success']),
+            (f"Componentes:", f"{self.view.components_replaced}", COLORS['accent_cyan']),
             (f"Tempo Jog.:", f"{minutes:02d}:{seconds:02d}", COLORS['text_primary']),
             (f"Score Final:", f"{score}", COLORS['accent_yellow'])
         ]
+        if self.session_better_than is not None:
+            stats_text.append(("Melhor que:", f"{self.session_better_than:.0%} das partidas", COLORS['success']))
         
         y_offset = stats_panel.y + 40
+        # As linhas se aproximam se não couberem no painel
+        row_step = min(50, (stats_panel_height - 60) // len(stats_text))
         for label, value, color in stats_text:
             self.draw_text(label, self.font_medium_regular, COLORS['text_secondary'],
                           stats_panel.x + 30, y_offset)
             val_x = stats_panel.right - 30 - self.font_medium_regular.size(value)[0]
             self.draw_text(value, self.font_medium_regular, color, val_x, y_offset)
-            y_offset += 50
+            y_offset += row_step
         
         # --- RANKING INPUT ---
         input_start_y = self.height * 0.55
@@ -679,36 +960,39 @@ class GUI:
                       self.width // 2, input_start_y, center_x=True)
         
         name_input_rect = self.ui_rects['over_input_name']
-        self.draw_input_box(self.input_name, name_input_rect.x, name_input_rect.y,
-                            name_input_rect.width, name_input_rect.height,
-                            active=self.input_name_active)
+        self.hit_index.add('over_input_name',
+                           self.draw_input_box(self.input_name, name_input_rect.x, name_input_rect.y,
+                                               name_input_rect.width, name_input_rect.height,
+                                               active=self.input_name_active))
         
         save_button_rect = self.ui_rects['over_save_rank']
-        menu_button_rect = pygame.Rect(self.width // 2 - 150, self.height - 100, 300, 60) # Responsivo: 100px da borda inferior
+        menu_button_rect = self.ui_rects['back_to_menu'] # Responsivo: 100px da borda inferior
 
         if not self.ranking_saved:
             hover_save = save_button_rect.collidepoint(mouse_pos)
-            self.draw_button("SALVAR RANKING", save_button_rect.x, save_button_rect.y,
-                             save_button_rect.width, save_button_rect.height, hover=hover_save)
+            self.hit_index.add('over_save_rank',
+                               self.draw_button("SALVAR RANKING", save_button_rect.x, save_button_rect.y,
+                                                save_button_rect.width, save_button_rect.height, hover=hover_save))
         else:
             self.draw_text("RANKING SALVO!", self.font_medium, COLORS['success'],
                            save_button_rect.centerx, save_button_rect.centery, center=True)
         
         # Botão VOLTAR AO MENU
         hover_menu = menu_button_rect.collidepoint(mouse_pos)
-        self.draw_button("VOLTAR AO MENU", menu_button_rect.x, menu_button_rect.y,
-                         menu_button_rect.width, menu_button_rect.height, 
-                         hover=hover_menu)
+        self.hit_index.add('back_to_menu',
+                           self.draw_button("VOLTAR AO MENU", menu_button_rect.x, menu_button_rect.y,
+                                            menu_button_rect.width, menu_button_rect.height, 
+                                            hover=hover_menu))
     
     def _submit_code(self):
         """Lógica centralizada de submissão de código"""
-        if self.input_code and len(self.input_code) == 4:
-            # A validação agora aceita códigos alfanuméricos
-            self.game.validate_code(self.input_code)
+        if self.input_code and len(self.input_code) == CODE_LENGTH:
+            # O texto digitado é convertido uma única vez para o código empacotado
+            self._game_command("validate_code", encode_code(self.input_code))
             self.input_code = ""
             self.input_active = False
-            if self.game.game_over:
-                self.state = "game_over"
+            if self.view.game_over:
+                self._enter_game_over()
         
     def handle_events(self):
         """Processa eventos do pygame, incluindo redimensionamento"""
@@ -717,90 +1001,105 @@ class GUI:
                 return False
             
             # --- Lida com redimensionamento da janela ---
+            # (apenas registra o último tamanho; aplicado em _apply_pending_resize)
             if event.type == pygame.VIDEORESIZE:
-                self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-                self._calculate_ui_rects() # Recalcula todos os retângulos
-                self.width, self.height = event.w, event.h
+                self.pending_resize = (event.w, event.h)
+                self.pending_resize_ticks = pygame.time.get_ticks()
+            
+            # --- Rolagem da fila de reparo (roda do mouse sobre o painel esquerdo) ---
+            if event.type == pygame.MOUSEWHEEL and self.state == "playing":
+                if self.ui_rects['play_panel_left'].collidepoint(pygame.mouse.get_pos()):
+                    self.queue_list.scroll(-event.y)
             
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+            # Os botões 4 e 5 são a roda do mouse (já tratada em MOUSEWHEEL)
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
+                mouse_pos = event.pos
+                # Consulta as regiões desenhadas no último frame (apenas se for da tela atual)
+                if self.hit_index.state == self.state:
+                    clicked, payload = self.hit_index.hit(mouse_pos)
+                else:
+                    clicked, payload = None, None
                 
                 if self.state == "menu":
-                    if self.ui_rects['menu_start'].collidepoint(mouse_pos):
-                        self.game.start_game()
+                    if clicked == 'menu_start':
+                        self._game_command("start_game")
+                        self.queue_list.scroll_to(0)
                         self.state = "playing"
                         self.input_code = ""
                         self.input_active = False
-                    elif self.ui_rects['menu_ranking'].collidepoint(mouse_pos):
+                    elif clicked == 'menu_ranking':
                         self.ranking = self.load_ranking()
                         self.state = "ranking"
 
                 elif self.state == "ranking":
-                    # Recria o retângulo do botão de menu com base no tamanho atual
-                    menu_button_rect = pygame.Rect(self.width // 2 - 150, self.height - 100, 300, 60)
-                    if menu_button_rect.collidepoint(mouse_pos):
+                    if clicked == 'back_to_menu':
                          self.state = "menu"
                 
                 elif self.state == "playing":
-                    panel_left = self.ui_rects['play_panel_left']
-                    if panel_left.collidepoint(mouse_pos):
-                        robots = self.game.robots.get_all()
-                        y_offset = 60
-                        for robot in robots:
-                            robot_rect = pygame.Rect(panel_left.x + 10, panel_left.y + y_offset,
-                                                     panel_left.width - 20, 60)
-                            if robot_rect.bottom > panel_left.bottom - 10:
-                                break
-                            if robot_rect.collidepoint(mouse_pos):
-                                self.game.select_robot(robot.id)
-                                break
-                            y_offset += 65
+                    if clicked == 'queue_robot':
+                        self._game_command("select_robot", payload)
                     
-                    input_rect = self.ui_rects['play_input_code']
-                    button_rect = self.ui_rects['play_submit_code']
-                    
-                    if input_rect.collidepoint(mouse_pos):
+                    if clicked == 'play_input_code':
                         self.input_active = True
                         self.input_name_active = False
-                    elif button_rect.collidepoint(mouse_pos):
+                    elif clicked == 'play_submit_code':
                         self._submit_code()
                     else:
                          self.input_active = False
                 
                 elif self.state == "game_over":
-                    # Recalcula os retângulos para clique na tela de game over
-                    self._calculate_ui_rects()
-                    name_input_rect = self.ui_rects['over_input_name']
-                    save_button_rect = self.ui_rects['over_save_rank']
-                    menu_button_rect = pygame.Rect(self.width // 2 - 150, self.height - 100, 300, 60)
-                    
-                    if name_input_rect.collidepoint(mouse_pos):
+                    if clicked == 'over_input_name':
                         self.input_name_active = True
                         self.input_active = False
                     else:
                         self.input_name_active = False
                         
-                    if save_button_rect.collidepoint(mouse_pos) and not self.ranking_saved:
+                    if clicked == 'over_save_rank' and not self.ranking_saved:
                         if self.input_name.strip():
-                            self.add_to_ranking(self.input_name.strip(), self.game.final_score, 
-                                                self.game.get_total_time_played(), self.game.robots_fixed)
+                            self.add_to_ranking(self.input_name.strip(), self.view.final_score, 
+                                                self.view.get_total_time_played(), self.view.robots_fixed)
                             self.ranking_saved = True
                             # Redirecionamento imediato para o ranking
                             self.state = "ranking" 
                         
-                    if menu_button_rect.collidepoint(mouse_pos):
+                    if clicked == 'back_to_menu':
                         self.state = "menu"
-                        self.game = Game()
+                        if self.simulation:
+                            self.simulation.post("reset")
+                        else:
+                            self.game = Game(self.game_clock, self.game_pools, self.game_config)
+                            self.game.selected_robot_id = None
+                            self.view = self.game
                         self.input_code = ""
                         self.input_name = "Novo Técnico"
                         self.input_active = False
                         self.input_name_active = False
                         self.ranking_saved = False
-                        self.game.selected_robot_id = None
                         self.ranking = self.load_ranking() 
 
             if event.type == pygame.KEYDOWN:
-                if self.state == "playing" and self.input_active:
+                # Atalhos do profiler (valem em qualquer tela)
+                if event.key == PROFILER_TOGGLE_KEY:
+                    self.profiler.toggle()
+                elif event.key == PROFILER_TRACE_KEY:
+                    self.dump_profiler_trace()
+                
+                # Paginação do ranking
+                if self.state == "ranking" and event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    self.change_ranking_page(1 if event.key == pygame.K_PAGEDOWN else -1)
+                
+                # Paginação da fila de reparo pelo teclado
+                if self.state == "playing" and event.key in QUEUE_PAGING_KEYS:
+                    if event.key == pygame.K_PAGEUP:
+                        self.queue_list.page(-1)
+                    elif event.key == pygame.K_PAGEDOWN:
+                        self.queue_list.page(1)
+                    elif event.key == pygame.K_HOME:
+                        self.queue_list.scroll_to(0)
+                    else:
+                        self.queue_list.scroll_to(self.queue_list.max_first())
+                
+                elif self.state == "playing" and self.input_active:
                     if event.key == pygame.K_RETURN:
                         self._submit_code()
                     elif event.key == pygame.K_BACKSPACE:
@@ -808,7 +1107,7 @@ class GUI:
                     else:
                         # --- CORREÇÃO AQUI: Aceita Alfanumérico e converte para MAIÚSCULA ---
                         char = event.unicode.upper()
-                        if char.isalnum() and len(self.input_code) < 4:
+                        if char.isalnum() and len(self.input_code) < CODE_LENGTH:
                             self.input_code += char
                             
                 elif self.state == "game_over" and self.input_name_active:
@@ -823,35 +1122,111 @@ class GUI:
         
         return True
     
+    def _merge_remote_ranking(self):
+        """Grava no ranking local as entradas recebidas de outros quiosques (sem esperar a rede)"""
+        remote = self.ranking_sync.take_remote()
+        if not remote:
+            return
+        for entry in remote:
+            self.ranking_writer.submit(entry)
+        if self.state == "ranking":
+            self.ranking = self.load_ranking(self.ranking_page)
+
     def update(self):
         """Atualiza o estado do jogo"""
+        if self.simulation:
+            # Um erro na thread da simulação aparece aqui, em vez de congelar a tela
+            self.simulation.check()
+        if self.ranking_sync:
+            self._merge_remote_ranking()
         if self.state == "playing":
-            current_time = time.time()
-            self.game.update(current_time)
+            # No modo com thread, a simulação se atualiza sozinha
+            if not self.simulation:
+                current_time = self.game_clock()
+                self.game.update(current_time)
+            elif not self.simulation.is_current(self.view):
+                # Snapshot anterior aos últimos comandos (ex.: ao iniciar uma nova partida)
+                return
             
-            if self.game.game_over:
-                self.state = "game_over"
+            if self.view.game_over:
+                self._enter_game_over()
         
     def draw(self):
         """Desenha a tela atual"""
-        if self.state == "menu":
-            self.draw_menu_screen()
-        elif self.state == "ranking":
-            self.draw_ranking_screen()
-        elif self.state == "playing":
-            self.draw_playing_screen()
-        elif self.state == "game_over":
-            self.draw_game_over_screen()
-        
-        pygame.display.flip()
+        self._apply_pending_resize()
+        if self.simulation:
+            self.view = self.simulation.latest()
+        self.hit_index.begin_frame(self.state)
+        with self.profiler.section("draw"):
+            if self.state == "menu":
+                self.draw_menu_screen()
+            elif self.state == "ranking":
+                self.draw_ranking_screen()
+            elif self.state == "playing":
+                self.draw_playing_screen()
+            elif self.state == "game_over":
+                self.draw_game_over_screen()
+        
+        if self.profiler.enabled:
+            self.draw_profiler_overlay()
+        
+        with self.profiler.section("flip"):
+            pygame.display.flip()
+
+    def draw_profiler_overlay(self):
+        """Desenha o HUD de desempenho (FPS, piores frames, seções e caches)"""
+        lines = [(f"FPS: {self.profiler.fps():.1f}", COLORS['accent_cyan'])]
+        worst = self.profiler.worst_frames()
+        if worst:
+            lines.append(("Piores: " + " / ".join(f"{ms:.1f}" for ms in worst) + " ms", COLORS['warning']))
+        lines.append(("seção        média   p99   máx", COLORS['text_secondary']))
+        for name, (mean, p99, worst_ms) in sorted(self.profiler.section_stats().items()):
+            lines.append((f"{name[:12]:<12} {mean:5.2f} {p99:5.2f} {worst_ms:5.2f}", COLORS['text_primary']))
+        for name, rate in self.profiler.cache_hit_rates().items():
+            lines.append((f"cache {name}: {rate:.0%}", COLORS['success']))
+        
+        line_height = 18
+        overlay = pygame.Surface((300, len(lines) * line_height + 16), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        for i, (text, color) in enumerate(lines):
+            overlay.blit(self.font_tiny.render(text, True, color), (8, 8 + i * line_height))
+        self.screen.blit(overlay, (self.width - overlay.get_width() - 10, 10))
+
+    def dump_profiler_trace(self):
+        """Exporta o trace do profiler (abrir em chrome://tracing ou ui.perfetto.dev)"""
+        path = f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        count = self.profiler.dump_trace(path)
+        print(f"Trace com {count} eventos salvo em {path}")
+        return path
     
     def run(self):
         """Loop principal do jogo"""
         running = True
-        while running:
-            running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+        try:
+            while running:
+                frame_start = time.perf_counter_ns()
+                self.profiler.begin_frame()
+                with self.profiler.section("events"):
+                    running = self.handle_events()
+                with self.profiler.section("update"):
+                    self.update()
+                self.draw()
+                if not self.startup.done:
+                    self.startup.finish("first_frame")
+                work_end = time.perf_counter_ns()
+                with self.profiler.section("tick"):
+                    self.clock.tick(60)
+                self.profiler.end_frame()
+                if self.metrics:
+                    self.metrics.record(self._live_game(), self.state, (work_end - frame_start) / 1e6,
+                                        (time.perf_counter_ns() - frame_start) / 1e6)
+        finally:
+            if self.simulation:
+                self.simulation.stop()
+            if self.metrics:
+                self.metrics.close()
+            # Garante que nenhum score fique só na fila de gravação
+            self.flush_ranking()
+            self.session_stats.close()
         
         pygame.quit()
\ No newline at end of file
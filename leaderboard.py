@@ -0,0 +1,242 @@
+"""
+Módulo do leaderboard em SQLite (backend opcional do ranking)
+Guarda todos os scores de todas as partidas, com índices por score e por data,
+consultas de posição ("qual a posição deste score?") e leitura paginada do topo
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LEADERBOARD_FILE = "leaderboard.db"
+BATCH_SIZE = 1000
+# Faixa de scores da árvore de contagens: [-2^31, 2^31) (fora dela, o score é
+# contado no extremo mais próximo)
+SCORE_TREE_BITS = 32
+SCORE_TREE_OFFSET = 1 << (SCORE_TREE_BITS - 1)
+
+
+def _tree_key_sql(column):
+    return f"MAX(0, MIN({column} + {SCORE_TREE_OFFSET}, {(1 << SCORE_TREE_BITS) - 1}))"
+
+
+def _tree_key(score):
+    return max(0, min(score + SCORE_TREE_OFFSET, (1 << SCORE_TREE_BITS) - 1))
+
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    fixed_robots INTEGER NOT NULL DEFAULT 0,
+    time REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, id ASC);
+CREATE INDEX IF NOT EXISTS idx_scores_created_at ON scores (created_at);
+
+-- Árvore de contagens por intervalos de score (índice de estatística de ordem):
+-- o nó (level, node) conta as entradas com chave >> level == node, em que a chave
+-- é o score deslocado para 0..2^SCORE_TREE_BITS-1. Mantida por gatilhos: cada
+-- inserção atualiza um nó por nível (SCORE_TREE_BITS + 1 linhas) e a posição de
+-- um score soma no máximo SCORE_TREE_BITS nós, sem varrer os scores distintos
+CREATE TABLE IF NOT EXISTS score_tree_levels (
+    level INTEGER PRIMARY KEY
+);
+INSERT OR IGNORE INTO score_tree_levels (level)
+    WITH RECURSIVE levels(level) AS (SELECT 0 UNION ALL SELECT level + 1 FROM levels WHERE level < {SCORE_TREE_BITS})
+    SELECT level FROM levels;
+CREATE TABLE IF NOT EXISTS score_tree (
+    level INTEGER NOT NULL,
+    node INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (level, node)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_score_tree_insert AFTER INSERT ON scores BEGIN
+    INSERT INTO score_tree (level, node, count)
+    SELECT level, {_tree_key_sql('NEW.score')} >> level, 1 FROM score_tree_levels WHERE true
+    ON CONFLICT (level, node) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_score_tree_delete AFTER DELETE ON scores BEGIN
+    -- Upsert como na inserção (uma busca pela chave primária por nível); os nós
+    -- que chegam a zero ficam na tabela, sem efeito nas somas
+    INSERT INTO score_tree (level, node, count)
+    SELECT level, {_tree_key_sql('OLD.score')} >> level, 0 FROM score_tree_levels WHERE true
+    ON CONFLICT (level, node) DO UPDATE SET count = count - 1;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = "name, score, fixed_robots, time"
+
+
+def _row_to_entry(row):
+    return {'name': row[0], 'score': row[1], 'fixed_robots': row[2], 'time': row[3]}
+
+
+class SQLiteLeaderboard:
+    """
+    Leaderboard completo em SQLite
+    Expõe a mesma interface do RankingStore (load/add/page/count), então pode
+    substituí-lo na GUI; load() devolve apenas o topo (`max_entries`)
+    Cada thread usa a sua própria conexão: com o journal WAL, as leituras da
+    interface não esperam as gravações feitas pelo RankingWriter
+    """
+    def __init__(self, path=LEADERBOARD_FILE, max_entries=10):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+
+    @property
+    def conn(self):
+        """Conexão da thread atual (criada no primeiro uso)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # --- ESCRITA ---
+
+    def add(self, entry):
+        """Insere uma entrada e retorna o topo atualizado"""
+        self.add_many([entry])
+        return self.load()
+
+    def add_many(self, entries, batch_size=BATCH_SIZE, durable=True, on_applied=None):
+        """
+        Insere entradas em lotes, uma transação por lote
+        Sem `durable`, o commit não espera o fsync (PRAGMA synchronous=OFF)
+        `on_applied` é chamado depois do último commit (mesma interface do RankingStore)
+        """
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'OFF'}")
+        now = time.time()
+        batch = []
+        for entry in entries:
+            batch.append((entry['name'], entry['score'], entry.get('fixed_robots', 0),
+                          entry.get('time', 0), entry.get('created_at', now)))
+            if len(batch) >= batch_size:
+                self._insert_batch(batch)
+                batch = []
+        if batch:
+            self._insert_batch(batch)
+        if on_applied:
+            on_applied()
+
+    def save(self, durable=True):
+        """
+        Cada lote já é gravado na sua própria transação; com `durable`, leva ao
+        arquivo do banco (com fsync) os commits feitos sem sincronização
+        """
+        if durable:
+            self.conn.execute("PRAGMA synchronous=FULL")
+            self.conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def _insert_batch(self, batch):
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO scores ({COLUMNS}, created_at) VALUES (?, ?, ?, ?, ?)", batch)
+
+    # --- CONSULTAS ---
+
+    def load(self):
+        """Retorna as `max_entries` melhores entradas"""
+        return self.page(0, self.max_entries)
+
+    def page(self, page_index, page_size):
+        """Retorna uma página do ranking (maior score primeiro; empate: mais antigo primeiro)"""
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM scores ORDER BY score DESC, id ASC LIMIT ? OFFSET ?",
+            (page_size, page_index * page_size))
+        return [_row_to_entry(row) for row in rows]
+
+    def page_after(self, cursor, page_size):
+        """
+        Paginação por cursor (score, id) da última linha da página anterior
+        Usa o índice diretamente, sem o custo de OFFSET em páginas profundas
+        Retorna (entradas, cursor da próxima página)
+        """
+        if cursor is None:
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS}, id FROM scores ORDER BY score DESC, id ASC LIMIT ?", (page_size,))
+        else:
+            score, last_id = cursor
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS}, id FROM scores WHERE score < ? OR (score = ? AND id > ?) "
+                "ORDER BY score DESC, id ASC LIMIT ?", (score, score, last_id, page_size))
+        rows = rows.fetchall()
+        next_cursor = (rows[-1][1], rows[-1][4]) if rows else None
+        return [_row_to_entry(row) for row in rows], next_cursor
+
+    def rank_of(self, score):
+        """
+        Posição (1 = melhor) que o score ocuparia no ranking
+        Soma, em cada nível da árvore de contagens, o nó vizinho à direita do
+        caminho até o score: no máximo SCORE_TREE_BITS buscas pela chave
+        primária, O(log n) cada, não importa quantos scores distintos existam
+        """
+        key = _tree_key(score)
+        nodes = [(level, (key >> level) + 1) for level in range(SCORE_TREE_BITS) if not (key >> level) & 1]
+        if not nodes:
+            return 1
+        # OR de igualdades: uma busca pela chave primária por nó (com IN (VALUES ...)
+        # o SQLite varreria a tabela)
+        condition = " OR ".join("(level = ? AND node = ?)" for _ in nodes)
+        (above,) = self.conn.execute(
+            f"SELECT COALESCE(SUM(count), 0) FROM score_tree WHERE {condition}",
+            [value for node in nodes for value in node]).fetchone()
+        return above + 1
+
+    def count(self):
+        """Total de entradas: a raiz da árvore de contagens (O(log n))"""
+        row = self.conn.execute(
+            "SELECT count FROM score_tree WHERE level = ? AND node = 0", (SCORE_TREE_BITS,)).fetchone()
+        return row[0] if row else 0
+
+    # --- MIGRAÇÃO ---
+
+    def migrate_from_json(self, json_path):
+        """
+        Importa um ranking.json existente (apenas uma vez por arquivo)
+        Retorna a quantidade de entradas importadas
+        """
+        key = f"migrated:{os.path.abspath(json_path)}"
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        if not os.path.exists(json_path):
+            return 0
+
+        with open(json_path, 'r') as f:
+            try:
+                entries = json.load(f)
+            except json.JSONDecodeError:
+                entries = []
+        # As entradas e a marca de importação no mesmo commit: uma queda no meio
+        # não deixa o arquivo importado sem a marca (e importado de novo)
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO scores ({COLUMNS}, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(entry['name'], entry['score'], entry.get('fixed_robots', 0), entry.get('time', 0),
+                  entry.get('created_at', now)) for entry in entries])
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(now)))
+        return len(entries)
@@ -5,13 +5,84 @@ Autor: Sistema de IA
 Ano: 2024
 """
 
-from gui import GUI
+import argparse
+
+from config import PRESETS, GameConfig, preset
+from profiler import StartupTimer
+from ranking import FSYNC_POLICIES, RANKING_BACKENDS
+
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Oficina de Reparo de Robôs")
+    parser.add_argument("--ranking", choices=RANKING_BACKENDS, default="json",
+                        help="armazenamento do ranking: json (top 10) ou sqlite (todos os scores)")
+    parser.add_argument("--ranking-fsync", choices=FSYNC_POLICIES, default="always",
+                        help="quando sincronizar as gravações do ranking com o disco")
+    parser.add_argument("--threaded", action="store_true",
+                        help="roda a simulação em uma thread separada da renderização")
+    parser.add_argument("--pool-objects", action="store_true",
+                        help="reaproveita robôs, componentes e nós em pools em vez de recriá-los")
+    parser.add_argument("--ranking-sync", metavar="URL",
+                        help="sincroniza o ranking com um leaderboard compartilhado (ex.: http://127.0.0.1:8765)")
+    parser.add_argument("--kiosk-id", help="identificador deste quiosque na sincronização do ranking")
+    parser.add_argument("--metrics", metavar="ARQUIVO",
+                        help="grava métricas ao vivo em um buffer circular (monitor: python metrics.py ARQUIVO)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="imprime o tempo de cada fase da inicialização até o primeiro frame")
+
+    tuning = parser.add_argument_group("ajustes da partida")
+    tuning.add_argument("--preset", choices=sorted(PRESETS), default="classic",
+                        help="classic (90s, até 5 robôs) ou endless (sem fim, spawns rápidos, fila enorme)")
+    tuning.add_argument("--config", metavar="ARQUIVO",
+                        help="arquivo JSON com campos do GameConfig (sobrepõe o preset)")
+    tuning.add_argument("--time-limit", type=float,
+                        help="duração da partida em segundos (0 = sem fim)")
+    tuning.add_argument("--max-robots", type=int, help="capacidade da fila de reparo")
+    tuning.add_argument("--spawn-interval", type=float, help="segundos entre os spawns de robôs")
+    tuning.add_argument("--spawn-batch", type=int, help="máximo de robôs gerados por atualização")
+    tuning.add_argument("--initial-robots", type=int, help="robôs na fila ao iniciar a partida")
+    tuning.add_argument("--lazy-components", action="store_true", default=None,
+                        help="cria os componentes de cada robô só quando chegam ao topo ou são exibidos")
+    return parser.parse_args(argv)
+
+
+def build_game_config(args):
+    """Monta o GameConfig: preset, depois o arquivo --config, depois as opções avulsas"""
+    config = preset(args.preset)
+    if args.config:
+        config = GameConfig.load(args.config, base=config)
+    overrides = {
+        'max_robots': args.max_robots,
+        'spawn_interval': args.spawn_interval,
+        'spawn_batch': args.spawn_batch,
+        'initial_robots': args.initial_robots,
+        'lazy_components': args.lazy_components,
+    }
+    overrides = {field: value for field, value in overrides.items() if value is not None}
+    if args.time_limit is not None:
+        overrides['time_limit'] = args.time_limit or None
+    return config.replace(**overrides)
 
 
 def main():
     """Função principal que inicia o jogo"""
+    args = parse_args()
+    try:
+        game_config = build_game_config(args)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Configuração inválida: {e}")
+        return
+    startup = StartupTimer(report=args.startup_report)
     try:
-        gui = GUI()
+        # Importado aqui para que o import do pygame entre no relatório de inicialização
+        from gui import GUI
+        startup.mark("import_gui")
+        
+        gui = GUI(ranking_backend=args.ranking, ranking_fsync=args.ranking_fsync,
+                  threaded=args.threaded, startup=startup, pool_objects=args.pool_objects,
+                  game_config=game_config, metrics_path=args.metrics,
+                  ranking_sync_url=args.ranking_sync, kiosk_id=args.kiosk_id)
         gui.run()
     except Exception as e:
         print(f"Erro ao executar o jogo: {e}")
@@ -0,0 +1,181 @@
+"""
+Módulo de métricas ao vivo em um buffer circular mapeado em memória (mmap)
+O jogo grava um registro de tamanho fixo por frame (tempo de frame, fila,
+contadores da partida) em um arquivo; um monitor externo acompanha um ou mais
+arquivos (um por quiosque) lendo direto do mmap, sem cópias e sem nenhum lock
+no escritor
+
+Uso do monitor:
+    python metrics.py quiosque1.metrics quiosque2.metrics --interval 1
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+METRICS_MAGIC = b"RBMETRIC"
+METRICS_VERSION = 1
+METRICS_CAPACITY = 4096  # Registros no buffer (~68s a 60 FPS)
+
+# Cabeçalho: magic, versão, tamanho do registro, capacidade, PID do escritor,
+# sequência do último registro publicado (0 = nenhum)
+HEADER = struct.Struct("<8sIIIIQ")
+HEAD_OFFSET = HEADER.size - 8
+# Registro (64 bytes): sequência, instante, tempo de trabalho do frame e tempo
+# total do frame (ms), fila, robôs consertados, componentes substituídos,
+# códigos rejeitados, spawns perdidos (oficina lotada), score e tela
+RECORD = struct.Struct("<QdffIIIIIiB15x")
+SEQ = struct.Struct("<Q")
+
+MetricRecord = namedtuple("MetricRecord", (
+    "seq", "timestamp", "work_ms", "frame_ms", "queue_length", "robots_fixed",
+    "components_replaced", "codes_rejected", "spawn_overflows", "score", "state"))
+
+STATES = ("menu", "playing", "game_over", "ranking")
+UNKNOWN_STATE = 255
+
+
+class MetricsWriter:
+    """
+    Escritor do buffer circular (um único escritor por arquivo)
+    Cada slot funciona como um seqlock: a sequência do slot é zerada, o corpo é
+    gravado e só então a nova sequência é publicada (no slot e no cabeçalho).
+    O leitor relê a sequência depois do corpo e descarta registros alterados
+    durante a leitura; o escritor nunca espera pelo leitor
+    """
+    def __init__(self, path, capacity=METRICS_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.seq = 0
+        size = HEADER.size + capacity * RECORD.size
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self._map = mmap.mmap(f.fileno(), size)
+        HEADER.pack_into(self._map, 0, METRICS_MAGIC, METRICS_VERSION, RECORD.size, capacity, os.getpid(), 0)
+
+    def record(self, game, state, work_ms, frame_ms):
+        """Publica o registro de um frame (alguns microssegundos, sem alocar o buffer)"""
+        self.seq = seq = self.seq + 1
+        offset = HEADER.size + (seq % self.capacity) * RECORD.size
+        buffer = self._map
+        SEQ.pack_into(buffer, offset, 0)
+        RECORD.pack_into(buffer, offset, 0, time.time(), work_ms, frame_ms, len(game.robots),
+                         game.robots_fixed, game.components_replaced, game.codes_rejected,
+                         game.spawn_overflows, game.final_score,
+                         STATES.index(state) if state in STATES else UNKNOWN_STATE)
+        SEQ.pack_into(buffer, offset, seq)
+        SEQ.pack_into(buffer, HEAD_OFFSET, seq)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class MetricsReader:
+    """
+    Leitor do buffer circular: struct.unpack_from direto do mmap (sem copiar o
+    buffer). Registros sobrescritos antes de serem lidos contam como perdidos
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.capacity, self.pid, _ = HEADER.unpack_from(self._map, 0)
+        if magic != METRICS_MAGIC or version != METRICS_VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} não é um arquivo de métricas compatível")
+        self.last_seq = 0
+        self.lost = 0
+
+    @property
+    def head(self):
+        """Sequência do último registro publicado"""
+        return SEQ.unpack_from(self._map, HEAD_OFFSET)[0]
+
+    def read(self, seq):
+        """O registro `seq`, ou None se ele já foi sobrescrito (ou está sendo)"""
+        offset = HEADER.size + (seq % self.capacity) * RECORD.size
+        if SEQ.unpack_from(self._map, offset)[0] != seq:
+            return None
+        values = RECORD.unpack_from(self._map, offset)
+        if SEQ.unpack_from(self._map, offset)[0] != seq:
+            return None
+        return MetricRecord(seq, *values[1:])
+
+    def poll(self):
+        """Registros publicados desde a última chamada, em ordem"""
+        head = self.head
+        start = max(self.last_seq + 1, head - self.capacity + 1)
+        self.lost += start - (self.last_seq + 1)
+        records = []
+        for seq in range(start, head + 1):
+            record = self.read(seq)
+            if record is None:
+                self.lost += 1
+            else:
+                records.append(record)
+        self.last_seq = max(self.last_seq, head)
+        return records
+
+    def close(self):
+        self._map.close()
+
+
+def summarize(name, records, lost):
+    """Uma linha de resumo dos registros de um intervalo"""
+    if not records:
+        return f"{name}: sem frames novos"
+    last = records[-1]
+    work = sorted(record.work_ms for record in records)
+    frame_total = sum(record.frame_ms for record in records)
+    state = STATES[last.state] if last.state < len(STATES) else "?"
+    return (f"{name}: {state:<9} fps={1000 * len(records) / frame_total if frame_total else 0:5.1f} "
+            f"trabalho p50={work[len(work) // 2]:.2f}ms p99={work[min(len(work) - 1, int(len(work) * 0.99))]:.2f}ms "
+            f"máx={work[-1]:.2f}ms fila={last.queue_length} consertados={last.robots_fixed} "
+            f"componentes={last.components_replaced} rejeitados={last.codes_rejected} "
+            f"lotada={last.spawn_overflows} score={last.score} perdidos={lost}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor das métricas ao vivo dos quiosques")
+    parser.add_argument("paths", nargs="+", metavar="ARQUIVO", help="arquivos gravados com --metrics")
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre os resumos")
+    parser.add_argument("--raw", action="store_true", help="imprime cada registro em vez dos resumos")
+    parser.add_argument("--once", action="store_true", help="resume o conteúdo atual e sai")
+    args = parser.parse_args(argv)
+
+    readers = {}
+    for path in args.paths:
+        try:
+            readers[path] = MetricsReader(path)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao abrir {path}: {e}", file=sys.stderr)
+    if not readers:
+        return 1
+    try:
+        while True:
+            for path, reader in readers.items():
+                lost = reader.lost
+                records = reader.poll()
+                name = os.path.basename(path)
+                if args.raw:
+                    for record in records:
+                        print(f"{name} {record}")
+                else:
+                    print(summarize(name, records, reader.lost - lost))
+            if args.once:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        for reader in readers.values():
+            reader.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Módulo de profiling de frames
+Mede o tempo de cada seção do loop principal com perf_counter_ns, mantém
+históricos circulares por seção e exporta traces no formato do Chrome (chrome://tracing)
+"""
+import json
+import sys
+import time
+from collections import deque
+
+FRAME_HISTORY = 240        # Quadros mantidos nos históricos (~4s a 60 FPS)
+TRACE_CAPACITY = 100_000   # Eventos mantidos para exportação do trace
+
+
+class _NullSection:
+    """Seção vazia usada quando o profiler está desligado (custo quase zero)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    """Context manager reaproveitado de uma seção nomeada"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start, self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Coleta tempos por seção agrupados por frame
+    Uso:
+        profiler.begin_frame()
+        with profiler.section("update"):
+            ...
+        profiler.end_frame()
+    """
+    def __init__(self, history=FRAME_HISTORY, trace_capacity=TRACE_CAPACITY):
+        self.enabled = False
+        self.history = history
+        self.frame_times = deque(maxlen=history)
+        self.histograms = {}
+        self.trace_events = deque(maxlen=trace_capacity)
+        self.caches = {}
+        self._sections = {}
+        self._frame_totals = {}
+        self._frame_start = None
+
+    def toggle(self):
+        """Liga/desliga a coleta (ao desligar, descarta os históricos)"""
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        self.histograms.clear()
+        self._frame_totals.clear()
+        self._frame_start = None
+        return self.enabled
+
+    def register_cache(self, name, stats):
+        """Registra uma função que retorna (acertos, falhas) de um cache"""
+        self.caches[name] = stats
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Fecha o frame: consolida os totais de cada seção nos históricos"""
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter_ns()
+        self.frame_times.append(now - self._frame_start)
+        self.trace_events.append(("frame", self._frame_start, now - self._frame_start))
+        for name, total in self._frame_totals.items():
+            samples = self.histograms.get(name)
+            if samples is None:
+                samples = self.histograms[name] = deque(maxlen=self.history)
+            samples.append(total)
+        self._frame_totals.clear()
+
+    def section(self, name):
+        """Context manager que mede uma seção (no-op quando desligado)"""
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def add(self, name, elapsed_ns, start_ns=None):
+        """Soma `elapsed_ns` ao total da seção no frame atual"""
+        if not self.enabled:
+            return
+        self._frame_totals[name] = self._frame_totals.get(name, 0) + elapsed_ns
+        if start_ns is not None:
+            self.trace_events.append((name, start_ns, elapsed_ns))
+
+    # --- CONSULTAS (usadas pelo overlay) ---
+
+    def fps(self):
+        if not self.frame_times:
+            return 0.0
+        return 1e9 * len(self.frame_times) / sum(self.frame_times)
+
+    def worst_frames(self, count=3):
+        """Os `count` piores tempos de frame (ms) do histórico"""
+        return [ns / 1e6 for ns in sorted(self.frame_times, reverse=True)[:count]]
+
+    def section_stats(self):
+        """Retorna {seção: (média, p99, máximo)} em milissegundos"""
+        stats = {}
+        for name, samples in self.histograms.items():
+            ordered = sorted(samples)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            stats[name] = (sum(ordered) / len(ordered) / 1e6, p99 / 1e6, ordered[-1] / 1e6)
+        return stats
+
+    def cache_hit_rates(self):
+        """Retorna {cache: taxa de acerto} para os caches registrados"""
+        rates = {}
+        for name, stats in self.caches.items():
+            hits, misses = stats()
+            total = hits + misses
+            rates[name] = hits / total if total else 0.0
+        return rates
+
+    def dump_trace(self, path):
+        """Exporta os eventos coletados no formato Trace Event (chrome://tracing, Perfetto)"""
+        events = [
+            {'name': name, 'ph': 'X', 'ts': start / 1000, 'dur': elapsed / 1000, 'pid': 1, 'tid': 1}
+            for name, start, elapsed in self.trace_events
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class StartupTimer:
+    """
+    Marca as fases da inicialização até o primeiro frame
+    O relatório segue o formato de `python -X importtime` (self/cumulativo em µs)
+    """
+    def __init__(self, report=False):
+        self.report_on_finish = report
+        self.start = time.perf_counter_ns()
+        self.phases = []
+        self.done = False
+        self._last = self.start
+
+    def mark(self, phase):
+        """Registra o fim de uma fase (o tempo próprio é desde a marca anterior)"""
+        now = time.perf_counter_ns()
+        self.phases.append((phase, now - self._last, now - self.start))
+        self._last = now
+
+    def finish(self, phase="first_frame"):
+        """Marca a última fase e imprime o relatório, se solicitado"""
+        self.mark(phase)
+        self.done = True
+        if self.report_on_finish:
+            self.report()
+
+    def as_dict(self):
+        return {phase: {'self_ms': own / 1e6, 'cumulative_ms': total / 1e6}
+                for phase, own, total in self.phases}
+
+    def report(self, file=None):
+        file = file or sys.stderr
+        print("startup time: self [us] | cumulative | phase", file=file)
+        for phase, own, total in self.phases:
+            print(f"startup time: {own // 1000:>9} | {total // 1000:>10} | {phase}", file=file)
@@ -0,0 +1,307 @@
+"""
+Módulo de persistência do ranking
+Mantém uma cópia em memória do ranking.json (revalidada pelo mtime/tamanho do arquivo),
+grava de forma atômica e guarda apenas os melhores scores em um heap limitado.
+As gravações podem ser delegadas a uma thread (RankingWriter) para não travar o jogo
+"""
+import heapq
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+RANKING_FILE = "ranking.json"
+MAX_RANKING_ENTRIES = 10
+RANKING_BACKENDS = ("json", "sqlite")
+
+# Política de fsync das gravações em segundo plano:
+#   always: cada gravação é sincronizada com o disco
+#   on_exit: só a gravação final (ao sair do jogo) é sincronizada
+#   never: nunca sincroniza (fica a cargo do sistema operacional)
+FSYNC_POLICIES = ("always", "on_exit", "never")
+WRITER_COALESCE_SECONDS = 0.05  # Janela para agrupar gravações seguidas
+WRITER_RETRY_SECONDS = 1.0      # Espera antes de repetir uma gravação que falhou
+
+
+def atomic_write_json(path, data, durable=True, prefix=".tmp-"):
+    """
+    Grava `data` em um arquivo temporário e o renomeia sobre `path` (atômico)
+    Com `durable`, o conteúdo é sincronizado (fsync) antes da troca
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RankingStore:
+    """
+    Ranking com os `max_entries` melhores scores
+    O heap mínimo guarda (score, -ordem de chegada, entrada): em caso de empate,
+    a entrada mais antiga fica na frente, como na ordenação estável original
+    """
+    def __init__(self, path=RANKING_FILE, max_entries=MAX_RANKING_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._heap = []
+        self._seq = 0
+        self._entries = []
+        self._signature = None
+        # Protege o estado em memória (a gravação no disco acontece fora do lock)
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        """(mtime, tamanho) do arquivo, ou None se ele não existir"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _push(self, entry):
+        """Insere no heap limitado: O(log k) em vez de ordenar a lista inteira"""
+        item = (entry['score'], -self._seq, entry)
+        self._seq += 1
+        if len(self._heap) < self.max_entries:
+            heapq.heappush(self._heap, item)
+        else:
+            heapq.heappushpop(self._heap, item)
+
+    def _refresh_entries(self):
+        self._entries = [entry for _, _, entry in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+    def load(self):
+        """Retorna o ranking, relendo o arquivo apenas se ele mudou no disco"""
+        with self._lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return self._entries
+
+            entries = []
+            if signature is not None:
+                with open(self.path, 'r') as f:
+                    try:
+                        entries = json.load(f)
+                    except json.JSONDecodeError:
+                        entries = []
+
+            self._heap = []
+            self._seq = 0
+            for entry in entries:
+                self._push(entry)
+            self._refresh_entries()
+            self._signature = signature
+            return self._entries
+
+    def page(self, page_index, page_size):
+        """Retorna uma página do ranking"""
+        start = page_index * page_size
+        return self.load()[start:start + page_size]
+
+    def count(self):
+        return len(self.load())
+
+    def add(self, entry):
+        """Adiciona uma entrada ao ranking e grava o arquivo"""
+        self.add_many([entry])
+        return self._entries
+
+    def add_many(self, entries, durable=True, on_applied=None):
+        """
+        Adiciona várias entradas e grava o arquivo uma única vez
+        `on_applied` é chamado assim que as entradas estão na cópia em memória,
+        antes da gravação no disco (ainda com o lock, então quem lê o ranking
+        nunca as vê ao mesmo tempo na memória e fora dela)
+        Entradas que já estão no heap (o mesmo objeto, de uma tentativa que
+        falhou ao gravar) não são inseridas de novo
+        """
+        self.load()
+        with self._lock:
+            present = {id(item[2]) for item in self._heap}
+            for entry in entries:
+                if id(entry) not in present:
+                    self._push(entry)
+            self._refresh_entries()
+            if on_applied:
+                on_applied()
+        self.save(durable)
+
+    def save(self, durable=True):
+        """
+        Grava em um arquivo temporário e o renomeia sobre o original (atômico)
+        Com `durable`, o conteúdo é sincronizado (fsync) antes da troca
+        """
+        atomic_write_json(self.path, self._entries, durable, prefix=".ranking-")
+        with self._lock:
+            self._signature = self._file_signature()
+
+    def close(self):
+        """Nada a liberar (mantido pela interface comum com o SQLiteLeaderboard)"""
+
+
+def merge_pending(entries, pending, limit=MAX_RANKING_ENTRIES):
+    """
+    Mescla ao topo do ranking as entradas ainda não gravadas (exibição otimista)
+    `pending` deve ser lido antes de `entries`: uma entrada que passou para a
+    memória do armazenamento entre as duas leituras aparece nas duas listas e
+    é descartada de `pending` pela identidade do objeto
+    """
+    if not pending:
+        return entries
+    stored = {id(entry) for entry in entries}
+    merged = entries + [entry for entry in pending if id(entry) not in stored]
+    return sorted(merged, key=lambda x: x['score'], reverse=True)[:limit]
+
+
+class RankingWriter:
+    """
+    Thread que grava o ranking em segundo plano
+    submit() só enfileira a entrada (não toca no disco); gravações seguidas são
+    agrupadas em uma única chamada a add_many. Enquanto não chegam à memória
+    do armazenamento, as entradas ficam em `pending()` para a interface
+    exibi-las de forma otimista (ver merge_pending)
+    Uma gravação que falha volta para `pending()` e é repetida com a próxima
+    gravação ou depois de `retry_seconds`; `unsaved` conta as entradas que não
+    puderam ser gravadas até o encerramento
+    """
+    _STOP = object()
+
+    def __init__(self, store, fsync_policy="always", coalesce_seconds=WRITER_COALESCE_SECONDS,
+                 retry_seconds=WRITER_RETRY_SECONDS):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconhecida: {fsync_policy}")
+        self.store = store
+        self.fsync_policy = fsync_policy
+        self.coalesce_seconds = coalesce_seconds
+        self.retry_seconds = retry_seconds
+        self.batches_written = 0
+        self.last_error = None
+        self.unsaved = 0
+        self._queue = queue.Queue()
+        self._pending = []
+        self._failed = []  # Entradas da última gravação que falhou (repetidas na próxima)
+        self._writing = []  # Entradas da gravação em andamento
+        self._unsynced = False  # Alguma gravação sem fsync desde a última sincronizada
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="ranking-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        """Enfileira uma entrada para gravação (retorna imediatamente)"""
+        with self._pending_lock:
+            self._pending.append(entry)
+        self._queue.put(entry)
+
+    def pending(self):
+        """Entradas enviadas que ainda não foram gravadas"""
+        with self._pending_lock:
+            return list(self._pending)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                # Com uma gravação que falhou, acorda sozinho para repeti-la
+                batch = [self._queue.get(timeout=self.retry_seconds if self._failed else None)]
+            except queue.Empty:
+                batch = []
+            # Espera um pouco para agrupar gravações seguidas em uma só
+            if batch and batch[0] is not self._STOP and self.coalesce_seconds:
+                time.sleep(self.coalesce_seconds)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if self._STOP in batch:
+                stopping = True
+            entries = self._failed + [entry for entry in batch if entry is not self._STOP]
+            self._failed = []
+            if entries:
+                durable = self.fsync_policy == "always" or (stopping and self.fsync_policy == "on_exit")
+                self._write(entries, durable)
+            elif stopping and self._unsynced and self.fsync_policy == "on_exit":
+                # Nada novo ao sair, mas gravações anteriores não foram sincronizadas
+                self._sync_on_exit()
+        if self._failed:
+            self.unsaved = len(self._failed)
+            print(f"Ranking: {self.unsaved} entradas não foram gravadas ({self.last_error})")
+
+    def _sync_on_exit(self):
+        try:
+            self.store.save(durable=True)
+            self._unsynced = False
+        except Exception as e:
+            self.last_error = e
+            print(f"Erro ao sincronizar o ranking: {e}")
+
+    def _applied(self, entries):
+        """As entradas já estão na memória do armazenamento: saem de pending()"""
+        with self._pending_lock:
+            applied = {id(entry) for entry in entries}
+            self._pending = [entry for entry in self._pending if id(entry) not in applied]
+
+    def _write(self, entries, durable):
+        self._writing = entries
+        try:
+            self.store.add_many(entries, durable=durable, on_applied=lambda: self._applied(entries))
+            self.batches_written += 1
+            self._unsynced = not durable
+        except Exception as e:
+            # Não derruba a thread: as entradas voltam para pending() e a gravação é repetida
+            self.last_error = e
+            self._failed = entries
+            with self._pending_lock:
+                pending = {id(entry) for entry in self._pending}
+                self._pending[:0] = [entry for entry in entries if id(entry) not in pending]
+            print(f"Erro ao gravar o ranking: {e}")
+        else:
+            # Armazenamentos que não chamam on_applied
+            self._applied(entries)
+        finally:
+            self._writing = []
+
+    def close(self, timeout=5.0):
+        """
+        Grava o que estiver pendente e encerra a thread (chamado ao sair do jogo)
+        Retorna quantas entradas ficaram sem gravar (também avisado no console)
+        """
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+        if self._thread.is_alive():
+            with self._pending_lock:
+                waiting = {id(entry) for entry in self._pending}
+                self.unsaved = len(waiting) + sum(1 for entry in self._writing if id(entry) not in waiting)
+            print(f"Ranking: a gravação não terminou em {timeout:g}s; "
+                  f"{self.unsaved} entradas podem não ter sido gravadas")
+        return self.unsaved
+
+
+def open_ranking_store(backend="json", max_entries=MAX_RANKING_ENTRIES):
+    """
+    Cria o armazenamento do ranking
+    "json": ranking.json com os `max_entries` melhores (padrão)
+    "sqlite": leaderboard.db com todos os scores (importa o ranking.json na primeira vez)
+    """
+    if backend == "json":
+        return RankingStore(RANKING_FILE, max_entries)
+    if backend == "sqlite":
+        from leaderboard import LEADERBOARD_FILE, SQLiteLeaderboard
+
+        store = SQLiteLeaderboard(LEADERBOARD_FILE, max_entries)
+        store.migrate_from_json(RANKING_FILE)
+        return store
+    raise ValueError(f"Backend de ranking desconhecido: {backend}")
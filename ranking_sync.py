@@ -0,0 +1,513 @@
+"""
+Módulo de sincronização do ranking entre quiosques
+Cada quiosque envia as entradas novas em lotes a um serviço de leaderboard, por
+uma conexão HTTP persistente, e traz de volta o topo remoto para mesclá-lo ao
+ranking local. Sem rede, as entradas esperam em uma caixa de saída no disco e
+as tentativas seguem um backoff exponencial; nada disso roda na thread do pygame
+
+Serviço local de teste (substituto do leaderboard central):
+    python ranking_sync.py --port 8765
+e no jogo:
+    python main.py --ranking-sync http://127.0.0.1:8765
+"""
+import argparse
+import bisect
+import http.client
+import json
+import queue
+import random
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ranking import MAX_RANKING_ENTRIES, WRITER_COALESCE_SECONDS, atomic_write_json
+
+OUTBOX_FILE = "ranking_outbox.json"
+SYNC_BATCH_SIZE = 50        # Entradas por requisição
+SYNC_PULL_INTERVAL = 30.0   # Segundos entre as buscas do topo remoto sem envios
+SYNC_TIMEOUT = 5.0          # Timeout de conexão/leitura (s)
+BACKOFF_BASE = 1.0          # Espera após a primeira falha (s), dobrada a cada falha seguida
+BACKOFF_MAX = 60.0
+SEEN_IDS_LIMIT = 5000       # IDs de entradas já mescladas guardados na caixa de saída
+
+
+class SyncError(Exception):
+    """Resposta de erro do serviço de leaderboard"""
+
+
+class LeaderboardClient:
+    """
+    Cliente JSON do serviço de leaderboard com uma única conexão persistente
+    (keep-alive) reaproveitada por todas as requisições. A conexão só é refeita
+    depois de um erro; se uma conexão reaproveitada foi fechada pelo servidor
+    (ociosa), a requisição é repetida uma vez em uma conexão nova
+    """
+    def __init__(self, base_url, timeout=SYNC_TIMEOUT):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL do leaderboard inválida: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._conn = None
+        self._conn_requests = 0
+        self.connections = 0  # Conexões abertas (1 enquanto não houver falhas)
+        self.requests = 0
+
+    def _connection(self):
+        if self._conn is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = factory(self.host, self.port, timeout=self.timeout)
+            self._conn_requests = 0
+            self.connections += 1
+        return self._conn
+
+    def request(self, method, path, payload=None):
+        """Envia uma requisição e retorna o JSON da resposta (OSError/HTTPException/SyncError em falhas)"""
+        body = None if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        while True:
+            conn = self._connection()
+            reused = self._conn_requests > 0
+            try:
+                conn.request(method, self.prefix + path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                self.close()
+                if reused:
+                    continue
+                raise
+            self._conn_requests += 1
+            self.requests += 1
+            if response.will_close:
+                self.close()
+            if response.status >= 400:
+                raise SyncError(f"HTTP {response.status} em {method} {path}")
+            return json.loads(data) if data else None
+
+    def post_entries(self, entries):
+        """Envia um lote de entradas (o serviço ignora IDs repetidos)"""
+        return self.request("POST", "/entries", {'entries': entries})
+
+    def top(self, limit):
+        """As `limit` melhores entradas do leaderboard"""
+        return self.request("GET", f"/top?limit={limit}")['entries']
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Outbox:
+    """
+    Caixa de saída no disco: entradas ainda não confirmadas pelo serviço, os IDs
+    das entradas remotas já mescladas e o ID do quiosque
+    Cada mudança regrava o arquivo de forma atômica, então os scores feitos sem
+    rede sobrevivem ao desligamento do quiosque
+    """
+    def __init__(self, path=OUTBOX_FILE, durable=True):
+        self.path = path
+        self.durable = durable
+        self.kiosk_id = None
+        self.pending = []
+        self.seen = deque(maxlen=SEEN_IDS_LIMIT)
+        self._seen_set = set()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.kiosk_id = state.get('kiosk_id')
+            self.pending = list(state.get('pending', []))
+            for entry_id in state.get('seen', []):
+                self.mark_seen(entry_id)
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"Caixa de saída do ranking ilegível ({e}); começando vazia")
+
+    def mark_seen(self, entry_id):
+        if entry_id in self._seen_set:
+            return
+        if len(self.seen) == self.seen.maxlen:
+            self._seen_set.discard(self.seen[0])
+        self.seen.append(entry_id)
+        self._seen_set.add(entry_id)
+
+    def is_seen(self, entry_id):
+        return entry_id in self._seen_set
+
+    def add(self, entries):
+        self.pending.extend(entries)
+        for entry in entries:
+            self.mark_seen(entry['id'])
+        self.save()
+
+    def batch(self, size):
+        return self.pending[:size]
+
+    def ack(self, count):
+        """Remove as `count` primeiras entradas (confirmadas pelo serviço)"""
+        del self.pending[:count]
+        self.save()
+
+    def save(self):
+        atomic_write_json(self.path, {'kiosk_id': self.kiosk_id, 'pending': self.pending, 'seen': list(self.seen)},
+                          self.durable, prefix=".outbox-")
+
+    def __len__(self):
+        return len(self.pending)
+
+
+class RankingSync:
+    """
+    Thread de sincronização do ranking com o serviço de leaderboard
+    submit() só marca a entrada com um ID global e a enfileira: a GUI nunca
+    espera a rede nem o disco. A thread grava as entradas na caixa de saída,
+    envia as pendentes em lotes de `batch_size` e, depois de cada envio (e a
+    cada `pull_interval`), busca o topo remoto; as entradas de outros quiosques
+    ainda não vistas ficam em take_remote() para a GUI gravá-las no ranking local
+    Uma falha deixa os lotes na caixa de saída e adia a próxima tentativa em
+    `backoff_base` * 2^(falhas seguidas - 1) s, até `backoff_max`, com jitter
+    Um erro ao gravar a caixa de saída (disco cheio, somente leitura) não para a
+    thread: as entradas continuam na memória (e seguem sendo enviadas) e a
+    gravação é repetida com o mesmo backoff
+    """
+    _STOP = object()
+
+    def __init__(self, client, outbox, kiosk_id=None, batch_size=SYNC_BATCH_SIZE,
+                 pull_interval=SYNC_PULL_INTERVAL, top_limit=MAX_RANKING_ENTRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, coalesce_seconds=WRITER_COALESCE_SECONDS):
+        self.client = client
+        self.outbox = outbox
+        # O ID do quiosque fica na caixa de saída (o mesmo entre execuções)
+        self.kiosk_id = kiosk_id or outbox.kiosk_id or uuid.uuid4().hex[:8]
+        self.batch_size = batch_size
+        self.pull_interval = pull_interval
+        self.top_limit = top_limit
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.coalesce_seconds = coalesce_seconds
+        self.online = None  # None até a primeira tentativa
+        self.failures = 0   # Falhas seguidas
+        self.sent = 0
+        self.batches_sent = 0
+        self.pulls = 0
+        self.merged = 0
+        self.last_error = None
+        self.outbox_saved = True  # False enquanto a caixa de saída no disco estiver desatualizada
+        self._save_failures = 0
+        self._next_save = 0.0
+        self._next_attempt = 0.0
+        self._next_pull = 0.0
+        self._queue = queue.Queue()
+        self._remote = []
+        self._remote_lock = threading.Lock()
+        if outbox.kiosk_id != self.kiosk_id:
+            outbox.kiosk_id = self.kiosk_id
+            self._persist(outbox.save)
+        self._thread = threading.Thread(target=self._run, name="ranking-sync", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        """Marca a entrada com um ID global e a enfileira para envio (retorna a entrada marcada)"""
+        entry = dict(entry, id=f"{self.kiosk_id}-{uuid.uuid4().hex[:12]}", kiosk=self.kiosk_id)
+        self._queue.put(entry)
+        return entry
+
+    def take_remote(self):
+        """Entradas de outros quiosques recebidas desde a última chamada"""
+        with self._remote_lock:
+            entries, self._remote = self._remote, []
+        return entries
+
+    def pending_count(self):
+        """Entradas ainda não confirmadas pelo serviço"""
+        return len(self.outbox) + self._queue.qsize()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            now = time.monotonic()
+            wake = self._next_pull
+            if len(self.outbox):
+                wake = min(wake, max(self._next_attempt, now))
+            if not self.outbox_saved:
+                wake = min(wake, max(self._next_save, now))
+            try:
+                items = [self._queue.get(timeout=max(0.0, wake - now))]
+                # Espera um pouco para agrupar entradas seguidas no mesmo lote
+                if items[0] is not self._STOP and self.coalesce_seconds:
+                    time.sleep(self.coalesce_seconds)
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._STOP in items
+            entries = [item for item in items if item is not self._STOP]
+            if entries:
+                self._persist(self.outbox.add, entries)
+            elif not self.outbox_saved and (stopping or time.monotonic() >= self._next_save):
+                self._persist(self.outbox.save)
+            # Ao encerrar, tenta um último envio (o que falhar continua no disco)
+            if stopping or time.monotonic() >= self._next_attempt:
+                self._sync(pull=not stopping)
+        self.client.close()
+
+    def _sync(self, pull=True):
+        try:
+            pushed = False
+            while len(self.outbox):
+                batch = self.outbox.batch(self.batch_size)
+                self.client.post_entries(batch)
+                self._persist(self.outbox.ack, len(batch))
+                self.sent += len(batch)
+                self.batches_sent += 1
+                pushed = True
+            if pull and (pushed or time.monotonic() >= self._next_pull):
+                self._merge(self.client.top(self.top_limit))
+                self.pulls += 1
+                self._next_pull = time.monotonic() + self.pull_interval
+        except (OSError, http.client.HTTPException, SyncError, ValueError, KeyError) as e:
+            self.last_error = e
+            self.online = False
+            self.failures += 1
+            self._next_attempt = time.monotonic() + self._backoff(self.failures)
+            self._next_pull = min(self._next_pull, self._next_attempt)
+        else:
+            self.online = True
+            self.failures = 0
+
+    def _backoff(self, failures):
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _persist(self, action, *args):
+        """
+        Executa uma operação da caixa de saída que grava o arquivo; um erro de
+        disco fica registrado e a gravação é repetida depois (o estado em
+        memória já está atualizado)
+        """
+        try:
+            action(*args)
+        except OSError as e:
+            if self.outbox_saved:
+                print(f"Erro ao gravar a caixa de saída do ranking: {e}")
+            self.last_error = e
+            self.outbox_saved = False
+            self._save_failures += 1
+            self._next_save = time.monotonic() + self._backoff(self._save_failures)
+        else:
+            self.outbox_saved = True
+            self._save_failures = 0
+
+    def _merge(self, remote_entries):
+        new = [entry for entry in remote_entries if 'id' in entry and not self.outbox.is_seen(entry['id'])]
+        if not new:
+            return
+        for entry in new:
+            self.outbox.mark_seen(entry['id'])
+        self.merged += len(new)
+        # Entregues à GUI antes de gravar: uma falha no disco não as perde
+        with self._remote_lock:
+            self._remote.extend(new)
+        self._persist(self.outbox.save)
+
+    def close(self, timeout=None):
+        """
+        Encerra a thread após uma última tentativa de envio (chamado ao sair do jogo)
+        Por padrão espera o bastante para uma requisição que chegue ao timeout
+        do cliente (e a sua repetição em uma conexão nova)
+        """
+        if timeout is None:
+            timeout = 2 * self.client.timeout + 1.0
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'kiosk_id': self.kiosk_id,
+            'online': self.online,
+            'pending': self.pending_count(),
+            'sent': self.sent,
+            'batches_sent': self.batches_sent,
+            'pulls': self.pulls,
+            'merged': self.merged,
+            'connections': self.client.connections,
+            'requests': self.client.requests,
+            'outbox_saved': self.outbox_saved,
+            'last_error': repr(self.last_error) if self.last_error else None,
+        }
+
+
+# --- SERVIÇO LOCAL DE TESTE ---
+
+class LeaderboardService:
+    """
+    Estado do serviço substituto: todas as entradas recebidas, sem repetir IDs
+    (reenvios de um lote cuja resposta se perdeu são ignorados), em ordem de
+    score (empate: a mais antiga primeiro)
+    """
+    def __init__(self):
+        self._keys = []
+        self._entries = []
+        self._ids = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def add(self, entries):
+        accepted = 0
+        with self._lock:
+            for entry in entries:
+                if entry['id'] in self._ids:
+                    self.duplicates += 1
+                    continue
+                self._ids.add(entry['id'])
+                key = (-entry['score'], self._seq)
+                self._seq += 1
+                index = bisect.bisect(self._keys, key)
+                self._keys.insert(index, key)
+                self._entries.insert(index, entry)
+                accepted += 1
+        return accepted
+
+    def top(self, limit):
+        with self._lock:
+            return self._entries[:limit]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _LeaderboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Mantém a conexão aberta entre as requisições
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if self.server.failing:
+            return self._reply(503, {'error': 'indisponível'})
+        if parts.path != "/top":
+            return self._reply(404, {'error': 'não encontrado'})
+        try:
+            limit = int(parse_qs(parts.query).get('limit', [MAX_RANKING_ENTRIES])[0])
+        except ValueError:
+            return self._reply(400, {'error': 'limit inválido'})
+        self._reply(200, {'entries': self.server.service.top(max(0, limit))})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if self.server.failing:
+            return self._reply(503, {'error': 'indisponível'})
+        if urlsplit(self.path).path != "/entries":
+            return self._reply(404, {'error': 'não encontrado'})
+        try:
+            entries = json.loads(body)['entries']
+            accepted = self.server.service.add(entries)
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return self._reply(400, {'error': 'lote inválido'})
+        self.server.batches += 1
+        self._reply(200, {'accepted': accepted})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP do serviço substituto (uma thread por conexão)
+    `failing` faz todas as requisições responderem 503 (serviço fora do ar);
+    stop() também derruba as conexões persistentes abertas
+    """
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), service=None):
+        super().__init__(address, _LeaderboardHandler)
+        self.service = service if service is not None else LeaderboardService()
+        self.failing = False
+        self.connections = 0
+        self.batches = 0
+        self._open = set()
+        self._open_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        with self._open_lock:
+            self.connections += 1
+            self._open.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._open_lock:
+            self._open.discard(request)
+        super().shutdown_request(request)
+
+    def start(self):
+        """Atende em uma thread em segundo plano (retorna o próprio servidor)"""
+        self._thread = threading.Thread(target=self.serve_forever, name="leaderboard-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        with self._open_lock:
+            for request in self._open:
+                try:
+                    request.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        if self._thread:
+            self._thread.join()
+
+
+def open_ranking_sync(url, kiosk_id=None, outbox_path=OUTBOX_FILE, durable=True):
+    """Cria a sincronização com o serviço em `url` usando a caixa de saída padrão"""
+    return RankingSync(LeaderboardClient(url), Outbox(outbox_path, durable), kiosk_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço local de leaderboard para testar a sincronização")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = LeaderboardServer((args.host, args.port))
+    print(f"Leaderboard em {server.url} (Ctrl+C para sair)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
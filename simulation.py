@@ -0,0 +1,243 @@
+"""
+Módulo da simulação em thread separada (modo opcional)
+A lógica do Game roda em uma thread com taxa fixa e publica, a cada passo, um
+snapshot imutável do estado; a thread de renderização desenha apenas a partir
+do snapshot mais recente e envia os comandos do jogador por uma fila
+"""
+import threading
+import time
+from collections import deque
+
+from game import Game
+from structures import decode_code
+
+SIMULATION_RATE_HZ = 60
+SNAPSHOT_MAX_COMPONENTS = 32  # Componentes do robô selecionado copiados no snapshot
+
+
+class ComponentView:
+    """Cópia imutável de um Component"""
+    __slots__ = ('name', 'code')
+
+    def __init__(self, component):
+        self.name = component.name
+        self.code = component.code
+
+    @property
+    def replacement_code(self):
+        return decode_code(self.code)
+
+
+class ComponentStackView:
+    """Cópia (parcial) de uma ComponentStack: os itens do topo e o tamanho total"""
+    __slots__ = ('items', 'size')
+
+    def __init__(self, items, size):
+        self.items = items
+        self.size = size
+
+    def peek(self):
+        return self.items[0] if self.items else None
+
+    def is_empty(self):
+        return self.size == 0
+
+    def get_all(self, limit=None):
+        return self.items if limit is None else self.items[:limit]
+
+    def __len__(self):
+        return self.size
+
+
+class RobotView:
+    """Cópia imutável de um Robot (com a mesma interface usada pela GUI)"""
+    __slots__ = ('id', 'model_name', 'priority', 'components')
+
+    def __init__(self, robot, with_components=False):
+        self.id = robot.id
+        self.model_name = robot.model_name
+        self.priority = robot.priority
+        items = ()
+        if with_components:
+            items = tuple(ComponentView(component)
+                          for component in robot.components.get_all(SNAPSHOT_MAX_COMPONENTS))
+        self.components = ComponentStackView(items, len(robot.components))
+
+    def get_top_component(self):
+        return self.components.peek()
+
+    def is_repaired(self):
+        return self.components.is_empty()
+
+
+class QueueWindowView:
+    """
+    Janela da fila de reparo copiada no snapshot
+    Responde a len() e iter_range() como a RobotLinkedList, dentro da janela copiada
+    """
+    __slots__ = ('first', 'rows', 'size')
+
+    def __init__(self, first, rows, size):
+        self.first = first
+        self.rows = rows
+        self.size = size
+
+    def iter_range(self, start, count):
+        offset = start - self.first
+        if offset < 0:
+            return iter(())
+        return iter(self.rows[offset:offset + count])
+
+    def is_empty(self):
+        return self.size == 0
+
+    def __len__(self):
+        return self.size
+
+
+class GameSnapshot:
+    """
+    Estado do jogo em um instante, somente leitura
+    Tem os atributos e métodos do Game que a GUI lê para desenhar
+    """
+    def __init__(self, game, queue_window, now, commands_applied=0):
+        first, count = queue_window
+        rows = tuple(RobotView(robot) for robot in game.robots.iter_range(first, count))
+        self.robots = QueueWindowView(first, rows, len(game.robots))
+
+        selected = game.get_selected_robot()
+        self.selected_robot = RobotView(selected, with_components=True) if selected else None
+        self.selected_robot_id = game.selected_robot_id
+
+        self.robots_fixed = game.robots_fixed
+        self.components_replaced = game.components_replaced
+        self.final_score = game.final_score
+        self.max_robots = game.max_robots
+        self.message = game.message
+        self.game_over = game.game_over
+        self.game_won = game.game_won
+        self.time_left = game.get_time_left()
+        self.elapsed_time = game.get_elapsed_time()
+        self.total_time_played = game.get_total_time_played()
+        self.created_at = now
+        # Quantos comandos da GUI já estavam aplicados quando o snapshot foi tirado
+        self.commands_applied = commands_applied
+
+    def get_selected_robot(self):
+        return self.selected_robot
+
+    def get_time_left(self):
+        return self.time_left
+
+    def get_elapsed_time(self):
+        return self.elapsed_time
+
+    def get_total_time_played(self):
+        return self.total_time_played
+
+
+class SnapshotBuffer:
+    """
+    Buffer duplo de snapshots: o escritor preenche o slot de trás e troca o índice
+    da frente; o leitor sempre obtém um snapshot completo, sem locks
+    """
+    def __init__(self, snapshot):
+        self._slots = [snapshot, snapshot]
+        self._front = 0
+
+    def publish(self, snapshot):
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        self._front = back
+
+    def front(self):
+        return self._slots[self._front]
+
+
+class SimulationThread:
+    """
+    Executa o Game em uma thread com taxa fixa
+    Comandos (select_robot, validate_code, start_game, reset) chegam por uma
+    deque (append/popleft são atômicos) e são aplicados no início de cada passo
+    O tempo vem do relógio do Game (game.clock), então um relógio falso também
+    controla o modo com thread. Uma exceção em um comando ou passo encerra a
+    thread e fica em `error`; check() a relança na thread da interface
+    """
+    def __init__(self, game, rate_hz=SIMULATION_RATE_HZ):
+        self.game = game
+        self.rate_hz = rate_hz
+        # Janela da fila (primeira linha, quantidade) que a renderização quer exibir
+        self.queue_window = (0, 0)
+        self.steps = 0
+        self.commands_posted = 0
+        self.commands_applied = 0
+        self.error = None
+        self._commands = deque()
+        self._buffer = SnapshotBuffer(GameSnapshot(game, self.queue_window, game.clock()))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def post(self, command, *args):
+        """Enfileira um comando do jogador (chamado pela thread da interface)"""
+        self.commands_posted += 1
+        self._commands.append((command, args))
+
+    def latest(self):
+        """Snapshot mais recente publicado"""
+        return self._buffer.front()
+
+    def check(self):
+        """Relança na thread que chamou a exceção que encerrou a simulação (se houver)"""
+        if self.error is not None:
+            raise RuntimeError("a thread da simulação parou com um erro") from self.error
+
+    def is_current(self, snapshot):
+        """Indica se o snapshot já reflete todos os comandos enviados pela GUI"""
+        return snapshot.commands_applied >= self.commands_posted
+
+    def _apply(self, command, args):
+        if command == "reset":
+            self.game = Game(self.game.clock, self.game.pools, self.game.config)
+            self.game.selected_robot_id = None
+        else:
+            getattr(self.game, command)(*args)
+
+    def step(self, now):
+        """Um passo da simulação: comandos, atualização e publicação do snapshot"""
+        while self._commands:
+            command, args = self._commands.popleft()
+            self._apply(command, args)
+            self.commands_applied += 1
+        # O snapshot é copiado com o lock: técnicos em outras threads podem estar
+        # alterando a fila ao mesmo tempo
+        with self.game.lock:
+            self.game.update(now)
+            snapshot = GameSnapshot(self.game, self.queue_window, now, self.commands_applied)
+        self._buffer.publish(snapshot)
+        self.steps += 1
+
+    def _run(self):
+        interval = 1.0 / self.rate_hz
+        next_step = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                # self.game muda no "reset": o relógio é lido a cada passo
+                self.step(self.game.clock())
+            except Exception as e:
+                self.error = e
+                return
+            next_step += interval
+            delay = next_step - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Atrasado: não tenta compensar os passos perdidos de uma vez
+                next_step = time.perf_counter()
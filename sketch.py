@@ -0,0 +1,230 @@
+"""
+Módulo de estatísticas das partidas em memória constante
+Cada partida encerrada (score, robôs consertados e tempo) entra em sketches de
+quantis KLL persistidos em disco; a tela de fim de jogo consulta a posição do
+score entre todas as partidas já jogadas sem reler nenhum histórico
+"""
+import json
+import math
+import os
+import queue
+import random
+import threading
+import time
+
+from ranking import FSYNC_POLICIES, WRITER_COALESCE_SECONDS, atomic_write_json
+
+SESSION_STATS_FILE = "session_stats.json"
+SESSION_METRICS = ("score", "robots_fixed", "time")
+KLL_K = 200  # Tamanho do nível mais alto (erro de posição de ~1%)
+
+
+class KLLSketch:
+    """
+    Sketch de quantis em fluxo (KLL: Karnin, Lang e Liberty)
+    O nível h guarda valores com peso 2^h; quando um nível enche, ele é ordenado
+    e metade dos itens (as posições pares ou as ímpares, ao acaso) sobe para o
+    nível seguinte. A memória fica em ~3k valores, não importa quantos entraram
+    """
+    def __init__(self, k=KLL_K, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self._stored = 0
+        self._limit = self._max_size()
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level):
+        # Os níveis mais baixos têm capacidade menor (fator 2/3 por nível)
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _max_size(self):
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        self._stored += 1
+        if self._stored >= self._limit:
+            self._compress()
+
+    def _compress(self):
+        for level in range(len(self.levels)):
+            items = self.levels[level]
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self._limit = self._max_size()
+            items.sort()
+            # Com uma quantidade ímpar, o maior item permanece no nível
+            keep = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self._rng.randrange(2)::2])
+            self.levels[level] = keep
+            self._stored -= len(items) // 2
+            if self._stored < self._limit:
+                break
+
+    def rank(self, value):
+        """Peso estimado dos valores estritamente menores que `value`"""
+        return sum(sum(1 for item in items if item < value) << level
+                   for level, items in enumerate(self.levels))
+
+    def fraction_below(self, value):
+        """Fração estimada (0 a 1) dos valores inseridos menores que `value`"""
+        if not self.count:
+            return 0.0
+        return min(1.0, self.rank(value) / self.count)
+
+    def as_dict(self):
+        return {'k': self.k, 'count': self.count, 'levels': self.levels}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        sketch.levels = [list(items) for items in data['levels']] or [[]]
+        sketch._stored = sum(len(items) for items in sketch.levels)
+        sketch._limit = sketch._max_size()
+        return sketch
+
+
+class SessionStats:
+    """Sketches de todas as partidas encerradas (um por métrica), gravados em JSON"""
+    def __init__(self, path=SESSION_STATS_FILE, k=KLL_K):
+        self.path = path
+        self.sketches = {metric: KLLSketch(k) for metric in SESSION_METRICS}
+
+    @classmethod
+    def load(cls, path=SESSION_STATS_FILE):
+        """Lê o arquivo de estatísticas (um arquivo ausente ou inválido recomeça do zero)"""
+        stats = cls(path)
+        if not os.path.exists(path):
+            return stats
+        with open(path, 'r') as f:
+            try:
+                data = json.load(f)
+                for metric in SESSION_METRICS:
+                    if metric in data:
+                        stats.sketches[metric] = KLLSketch.from_dict(data[metric])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                stats = cls(path)
+        return stats
+
+    @property
+    def sessions(self):
+        return self.sketches['score'].count
+
+    def record(self, score, robots_fixed, time_played):
+        """
+        Adiciona uma partida encerrada
+        Retorna a fração das partidas anteriores com score menor (None na primeira)
+        """
+        better_than = self.sketches['score'].fraction_below(score) if self.sessions else None
+        self.sketches['score'].add(score)
+        self.sketches['robots_fixed'].add(robots_fixed)
+        self.sketches['time'].add(round(time_played, 2))
+        return better_than
+
+    def as_dict(self):
+        return {metric: sketch.as_dict() for metric, sketch in self.sketches.items()}
+
+    def save(self, durable=True):
+        atomic_write_json(self.path, self.as_dict(), durable, prefix=".session-stats-")
+
+
+class SessionStatsWriter:
+    """
+    Estatísticas das partidas com a leitura e as gravações em uma thread
+    (como o RankingWriter): o arquivo é lido em segundo plano logo na criação e
+    record() só atualiza os sketches em memória e pede uma gravação, então o
+    fim de jogo nunca espera o disco. Uma partida encerrada antes de a leitura
+    terminar é registrada pela thread logo depois dela (record() retorna None)
+    """
+    _STOP = object()
+
+    def __init__(self, path=SESSION_STATS_FILE, fsync_policy="always", coalesce_seconds=WRITER_COALESCE_SECONDS):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconhecida: {fsync_policy}")
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.coalesce_seconds = coalesce_seconds
+        self.stats = None
+        self.saves = 0
+        self.last_error = None
+        self._unsynced = False  # Alguma gravação sem fsync desde a última sincronizada
+        # Protege os sketches (a gravação no disco acontece fora do lock)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="session-stats", daemon=True)
+        self._thread.start()
+
+    @property
+    def loaded(self):
+        return self.stats is not None
+
+    def record(self, score, robots_fixed, time_played):
+        """
+        Registra uma partida encerrada e agenda a gravação (retorna imediatamente)
+        Retorna a fração das partidas anteriores com score menor (None na
+        primeira partida ou se o arquivo ainda está sendo lido)
+        """
+        with self._lock:
+            if self.stats is None:
+                self._queue.put((score, robots_fixed, time_played))
+                return None
+            better_than = self.stats.record(score, robots_fixed, time_played)
+        self._queue.put(None)
+        return better_than
+
+    def _run(self):
+        try:
+            stats = SessionStats.load(self.path)
+        except OSError as e:
+            self.last_error = e
+            print(f"Erro ao ler as estatísticas das partidas: {e}")
+            stats = SessionStats(self.path)
+        with self._lock:
+            self.stats = stats
+
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Agrupa gravações seguidas em uma só
+            if batch[0] is not self._STOP and self.coalesce_seconds:
+                time.sleep(self.coalesce_seconds)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = self._STOP in batch
+            with self._lock:
+                # Partidas encerradas enquanto o arquivo era lido
+                for item in batch:
+                    if isinstance(item, tuple):
+                        stats.record(*item)
+                data = stats.as_dict()
+            if any(item is not self._STOP for item in batch):
+                durable = self.fsync_policy == "always" or (stopping and self.fsync_policy == "on_exit")
+                self._save(data, durable)
+            elif stopping and self._unsynced and self.fsync_policy == "on_exit":
+                # Nada novo ao sair, mas as gravações anteriores não foram sincronizadas
+                self._save(data, True)
+
+    def _save(self, data, durable):
+        try:
+            atomic_write_json(self.path, data, durable, prefix=".session-stats-")
+            self.saves += 1
+            self._unsynced = not durable
+        except OSError as e:
+            # Não derruba a thread: a próxima gravação leva os sketches inteiros
+            self.last_error = e
+            print(f"Erro ao gravar as estatísticas das partidas: {e}")
+
+    def close(self, timeout=5.0):
+        """Grava o que estiver pendente e encerra a thread (chamado ao sair do jogo)"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
@@ -0,0 +1,241 @@
+"""
+Módulo do solucionador de jogo ótimo (limite superior de pontuação)
+Dada a sequência de robôs de uma partida (random.seed) e a velocidade do
+jogador, calcula por programação dinâmica a ordem de reparo que maximiza o
+score dentro do limite de tempo, respeitando o spawn e o limite de robôs na
+fila do Game.update. Serve de teto para comparar partidas reais e bots
+"""
+import random
+import time
+
+from config import GameConfig
+
+
+class PlayerModel:
+    """
+    Velocidade do jogador: segundos para digitar cada código (um componente) e o
+    custo de interromper um robô inacabado para trabalhar em outro (selecionar
+    outro robô e ler o código dele)
+    """
+    def __init__(self, seconds_per_component=2.0, switch_seconds=0.0):
+        if seconds_per_component <= 0 or switch_seconds < 0:
+            raise ValueError("velocidade do jogador inválida")
+        self.seconds_per_component = seconds_per_component
+        self.switch_seconds = switch_seconds
+
+
+def spawn_stream(seed, config=None):
+    """
+    Robôs (prioridade, componentes) na ordem em que uma partida iniciada com
+    `random.seed(seed)`, Game(config) e start_game() os gera; o robô de ID n é
+    o item n - 1. Contém todos os robôs que cabem no limite de tempo
+    """
+    from game import Game
+
+    config = config or GameConfig()
+    if config.endless:
+        raise ValueError("o solucionador precisa de um limite de tempo")
+    count = config.initial_robots + int(config.time_limit // config.spawn_interval)
+    # Mesmos sorteios de uma partida real: os robôs do Game() e os do start_game()
+    random.seed(seed)
+    game = Game(clock=lambda: 0.0, config=config.replace(max_robots=max(count, config.initial_robots)))
+    game.start_game()
+    for _ in range(count - config.initial_robots):
+        game._generate_new_robot(game.robot_id_counter, sort=False)
+        game.robot_id_counter += 1
+    return [(robot.priority, robot.components.size)
+            for robot in sorted(game.robots.get_all(), key=lambda robot: robot.id)]
+
+
+def _ms(seconds):
+    return int(round(seconds * 1000))
+
+
+class Solver:
+    """
+    Programação dinâmica sobre os estados da partida, com tabela de transposição
+    O estado é (tempo, próximo spawn, próximo robô da sequência, robô em
+    andamento, fila); cada robô na fila é só um inteiro (componentes restantes e
+    prioridade) e a fila é uma tupla ordenada, então filas com os mesmos robôs em
+    outra ordem caem na mesma entrada da tabela. Os tempos são inteiros em ms
+
+    A cada decisão o jogador digita um código de qualquer robô da fila: o
+    Game.update volta a seleção para o primeiro da fila, mas um clique no robô
+    seguido do Enter no mesmo frame repara qualquer um (PlayerModel.switch_seconds
+    é o custo dessa troca). Ficar parado nunca aumenta o score, então o jogador
+    só espera quando a fila está vazia
+    """
+    def __init__(self, stream, config=None, player=None):
+        config = config or GameConfig()
+        if config.endless:
+            raise ValueError("o solucionador precisa de um limite de tempo")
+        player = player or PlayerModel()
+        self.config = config
+        self.priorities = list(config.priority_points)
+        self.points = [config.priority_points[priority] for priority in self.priorities]
+        self.bonus = config.robot_bonus
+        self.stream = [self._encode(self.priorities.index(priority), components)
+                       for priority, components in stream]
+        self.limit = _ms(config.time_limit)
+        self.interval = _ms(config.spawn_interval)
+        self.max_robots = config.max_robots
+        self.step = _ms(player.seconds_per_component)
+        self.switch = _ms(player.switch_seconds)
+        self.table = {}   # estado -> (melhor score futuro, robô escolhido)
+        self.states = 0   # Estados expandidos
+        self.hits = 0     # Consultas resolvidas pela tabela
+        self.elapsed = 0.0
+
+    # Robô compacto: componentes restantes * número de prioridades + índice da prioridade
+    def _encode(self, priority_index, remaining):
+        return remaining * len(self.priorities) + priority_index
+
+    def _priority(self, robot):
+        return robot % len(self.priorities)
+
+    def _remaining(self, robot):
+        return robot // len(self.priorities)
+
+    def _spawn(self, until, inclusive, next_spawn, index, size):
+        """
+        Tentativas de spawn até `until`, como no Game.update: com a fila cheia a
+        tentativa é perdida e a próxima fica um intervalo depois
+        Retorna (próximo spawn, próximo robô da sequência)
+        """
+        stream_size = len(self.stream)
+        while next_spawn < until or (inclusive and next_spawn == until):
+            if size < self.max_robots and index < stream_size:
+                index += 1
+                size += 1
+            next_spawn += self.interval
+        return next_spawn, index
+
+    def initial_state(self):
+        initial = self.config.initial_robots
+        queue = tuple(sorted(self.stream[:initial]))
+        next_spawn, index = self._spawn(0, True, self.interval, initial, len(queue))
+        queue = tuple(sorted(queue + tuple(self.stream[initial:index])))
+        return (0, next_spawn, index, None, queue)
+
+    def solve(self):
+        """Calcula o melhor score possível a partir do início da partida"""
+        start = time.perf_counter()
+        best = self._best(self.initial_state())
+        self.elapsed += time.perf_counter() - start
+        return best
+
+    def _best(self, state):
+        entry = self.table.get(state)
+        if entry is not None:
+            self.hits += 1
+            return entry[0]
+        self.states += 1
+        now, next_spawn, index, current, queue = state
+
+        if current is None and not queue:
+            # Fila vazia: espera o próximo spawn
+            best, choice = 0, None
+            if next_spawn <= self.limit and index < len(self.stream):
+                best = self._best(self._settle(next_spawn, next_spawn, index, None, ()))
+        else:
+            best, choice = 0, None
+            candidates = set(queue)
+            if current is not None:
+                candidates.add(current)
+            for robot in candidates:
+                move = self._move(state, robot)
+                if move is None:
+                    continue
+                value = move[0] + self._best(move[1])
+                if value > best:
+                    best, choice = value, robot
+        self.table[state] = (best, choice)
+        return best
+
+    def _move(self, state, robot):
+        """
+        Digita um código de `robot` (um dos robôs da fila)
+        Retorna (pontos, estado seguinte) ou None se não dá tempo
+        """
+        now, next_spawn, index, current, queue = state
+        switching = current is not None and robot != current
+        done = now + self.step + (self.switch if switching else 0)
+        if done > self.limit:
+            return None
+
+        others = list(queue)
+        if current is not None:
+            others.append(current)
+        others.remove(robot)
+        # Os spawns durante a digitação ainda contam o robô na fila
+        next_spawn, spawned = self._spawn(done, False, next_spawn, index, len(others) + 1)
+        others += self.stream[index:spawned]
+
+        gain = self.points[self._priority(robot)]
+        if self._remaining(robot) == 1:
+            gain += self.bonus
+            working = None
+        else:
+            working = robot - len(self.priorities)
+        return gain, self._settle(done, next_spawn, spawned, working, others)
+
+    def _settle(self, now, next_spawn, index, working, others):
+        """Estado canônico: aplica os spawns do instante `now` e ordena a fila"""
+        spawned_from = index
+        size = len(others) + (working is not None)
+        next_spawn, index = self._spawn(now, True, next_spawn, index, size)
+        others = list(others) + self.stream[spawned_from:index]
+        if not self.switch and working is not None:
+            # Sem custo de troca o robô em andamento é igual aos outros da fila
+            others.append(working)
+            working = None
+        return (now, next_spawn, index, working, tuple(sorted(others)))
+
+    def plan(self):
+        """
+        Sequência ótima de reparos como IDs de robôs (um item por código digitado),
+        reconstruída a partir da tabela
+        """
+        self.solve()
+        state = self.initial_state()
+        # Robôs concretos na fila: código compacto -> IDs (o ID n é o item n - 1 da sequência)
+        present = {}
+        for robot_id in range(1, state[2] + 1):
+            present.setdefault(self.stream[robot_id - 1], []).append(robot_id)
+        steps = []
+        current_id = None
+        while True:
+            if state not in self.table:
+                self._best(state)
+            value, robot = self.table[state]
+            index = state[2]
+            if robot is None:
+                if value == 0:
+                    return steps
+                # Fila vazia: o próximo estado é o do próximo spawn
+                next_spawn = state[1]
+                state = self._settle(next_spawn, next_spawn, index, None, ())
+            else:
+                # Mantém o mesmo robô concreto quando ele tem o código escolhido
+                ids = present[robot]
+                robot_id = current_id if current_id in ids else ids[0]
+                ids.remove(robot_id)
+                steps.append(robot_id)
+                state = self._move(state, robot)[1]
+                if self._remaining(robot) == 1:
+                    current_id = None
+                else:
+                    current_id = robot_id
+                    present.setdefault(robot - len(self.priorities), []).append(robot_id)
+            for robot_id in range(index + 1, state[2] + 1):
+                present.setdefault(self.stream[robot_id - 1], []).append(robot_id)
+
+    def stats(self):
+        lookups = self.states + self.hits
+        return {
+            'states': self.states,
+            'table_size': len(self.table),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'states_per_s': self.states / self.elapsed if self.elapsed else 0.0,
+            'elapsed_s': self.elapsed,
+        }
@@ -2,8 +2,58 @@
 Módulo de estruturas de dados manuais
 Implementa lista encadeada para robôs e pilha encadeada para componentes
 """
+import bisect
+import heapq
 import random
 import string
+import time
+
+
+# Distância (em nós) entre os pontos de verificação do índice posicional
+INDEX_STRIDE = 64
+
+# Tamanho dos blocos da ordem de atendimento mantida pela RepairQueue (um bloco
+# é dividido ao passar do dobro)
+ORDER_BLOCK_SIZE = 1024
+
+# Nível de cada prioridade (0 = mais urgente)
+PRIORITY_LEVELS = {"emergência": 0, "padrão": 1, "baixo risco": 2}
+
+# Códigos de substituição: 4 caracteres em base 36 (0-9, A-Z) empacotados em um
+# inteiro de 21 bits (36^4 = 1.679.616 < 2^21)
+CODE_LENGTH = 4
+CODE_ALPHABET = string.digits + string.ascii_uppercase
+CODE_SPACE = len(CODE_ALPHABET) ** CODE_LENGTH
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def encode_code(text):
+    """
+    Converte o código digitado no inteiro empacotado (sem diferenciar maiúsculas)
+    Retorna None se o texto não for um código válido
+    """
+    if len(text) != CODE_LENGTH or not text.isascii() or not text.isalnum():
+        return None
+    return int(text, 36)
+
+
+def mix64(value):
+    """Embaralhamento do SplitMix64: inteiro de 64 bits bem distribuído a partir de outro"""
+    value = (value + GOLDEN_GAMMA) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def decode_code(packed):
+    """Texto do código empacotado (apenas para exibição)"""
+    chars = []
+    for _ in range(CODE_LENGTH):
+        packed, digit = divmod(packed, 36)
+        chars.append(CODE_ALPHABET[digit])
+    return ''.join(reversed(chars))
 
 
 class Node:
@@ -12,24 +62,64 @@ class Node:
         self.data = data
         self.next = None
 
+    def reset(self, data):
+        """Reinicializa um nó reaproveitado do pool"""
+        self.data = data
+        self.next = None
+
+
+class FreeList:
+    """
+    Lista livre de objetos reaproveitáveis (pool)
+    acquire() devolve um objeto liberado antes, reinicializado com reset(*args),
+    ou cria um novo com factory(*args); release() guarda o objeto até `capacity`
+    """
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self._free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        if len(self._free) < self.capacity:
+            self._free.append(obj)
+
+    def __len__(self):
+        """Quantidade de objetos livres no pool"""
+        return len(self._free)
+
 
 # --- CLASSE COMPONENT (Adicionada/Corrigida para Alfanumérico) ---
 class Component:
     """Representa um único componente com falha em um robô."""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, code=None):
         self.name = name
-        # A geração agora usa caracteres alfanuméricos
-        self.replacement_code = self._generate_alphanumeric_code(4) 
+        # Código alfanumérico empacotado (ver encode_code), sorteado direto do RNG
+        # quando não é informado
+        self.code = random.randrange(CODE_SPACE) if code is None else code
+
+    def reset(self, name: str, code=None):
+        """Reinicializa um componente reaproveitado do pool (com um novo código)"""
+        self.__init__(name, code)
 
-    def _generate_alphanumeric_code(self, length: int) -> str:
+    @property
+    def replacement_code(self) -> str:
         """
-        Gera uma string alfanumérica aleatória (letras maiúsculas e dígitos).
+        Código em texto, para exibição (letras maiúsculas e dígitos).
         Ex: 'A8Z4' ou '123B'
         """
-        # Combina todas as letras maiúsculas (A-Z) e todos os dígitos (0-9)
-        characters = string.ascii_uppercase + string.digits
-        return ''.join(random.choice(characters) for _ in range(length))
+        return decode_code(self.code)
 
     def __str__(self):
         return f"{self.name} (Code: {self.replacement_code})"
@@ -39,49 +129,150 @@ class Component:
 # -----------------------------------------------------------------
 
 
+class LazyComponents:
+    """
+    Entrada preguiçosa da ComponentStack: `count` componentes ainda não criados,
+    guardados só como uma contagem e uma semente
+    O componente de posição i (a partir do topo da entrada) tem nome e código
+    derivados apenas de (semente, i), então o resultado é o mesmo qualquer que
+    seja o momento (ou a ordem) em que ele é criado
+    """
+    __slots__ = ("count", "seed", "index", "names", "factory")
+
+    def __init__(self, count, seed, names, factory=Component):
+        self.count = count
+        self.seed = seed
+        self.index = 0
+        self.names = names
+        self.factory = factory
+
+    def take(self):
+        """Cria o próximo componente (o do topo da entrada)"""
+        mixed = mix64(self.seed + self.index * GOLDEN_GAMMA)
+        self.index += 1
+        self.count -= 1
+        return self.factory(self.names[mixed % len(self.names)], (mixed >> 32) % CODE_SPACE)
+
+
 class ComponentStack:
     """
     Pilha encadeada manual para componentes de robôs
     Implementa LIFO (Last In, First Out)
+    Com `node_pool`, os nós vêm de uma FreeList e voltam a ela no pop
+    Um nó pode guardar uma LazyComponents (vários componentes ainda não
+    criados): o componente só é criado quando chega ao topo ou é listado
     """
-    def __init__(self):
+    def __init__(self, node_pool=None):
+        self.top = None
+        self.size = 0
+        self.node_pool = node_pool
+    
+    def reset(self):
+        """Esvazia uma pilha reaproveitada do pool"""
         self.top = None
         self.size = 0
     
+    def _new_node(self, data):
+        return self.node_pool.acquire(data) if self.node_pool is not None else Node(data)
+
     def push(self, component):
         """Adiciona um componente no topo da pilha"""
-        new_node = Node(component)
+        new_node = self._new_node(component)
         new_node.next = self.top
         self.top = new_node
         self.size += 1
-    
+
+    def push_lazy(self, count, seed, names, factory=Component):
+        """
+        Adiciona `count` componentes preguiçosos no topo (um único nó); nome e
+        código de cada um saem de `seed` e do catálogo `names` quando necessários
+        """
+        if count <= 0:
+            return
+        new_node = self._new_node(LazyComponents(count, seed, names, factory))
+        new_node.next = self.top
+        self.top = new_node
+        self.size += count
+
+    def _materialize(self, previous, node):
+        """
+        Cria o primeiro componente da entrada preguiçosa em `node` (precedido
+        por `previous`) e retorna o nó que passa a guardá-lo
+        """
+        entry = node.data
+        component = entry.take()
+        if entry.count == 0:
+            node.data = component
+            return node
+        new_node = self._new_node(component)
+        new_node.next = node
+        if previous is None:
+            self.top = new_node
+        else:
+            previous.next = new_node
+        return new_node
+
     def pop(self):
         """Remove e retorna o componente do topo da pilha"""
         if self.is_empty():
             return None
-        removed = self.top.data
-        self.top = self.top.next
+        if type(self.top.data) is LazyComponents:
+            self._materialize(None, self.top)
+        node = self.top
+        removed = node.data
+        self.top = node.next
         self.size -= 1
+        if self.node_pool is not None:
+            node.data = node.next = None
+            self.node_pool.release(node)
         return removed
     
     def peek(self):
         """Retorna o componente do topo sem removê-lo"""
         if self.is_empty():
             return None
+        if type(self.top.data) is LazyComponents:
+            self._materialize(None, self.top)
         return self.top.data
     
     def is_empty(self):
         """Verifica se a pilha está vazia"""
         return self.top is None
     
-    def get_all(self):
-        """Retorna todos os componentes da pilha (do topo para a base)"""
+    def get_all(self, limit=None):
+        """
+        Retorna os componentes da pilha (do topo para a base), no máximo `limit`;
+        os componentes preguiçosos listados são criados
+        """
         components = []
+        previous = None
         current = self.top
-        while current is not None:
+        while current is not None and (limit is None or len(components) < limit):
+            if type(current.data) is LazyComponents:
+                current = self._materialize(previous, current)
             components.append(current.data)
+            previous = current
             current = current.next
         return components
+
+    def discard(self):
+        """
+        Esvazia a pilha sem criar os componentes preguiçosos
+        Retorna os componentes que já tinham sido criados (para voltarem ao pool)
+        """
+        components = []
+        current = self.top
+        while current is not None:
+            node = current
+            current = node.next
+            if type(node.data) is not LazyComponents:
+                components.append(node.data)
+            if self.node_pool is not None:
+                node.data = node.next = None
+                self.node_pool.release(node)
+        self.top = None
+        self.size = 0
+        return components
     
     def __len__(self):
         """Retorna o tamanho da pilha"""
@@ -92,21 +283,30 @@ class RobotLinkedList:
     """
     Lista encadeada manual para robôs
     Implementa operações de inserção, remoção, busca e ordenação
+    Com `node_pool`, os nós vêm de uma FreeList e voltam a ela na remoção
     """
-    def __init__(self):
+    def __init__(self, node_pool=None):
         self.head = None
+        self.tail = None  # Último nó: append em O(1)
         self.size = 0
+        self.node_pool = node_pool
+        # Incrementado a cada alteração; invalida o índice posicional
+        self.version = 0
+        self._checkpoints = []
+        self._index_version = -1
+        # Estatísticas do índice (consultadas pelo profiler)
+        self.index_hits = 0
+        self.index_misses = 0
     
     def append(self, robot):
-        """Adiciona um robô no final da lista"""
-        new_node = Node(robot)
+        """Adiciona um robô no final da lista (O(1), pelo ponteiro de cauda)"""
+        self.version += 1
+        new_node = self.node_pool.acquire(robot) if self.node_pool is not None else Node(robot)
         if self.head is None:
             self.head = new_node
         else:
-            current = self.head
-            while current.next is not None:
-                current = current.next
-            current.next = new_node
+            self.tail.next = new_node
+        self.tail = new_node
         self.size += 1
     
     def remove(self, robot_id):
@@ -116,21 +316,35 @@ class RobotLinkedList:
         
         # Se for o primeiro nó
         if self.head.data.id == robot_id:
-            self.head = self.head.next
-            self.size -= 1
+            removed = self.head
+            self.head = removed.next
+            if self.head is None:
+                self.tail = None
+            self._release_node(removed)
             return True
         
         # Busca o robô na lista
         current = self.head
         while current.next is not None:
             if current.next.data.id == robot_id:
-                current.next = current.next.next
-                self.size -= 1
+                removed = current.next
+                current.next = removed.next
+                if removed is self.tail:
+                    self.tail = current
+                self._release_node(removed)
                 return True
             current = current.next
         
         return False
     
+    def _release_node(self, node):
+        """Contabiliza a remoção de um nó já desligado da lista (e o devolve ao pool)"""
+        self.size -= 1
+        self.version += 1
+        if self.node_pool is not None:
+            node.data = node.next = None
+            self.node_pool.release(node)
+    
     def find(self, robot_id):
         """Busca um robô pelo ID"""
         current = self.head
@@ -150,6 +364,43 @@ class RobotLinkedList:
             
         return robots
     
+    def _node_at(self, index):
+        """
+        Retorna o nó na posição `index` usando pontos de verificação a cada
+        INDEX_STRIDE nós. O índice é construído sob demanda e descartado
+        quando a lista muda, então consultas repetidas custam O(INDEX_STRIDE)
+        """
+        if index < 0 or index >= self.size:
+            return None
+        
+        if self._index_version != self.version:
+            self._checkpoints = [self.head]
+            self._index_version = self.version
+            self.index_misses += 1
+        else:
+            self.index_hits += 1
+        
+        # Estende o índice apenas até o ponto de verificação necessário
+        slot = index // INDEX_STRIDE
+        while len(self._checkpoints) <= slot:
+            node = self._checkpoints[-1]
+            for _ in range(INDEX_STRIDE):
+                node = node.next
+            self._checkpoints.append(node)
+        
+        node = self._checkpoints[slot]
+        for _ in range(index - slot * INDEX_STRIDE):
+            node = node.next
+        return node
+    
+    def iter_range(self, start, count):
+        """Percorre até `count` robôs a partir da posição `start` (sem copiar a lista)"""
+        current = self._node_at(start)
+        while current is not None and count > 0:
+            yield current.data
+            current = current.next
+            count -= 1
+    
     def sort_by_priority(self):
         """
         Ordena a lista por prioridade (emergência > padrão > baixo risco)
@@ -161,7 +412,7 @@ class RobotLinkedList:
         
         robots = self.get_all()
         # Mapeamento de prioridade para valores numéricos
-        priority_order = {"emergência": 0, "padrão": 1, "baixo risco": 2}
+        priority_order = PRIORITY_LEVELS
         
         # Algoritmo de Ordenação por Inserção no Array
         for i in range(1, len(robots)):
@@ -173,11 +424,16 @@ class RobotLinkedList:
                 j -= 1
             robots[j + 1] = key
         
-        # Reconstrói a lista encadeada com a nova ordem
-        self.head = None
-        self.size = 0
+        # Regrava os robôs nos nós existentes, na nova ordem (sem alocar nós)
+        current = self.head
         for robot in robots:
-            self.append(robot)
+            current.data = robot
+            current = current.next
+        self.version += 1
+    
+    def peek(self):
+        """Retorna o primeiro robô da fila (o próximo a ser reparado) ou None"""
+        return self.head.data if self.head is not None else None
     
     def is_empty(self):
         """Verifica se a lista está vazia"""
@@ -185,4 +441,284 @@ class RobotLinkedList:
     
     def __len__(self):
         """Retorna o tamanho da lista"""
-        return self.size
\ No newline at end of file
+        return self.size
+
+
+class SortedBlocks:
+    """
+    Lista ordenada dividida em blocos de até 2 * `block_size` itens, com o maior
+    item de cada bloco em `_maxes` (busca binária para achar o bloco) e uma
+    árvore de Fenwick com o tamanho dos blocos (para achar a posição `start`)
+    Inserção e remoção custam O(log n + block_size); a leitura de uma janela,
+    O(log n + count), não importa a profundidade. A árvore é refeita (O(n /
+    block_size)) só quando um bloco é dividido ou esvaziado
+    """
+    def __init__(self, block_size=ORDER_BLOCK_SIZE):
+        self.block_size = block_size
+        self._blocks = []
+        self._maxes = []
+        self._tree = None  # Fenwick (base 1) com o tamanho de cada bloco; None = a refazer
+        self.size = 0
+
+    def _tree_add(self, index, delta):
+        tree = self._tree
+        if tree is None:
+            return
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _build_tree(self):
+        tree = [0] + [len(block) for block in self._blocks]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _locate(self, position):
+        """(bloco, posição dentro dele) do item na posição `position`"""
+        if self._tree is None:
+            self._build_tree()
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = index + step
+            if following < len(tree) and tree[following] <= position:
+                index = following
+                position -= tree[following]
+            step >>= 1
+        return index, position
+
+    def insert(self, item):
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+            self._tree = None
+            self.size = 1
+            return
+        index = min(bisect.bisect_left(self._maxes, item), len(self._blocks) - 1)
+        block = self._blocks[index]
+        bisect.insort(block, item)
+        self._maxes[index] = block[-1]
+        if len(block) > 2 * self.block_size:
+            half = len(block) // 2
+            self._blocks[index:index + 1] = [block[:half], block[half:]]
+            self._maxes[index:index + 1] = [block[half - 1], block[-1]]
+            self._tree = None
+        else:
+            self._tree_add(index, 1)
+        self.size += 1
+
+    def remove(self, key):
+        """Remove o item que começa com `key` (uma tupla prefixo do item)"""
+        index = bisect.bisect_left(self._maxes, key)
+        block = self._blocks[index]
+        del block[bisect.bisect_left(block, key)]
+        if block:
+            self._maxes[index] = block[-1]
+            self._tree_add(index, -1)
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+            self._tree = None
+        self.size -= 1
+
+    def iter_range(self, start, count):
+        """Percorre até `count` itens a partir da posição `start`"""
+        if start >= self.size or count <= 0:
+            return
+        index, start = self._locate(start)
+        blocks = self._blocks
+        while count > 0 and index < len(blocks):
+            window = blocks[index][start:start + count]
+            yield from window
+            count -= len(window)
+            start = 0
+            index += 1
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def __len__(self):
+        return self.size
+
+
+class RepairQueue:
+    """
+    Fila de reparo em heap mínimo indexado, com envelhecimento de prioridade
+    A chave de cada robô é (nível efetivo, ordem de chegada): o nível começa na
+    prioridade do robô e sobe um degrau a cada `aging_interval` segundos de
+    espera, até o de emergência, para que nenhum robô espere para sempre.
+    As promoções vencidas só são aplicadas quando a fila é consultada ou
+    alterada (decrease-key, O(log n) cada)
+    Inserção, remoção e decrease-key custam O(log n); busca por ID, O(1).
+    A ordem de atendimento completa é mantida junto com o heap (SortedBlocks),
+    então ler uma janela da fila (a rolagem da GUI) não reordena nada, por mais
+    fundo que ela esteja ou por mais que a fila mude a cada frame
+    Tem a mesma interface da RobotLinkedList usada pelo Game e pela GUI
+    """
+    def __init__(self, clock=time.time, aging_interval=None):
+        self.clock = clock
+        self.aging_interval = aging_interval
+        # Entradas [nível efetivo, ordem de chegada, robô]; como a ordem de chegada é
+        # única, a comparação entre listas nunca chega a comparar os robôs
+        self._heap = []
+        self._slots = {}       # ID do robô -> posição da entrada no heap
+        self._promotions = []  # Heap de (instante, ordem de chegada, ID) da próxima promoção
+        self._seq = 0
+        # (nível efetivo, ordem de chegada, robô) em ordem de atendimento
+        self._order = SortedBlocks()
+        # Incrementado a cada alteração
+        self.version = 0
+        # Leituras da ordem de atendimento (consultadas pelo profiler; mantida
+        # a cada alteração, ela nunca precisa ser refeita: sem falhas)
+        self.index_hits = 0
+        self.index_misses = 0
+
+    # --- OPERAÇÕES DO HEAP ---
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._slots[heap[i][2].id] = i
+        self._slots[heap[j][2].id] = j
+
+    def _sift_up(self, index):
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[index] >= heap[parent]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child] < heap[smallest]:
+                    smallest = child
+            if smallest == index:
+                return
+            self._swap(index, smallest)
+            index = smallest
+
+    def _remove_at(self, index):
+        heap = self._heap
+        self._order.remove((heap[index][0], heap[index][1]))
+        last = heap.pop()
+        if index < len(heap):
+            del self._slots[heap[index][2].id]
+            heap[index] = last
+            self._slots[last[2].id] = index
+            self._sift_down(index)
+            self._sift_up(index)
+        else:
+            del self._slots[last[2].id]
+        self.version += 1
+
+    def decrease_key(self, robot_id, level):
+        """Sobe o robô para o nível `level` (menor = mais urgente)"""
+        index = self._slots[robot_id]
+        entry = self._heap[index]
+        if level < entry[0]:
+            self._order.remove((entry[0], entry[1]))
+            self._order.insert((level, entry[1], entry[2]))
+            entry[0] = level
+            self._sift_up(index)
+            self.version += 1
+
+    def _apply_aging(self):
+        """Aplica as promoções cujo instante já passou"""
+        promotions = self._promotions
+        if not promotions:
+            return
+        now = self.clock()
+        while promotions and promotions[0][0] <= now:
+            due, seq, robot_id = heapq.heappop(promotions)
+            index = self._slots.get(robot_id)
+            if index is None or self._heap[index][1] != seq:
+                continue  # O robô já saiu da fila
+            level = self._heap[index][0] - 1
+            self.decrease_key(robot_id, level)
+            if level > 0:
+                heapq.heappush(promotions, (due + self.aging_interval, seq, robot_id))
+
+    # --- INTERFACE DA FILA ---
+
+    def append(self, robot):
+        """Insere um robô na fila (O(log n))"""
+        level = PRIORITY_LEVELS.get(robot.priority, len(PRIORITY_LEVELS))
+        seq = self._seq
+        self._seq += 1
+        self._heap.append([level, seq, robot])
+        self._order.insert((level, seq, robot))
+        self._slots[robot.id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        if self.aging_interval and level > 0:
+            heapq.heappush(self._promotions, (self.clock() + self.aging_interval, seq, robot.id))
+        self.version += 1
+
+    def peek(self):
+        """Retorna o robô mais urgente (o próximo a ser reparado) ou None"""
+        self._apply_aging()
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self):
+        """Remove e retorna o robô mais urgente (O(log n))"""
+        self._apply_aging()
+        if not self._heap:
+            return None
+        robot = self._heap[0][2]
+        self._remove_at(0)
+        return robot
+
+    def remove(self, robot_id):
+        """Remove um robô pelo ID (O(log n))"""
+        index = self._slots.get(robot_id)
+        if index is None:
+            return False
+        self._remove_at(index)
+        return True
+
+    def find(self, robot_id):
+        """Busca um robô pelo ID (O(1))"""
+        index = self._slots.get(robot_id)
+        return self._heap[index][2] if index is not None else None
+
+    def effective_level(self, robot_id):
+        """Nível atual do robô, já com o envelhecimento (None se não estiver na fila)"""
+        self._apply_aging()
+        index = self._slots.get(robot_id)
+        return self._heap[index][0] if index is not None else None
+
+    def get_all(self):
+        """Retorna todos os robôs em ordem de atendimento (O(n), sem ordenar)"""
+        self._apply_aging()
+        self.index_hits += 1
+        return [robot for _, _, robot in self._order]
+
+    def iter_range(self, start, count):
+        """
+        Percorre até `count` robôs a partir da posição `start` da ordem de
+        atendimento: O(log n + count), sem reordenar a fila
+        """
+        self._apply_aging()
+        self.index_hits += 1
+        return (robot for _, _, robot in self._order.iter_range(start, count))
+
+    def sort_by_priority(self):
+        """A ordem já é mantida pelo heap; apenas aplica as promoções vencidas"""
+        self._apply_aging()
+
+    def is_empty(self):
+        return not self._heap
+
+    def __len__(self):
+        return len(self._heap)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Módulo de superfícies no formato da tela
+Toda superfície reaproveitada entre frames (textos renderizados e sprites
+estáticos) é convertida uma única vez para o formato de pixel da tela, para
+que o blit não precise converter pixel a pixel em todo frame. Superfícies com
+alpha por pixel usam convert_alpha(); superfícies opacas usam convert() com
+uma colorkey (acelerada por RLE), que é o blit mais barato do SDL
+"""
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_CAPACITY = 512  # Textos convertidos mantidos (LRU)
+
+
+class SurfaceCache:
+    """
+    Cache de superfícies convertidas para o formato da tela
+    - Textos: chave (fonte, texto, cor, fundo), com descarte LRU. Com um fundo
+      sólido conhecido o texto é renderizado opaco sobre ele e o fundo vira a
+      colorkey; sem fundo, o texto mantém o alpha por pixel (convert_alpha)
+    - Sprites: superfícies estáticas geradas por uma função; a original fica
+      guardada para ser convertida de novo quando a tela muda
+    Quando a tela é recriada (VIDEORESIZE), display_changed() reconverte os
+    sprites e descarta os textos (as fontes mudam de tamanho com a janela)
+    """
+    def __init__(self, capacity=TEXT_CACHE_CAPACITY):
+        self.capacity = capacity
+        self.enabled = True
+        self._text = OrderedDict()
+        self._sprites = {}  # chave -> (original, colorkey, convertida)
+        self.hits = 0
+        self.misses = 0
+        self.conversions = 0
+
+    @staticmethod
+    def convert(surface, colorkey=None):
+        """Converte uma superfície para o formato da tela (requer a tela já criada)"""
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        if colorkey is None:
+            colorkey = surface.get_colorkey()
+        converted = surface.convert()
+        if colorkey is not None:
+            converted.set_colorkey(colorkey, pygame.RLEACCEL)
+        return converted
+
+    def text(self, font, text, color, background=None):
+        """Superfície do texto renderizado (convertida e reaproveitada entre frames)"""
+        if not self.enabled:
+            return font.render(text, True, color)
+        key = (font, text, color, background)
+        surface = self._text.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._text.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = self.convert(font.render(text, True, color))
+        else:
+            surface = self.convert(font.render(text, True, color, background), background)
+        self.conversions += 1
+        self._text[key] = surface
+        if len(self._text) > self.capacity:
+            self._text.popitem(last=False)
+        return surface
+
+    def sprite(self, key, factory, colorkey=None):
+        """
+        Sprite estático: `factory()` desenha a superfície original na primeira
+        vez; as chamadas seguintes devolvem a versão convertida
+        """
+        entry = self._sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        original = factory()
+        if not self.enabled:
+            return original
+        self._sprites[key] = (original, colorkey, self.convert(original, colorkey))
+        self.conversions += 1
+        return self._sprites[key][2]
+
+    def display_changed(self):
+        """Tela recriada: reconverte os sprites e descarta os textos convertidos"""
+        self._text.clear()
+        for key, (original, colorkey, _) in self._sprites.items():
+            self._sprites[key] = (original, colorkey, self.convert(original, colorkey))
+            self.conversions += 1
+
+    def clear(self):
+        self._text.clear()
+        self._sprites.clear()
+
+    def __len__(self):
+        return len(self._text) + len(self._sprites)
+
+    def stats(self):
+        """(acertos, falhas) para o profiler"""
+        return self.hits, self.misses
@@ -0,0 +1,110 @@
+"""
+Módulo de componentes auxiliares da interface
+Implementa o índice de regiões clicáveis (hit-test) preenchido durante o desenho
+e o estado de rolagem de listas virtualizadas
+"""
+
+
+class RowBand:
+    """
+    Faixa de linhas de altura uniforme (ex.: a fila de robôs)
+    Permite localizar a linha clicada em O(1) a partir da coordenada Y
+    """
+    def __init__(self, key, x, y, width, row_height, row_pitch, payloads, first_index=0):
+        self.key = key
+        self.x = x
+        self.y = y
+        self.width = width
+        self.row_height = row_height
+        self.row_pitch = row_pitch
+        self.payloads = payloads
+        self.first_index = first_index
+
+    def hit(self, pos):
+        """Retorna (índice, payload) da linha sob o ponto ou None"""
+        px, py = pos
+        if px < self.x or px >= self.x + self.width or py < self.y:
+            return None
+        row, offset = divmod(py - self.y, self.row_pitch)
+        # Ignora o espaçamento entre as linhas
+        if offset >= self.row_height or row >= len(self.payloads):
+            return None
+        return self.first_index + row, self.payloads[row]
+
+
+class HitTestIndex:
+    """
+    Índice das regiões clicáveis efetivamente desenhadas no último frame
+    O renderizador registra botões, campos e listas; os eventos apenas consultam
+    """
+    def __init__(self):
+        self.state = None
+        self._regions = []
+        self._bands = []
+
+    def begin_frame(self, state):
+        """Descarta as regiões do frame anterior"""
+        self.state = state
+        self._regions.clear()
+        self._bands.clear()
+
+    def add(self, key, rect, payload=None):
+        """Registra uma região retangular (botão, campo de texto...)"""
+        self._regions.append((key, rect, payload))
+        return rect
+
+    def add_rows(self, key, x, y, width, row_height, row_pitch, payloads, first_index=0):
+        """Registra uma faixa de linhas uniformes com um payload por linha"""
+        band = RowBand(key, x, y, width, row_height, row_pitch, payloads, first_index)
+        self._bands.append(band)
+        return band
+
+    def hit(self, pos):
+        """
+        Retorna (chave, payload) da região sob o ponto ou (None, None)
+        As regiões registradas por último (desenhadas por cima) têm precedência
+        """
+        for band in reversed(self._bands):
+            found = band.hit(pos)
+            if found is not None:
+                return band.key, found[1]
+        for key, rect, payload in reversed(self._regions):
+            if rect.collidepoint(pos):
+                return key, payload
+        return None, None
+
+
+class VirtualList:
+    """
+    Estado de rolagem de uma lista virtualizada
+    Guarda apenas o deslocamento da primeira linha visível; quem desenha busca
+    somente a janela [first, first + visible_rows) da estrutura de dados
+    """
+    def __init__(self):
+        self.first = 0
+        self.visible_rows = 0
+        self.total = 0
+
+    def set_viewport(self, visible_rows, total):
+        """Atualiza a capacidade e o total de linhas, mantendo o deslocamento válido"""
+        self.visible_rows = visible_rows
+        self.total = total
+        self.scroll_to(self.first)
+
+    def max_first(self):
+        return max(0, self.total - self.visible_rows)
+
+    def scroll_to(self, first):
+        self.first = min(max(0, first), self.max_first())
+
+    def scroll(self, rows):
+        """Rola `rows` linhas (positivo desce, negativo sobe)"""
+        self.scroll_to(self.first + rows)
+
+    def page(self, pages):
+        """Rola `pages` páginas inteiras (PageUp/PageDown)"""
+        self.scroll(pages * max(1, self.visible_rows))
+
+    def window(self):
+        """Retorna (primeira linha, quantidade de linhas) visíveis"""
+        return self.first, min(self.visible_rows, self.total - self.first)